@@ -1,18 +1,29 @@
 import os
+import json
 import logging
-from flask import Flask, render_template, request, jsonify, redirect, url_for, session, flash
+import threading
+from contextlib import closing
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for, session, flash, stream_with_context
 # Import new resume analyzer without spaCy
-from services.resume_analyzer import analyze_resume, calculate_ats_score
-from services.job_recommender import search_jobs
-from services.career_chat import get_career_advice
+from services.resume_analyzer import analyze_resume, calculate_ats_score, analysis_cache_key
+from services.batch_analyzer import expand_uploads, iter_batch_results
+from services.job_recommender import (
+    search_jobs, search_jobs_multi, is_multi_search, prefetch_next_page, get_jobs_details, project_results,
+    job_search_cache, job_search_prefetcher, job_details_cache, job_index, job_deduplicator, jsearch_quota
+)
+from services.job_ranker import JOB_RANKER, user_profiles
+from services.career_chat import get_career_advice, stream_career_advice, advice_cache, advice_batcher
 from utils.firebase_utils import init_firebase
-from utils.text_extraction import extract_text_from_file
+from utils.text_extraction import extract_document
+from utils.cache import TieredCache
+from utils.quota import BATCH
 # Import Firestore database utilities
 from utils.firebase_db import (
     save_user, get_user_by_firebase_uid, save_resume_analysis, 
     get_user_resume_analyses, save_job_search, save_job,
     get_saved_jobs, save_chat_message, get_chat_history
 )
+from flask_socketio import SocketIO, emit
 from models import db, User, ResumeAnalysis, JobSearch, SavedJob, ChatMessage
 import config
 
@@ -24,6 +35,11 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET", "thrivemateappsecretkey")
 
+# Socket.IO channel for streamed career chat. Under gunicorn, run a single
+# worker with threads (gunicorn -w 1 --threads 100 main:app) so websocket
+# sessions stay on one process.
+socketio = SocketIO(app)
+
 # Configure database
 DATABASE_URL = os.environ.get("DATABASE_URL")
 if DATABASE_URL:
@@ -43,6 +59,14 @@ if DATABASE_URL:
 else:
     logger.warning("DATABASE_URL not found. Running without database functionality.")
 
+# Resume analysis cache keyed by file content. Set RESUME_CACHE_DB to a SQLite
+# path to share results between gunicorn workers.
+resume_cache = TieredCache(
+    'resume_analysis',
+    max_entries=int(os.environ.get("RESUME_CACHE_SIZE", 256)),
+    db_path=os.environ.get("RESUME_CACHE_DB")
+)
+
 # Initialize Firebase - with fallback to None if it fails
 try:
     firebase_app, storage, firestore_db = init_firebase()
@@ -161,20 +185,41 @@ def api_analyze_resume():
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
 
-        # Extract text from the uploaded file
-        text = extract_text_from_file(file)
-        
-        if not text:
-            return jsonify({'error': 'Could not extract text from the file'}), 400
+        # Identical uploads skip extraction and analysis entirely
+        file_bytes = file.read()
+        file.seek(0)
+        cache_key = analysis_cache_key(file.filename, file_bytes)
+        cached = resume_cache.get(cache_key)
+
+        if cached:
+            text = cached['text']
+            analysis_results = cached['analysis']
+            ats_score = analysis_results['ats_score']
+        else:
+            # Extract text from the uploaded file
+            extracted = extract_document(file)
+            text = extracted.text
             
-        # Analyze the resume text
-        analysis_results = analyze_resume(text)
-        
-        # Calculate ATS score
-        ats_score = calculate_ats_score(analysis_results)
-        
-        # Add ATS score to results
-        analysis_results['ats_score'] = ats_score
+            if not text:
+                return jsonify({'error': 'Could not extract text from the file'}), 400
+                
+            # Analyze the resume text
+            analysis_results = analyze_resume(text)
+            
+            # Calculate ATS score
+            ats_score = calculate_ats_score(analysis_results)
+            
+            # Add ATS score to results
+            analysis_results['ats_score'] = ats_score
+
+            # Flag partial text when a page, size or time limit was hit
+            if extracted.truncated:
+                analysis_results['truncated'] = extracted.reason
+
+            # Page and size limits cut the same file the same way every time;
+            # a time-budget cut depends on load, so that result is not cached
+            if extracted.reason != 'time_budget':
+                resume_cache.set(cache_key, {'text': text, 'analysis': analysis_results})
         
         # Save to database if user is logged in
         user_id = request.form.get('user_id')
@@ -197,6 +242,7 @@ def api_analyze_resume():
                 
                 # Add the database ID to the results
                 analysis_results['id'] = resume_analysis.id
+                user_profiles.add_analysis(user_id, resume_analysis.skills or [])
                 
                 logger.info(f"Resume analysis saved for user {user_id}")
             except Exception as e:
@@ -210,6 +256,45 @@ def api_analyze_resume():
         logger.exception("Error analyzing resume")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/analyze-resumes/batch', methods=['POST'])
+def api_analyze_resumes_batch():
+    """
+    Analyze many resumes at once. Accepts any number of files (and zip archives
+    of files) under 'resumes' and streams one JSON object per file as NDJSON.
+    """
+    try:
+        uploads = [(f.filename, f.read()) for f in request.files.getlist('resumes') if f.filename]
+        
+        if not uploads:
+            return jsonify({'error': 'No files provided'}), 400
+
+        files, rejected = expand_uploads(uploads)
+        ordered = request.form.get('ordered', '').lower() in ('1', 'true', 'yes')
+    
+    except Exception as e:
+        logger.exception("Error reading batch upload")
+        return jsonify({'error': str(e)}), 500
+
+    def generate():
+        succeeded = 0
+        failed = len(rejected)
+        for error in rejected:
+            yield json.dumps(dict(error, index=None)) + '\n'
+        try:
+            for result in iter_batch_results(files, cache=resume_cache, ordered=ordered):
+                if 'error' in result:
+                    failed += 1
+                else:
+                    succeeded += 1
+                yield json.dumps(result) + '\n'
+        except Exception as e:
+            logger.exception("Error during batch resume analysis")
+            yield json.dumps({'error': str(e)}) + '\n'
+        yield json.dumps({'done': True, 'total': len(files) + len(rejected), 'succeeded': succeeded, 'failed': failed}) + '\n'
+
+    logger.info(f"Batch analysis started for {len(files)} files ({len(rejected)} rejected)")
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @app.route('/api/user/<int:user_id>/resume-analyses', methods=['GET'])
 def get_user_resume_analyses(user_id):
     try:
@@ -233,6 +318,17 @@ def get_user_resume_analyses(user_id):
         logger.exception("Error getting user resume analyses")
         return jsonify({'error': str(e)}), 500
 
+# Analyses folded into a user's skill profile for ranking
+PROFILE_ANALYSES = int(os.environ.get("JOB_PROFILE_ANALYSES", 3))
+
+def load_profile_analyses(user_id):
+    """
+    Skill lists of the user's latest analyses, oldest first.
+    """
+    latest = ResumeAnalysis.query.filter_by(user_id=user_id)\
+        .order_by(ResumeAnalysis.created_at.desc()).limit(PROFILE_ANALYSES).all()
+    return [analysis.skills or [] for analysis in reversed(latest)]
+
 # Job Search Routes
 @app.route('/api/search-jobs', methods=['POST'])
 def api_search_jobs():
@@ -249,19 +345,46 @@ def api_search_jobs():
         # Optional parameters with defaults
         page = data.get('page', 1)
         page_size = data.get('page_size', 10)
+        user_id = data.get('user_id')
+        
+        # Score listings against the resume: skills sent by the client, or the
+        # user's latest analysis, from their cached skill profile
+        resume_skills = data.get('skills')
+        profile = None
+        if user_id and DATABASE_URL:
+            try:
+                profile = user_profiles.get(user_id, lambda: load_profile_analyses(user_id))
+                if resume_skills is None and profile['analyses']:
+                    resume_skills = profile['latest']
+            except Exception as e:
+                logger.error(f"Error loading resume skills: {str(e)}")
         
-        # Search for jobs
-        jobs = search_jobs(keywords, location, page, page_size)
+        # Search for jobs; "a OR b" keywords or locations fan out into one merged search
+        viewer = str(user_id or request.remote_addr)
+        if is_multi_search(keywords, location):
+            jobs = search_jobs_multi(keywords, location, page, page_size,
+                                     resume_skills=resume_skills, mode=data.get('mode'), viewer=viewer)
+        else:
+            jobs = search_jobs(keywords, location, page, page_size, resume_skills=resume_skills,
+                               mode=data.get('mode'), viewer=viewer)
+            prefetch_next_page(keywords, location, page, page_size, jobs, user_key=viewer)
+        
+        # Order the page for the user unless they asked for JSearch's order
+        if profile and profile['skills'] and data.get('ranking') != 'upstream':
+            try:
+                expected_salary = float(data['expected_salary']) if data.get('expected_salary') else None
+            except (TypeError, ValueError):
+                expected_salary = None
+            JOB_RANKER.rank(profile['skills'], jobs.get('jobs', []), expected_salary=expected_salary)
         
         # Save search to database if user is logged in
-        user_id = data.get('user_id')
         if user_id and jobs.get('jobs'):
             try:
                 # Create a new job search record
                 job_search = JobSearch(
                     user_id=user_id,
-                    keywords=keywords,
-                    location=location or '',
+                    keywords=keywords if isinstance(keywords, str) else ' OR '.join(keywords),
+                    location=(location if isinstance(location, str) else ' OR '.join(location)) or '',
                     results_count=jobs.get('total_jobs', 0)
                 )
                 
@@ -274,12 +397,29 @@ def api_search_jobs():
                 db.session.rollback()
                 # Continue without saving to database
         
-        return jsonify(jobs)
+        # Description snippets by default; 'fields' and 'description_chars' trim further
+        return jsonify(project_results(jobs, data.get('fields'), data.get('description_chars')))
     
     except Exception as e:
         logger.exception("Error searching jobs")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/job-details', methods=['POST'])
+def api_job_details():
+    try:
+        data = request.json
+        
+        if not data or not isinstance(data.get('job_ids'), list):
+            return jsonify({'error': 'job_ids list is required'}), 400
+        
+        # Cached details are served directly, the rest fetched in batches at
+        # batch priority, behind interactive searches in the JSearch quota
+        return jsonify(get_jobs_details([str(job_id) for job_id in data['job_ids']], priority=BATCH))
+    
+    except Exception as e:
+        logger.exception("Error getting job details")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/user/<int:user_id>/save-job', methods=['POST'])
 def save_job(user_id):
     try:
@@ -340,6 +480,36 @@ def get_saved_jobs(user_id):
         return jsonify({'error': str(e)}), 500
 
 # Career Chat Routes
+def save_chat_exchange(user_id, user_message, ai_response):
+    """
+    Save a question and its answer as ChatMessage rows; failures are logged
+    and rolled back so the reply still reaches the user.
+    """
+    try:
+        # Save user message
+        user_chat_message = ChatMessage(
+            user_id=user_id,
+            is_user_message=True,
+            message=user_message
+        )
+        
+        # Save AI response
+        ai_chat_message = ChatMessage(
+            user_id=user_id,
+            is_user_message=False,
+            message=ai_response
+        )
+        
+        db.session.add(user_chat_message)
+        db.session.add(ai_chat_message)
+        db.session.commit()
+        
+        logger.info(f"Chat messages saved for user {user_id}")
+    except Exception as e:
+        logger.error(f"Error saving chat messages: {str(e)}")
+        db.session.rollback()
+        # Continue without saving to database
+
 @app.route('/api/career-advice', methods=['POST'])
 def api_career_advice():
     try:
@@ -356,30 +526,7 @@ def api_career_advice():
         # Save chat messages to database if user is logged in
         user_id = data.get('user_id')
         if user_id:
-            try:
-                # Save user message
-                user_chat_message = ChatMessage(
-                    user_id=user_id,
-                    is_user_message=True,
-                    message=user_message
-                )
-                
-                # Save AI response
-                ai_chat_message = ChatMessage(
-                    user_id=user_id,
-                    is_user_message=False,
-                    message=ai_response
-                )
-                
-                db.session.add(user_chat_message)
-                db.session.add(ai_chat_message)
-                db.session.commit()
-                
-                logger.info(f"Chat messages saved for user {user_id}")
-            except Exception as e:
-                logger.error(f"Error saving chat messages: {str(e)}")
-                db.session.rollback()
-                # Continue without saving to database
+            save_chat_exchange(user_id, user_message, ai_response)
         
         return jsonify({'response': ai_response})
     
@@ -387,6 +534,117 @@ def api_career_advice():
         logger.exception("Error getting career advice")
         return jsonify({'error': str(e)}), 500
 
+def sse_event(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+@app.route('/api/career-advice/stream', methods=['GET', 'POST'])
+def api_career_advice_stream():
+    """
+    Career advice as server-sent events: 'token' events with {'text'} as the
+    model generates, then one 'done' event with the full response. GET (for
+    EventSource) takes the message as a query parameter and saves nothing,
+    since any page can make a cross-site GET.
+
+    Chunks are pulled from the model only as fast as the client reads them,
+    and a client that disconnects closes the upstream request. A POST with
+    user_id saves the exchange to ChatMessage once the answer is complete.
+    """
+    if request.method == 'GET':
+        user_message = request.args.get('message', '')
+        user_id = None
+    else:
+        data = request.get_json(silent=True) or {}
+        user_message = data.get('message', '')
+        user_id = data.get('user_id')
+
+    if not user_message:
+        return jsonify({'error': 'No message provided'}), 400
+
+    def generate():
+        done = {}
+        with closing(stream_career_advice(user_message, done=done)) as chunks:
+            for chunk in chunks:
+                yield sse_event('token', {'text': chunk})
+
+        if done['completed'] and user_id:
+            save_chat_exchange(user_id, user_message, done['response'])
+        yield sse_event('done', {'response': done['response'], 'cached': done['cached']})
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Stop nginx-style proxies from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+# Streams over Socket.IO wait for the client to acknowledge chunks: at most
+# ADVICE_STREAM_WINDOW may be unacknowledged, and a stream whose client
+# acknowledges nothing for ADVICE_STREAM_ACK_TIMEOUT seconds is cancelled.
+ADVICE_STREAM_WINDOW = int(os.environ.get("ADVICE_STREAM_WINDOW", 8))
+ADVICE_STREAM_ACK_TIMEOUT = float(os.environ.get("ADVICE_STREAM_ACK_TIMEOUT", 30))
+
+# Socket.IO session id -> cancel event of its running stream
+active_advice_streams = {}
+active_advice_streams_lock = threading.Lock()
+
+@socketio.on('career_advice')
+def socket_career_advice(data):
+    """
+    Stream career advice to the sender as 'advice_chunk' events ({'text',
+    'seq'}), then 'advice_done' with the full response. A new question,
+    a 'cancel_advice' event or a disconnect cancels the running stream.
+    """
+    sid = request.sid
+    data = data or {}
+    user_message = data.get('message', '')
+    user_id = data.get('user_id')
+    if not user_message:
+        emit('advice_error', {'error': 'No message provided'})
+        return
+
+    cancelled = threading.Event()
+    with active_advice_streams_lock:
+        previous = active_advice_streams.get(sid)
+        if previous is not None:
+            previous.set()
+        active_advice_streams[sid] = cancelled
+
+    window = threading.Semaphore(ADVICE_STREAM_WINDOW)
+    done = {}
+    try:
+        with closing(stream_career_advice(user_message, cancelled=cancelled, done=done)) as chunks:
+            for seq, chunk in enumerate(chunks):
+                if not window.acquire(timeout=ADVICE_STREAM_ACK_TIMEOUT):
+                    logger.warning(f"Career advice stream to {sid} cancelled: chunks not acknowledged")
+                    cancelled.set()
+                    break
+                if cancelled.is_set():
+                    break
+                socketio.emit('advice_chunk', {'text': chunk, 'seq': seq}, to=sid,
+                              callback=lambda *args: window.release())
+    except Exception as e:
+        logger.exception("Error streaming career advice")
+        emit('advice_error', {'error': str(e)})
+        return
+    finally:
+        with active_advice_streams_lock:
+            if active_advice_streams.get(sid) is cancelled:
+                del active_advice_streams[sid]
+
+    if cancelled.is_set():
+        return
+    if done['completed'] and user_id:
+        save_chat_exchange(user_id, user_message, done['response'])
+    emit('advice_done', {'response': done['response'], 'cached': done['cached']})
+
+def cancel_advice_stream():
+    with active_advice_streams_lock:
+        cancelled = active_advice_streams.pop(request.sid, None)
+    if cancelled is not None:
+        cancelled.set()
+
+socketio.on_event('cancel_advice', cancel_advice_stream)
+socketio.on_event('disconnect', cancel_advice_stream)
+
 @app.route('/api/user/<int:user_id>/chat-history', methods=['GET'])
 def get_chat_history(user_id):
     try:
@@ -407,10 +665,25 @@ def get_chat_history(user_id):
         logger.exception("Error getting chat history")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    return jsonify({
+        'resume_analysis': resume_cache.stats(),
+        'job_search': job_search_cache.stats(),
+        'job_search_prefetch': job_search_prefetcher.stats(),
+        'job_details': job_details_cache.stats(),
+        'jsearch_quota': jsearch_quota.stats(),
+        'user_profile': user_profiles.cache.stats(),
+        'career_advice': advice_cache.stats(),
+        'huggingface_batching': advice_batcher.stats(),
+        'job_index': job_index.stats() if job_index is not None else {'available': False},
+        'job_dedup': job_deduplicator.stats() if job_deduplicator is not None else {'enabled': False}
+    })
+
 # Handle 404 errors
 @app.errorhandler(404)
 def page_not_found(e):
     return render_template('index.html', title="404 - Page Not Found"), 404
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    socketio.run(app, host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,109 @@
+# benchmarks/bench_advice_cache.py
+#
+# Time AnswerCache lookups (exact and paraphrased questions) and the index
+# rebuild that follows an insert, at 100 to 2000 cached questions. A model
+# call costs seconds; a hit should cost well under a millisecond. Then time
+# lookups from several threads while new questions keep arriving, which is
+# when rebuilds used to hold every lookup up.
+#
+#   python -m benchmarks.bench_advice_cache
+
+import random
+import statistics
+import threading
+import time
+import timeit
+
+from benchmarks.corpus import SKILLS, TITLES
+from services.advice_cache import AnswerCache
+
+TEMPLATES = [
+    "How do I become a {title} with {skill}?",
+    "What {skill} projects should a {title} build?",
+    "How should I list {skill} on my resume for a {title} role?",
+    "Which {skill} interview questions come up for a {title}?",
+]
+PARAPHRASES = [
+    "what {skill} projects should a {title} build next",
+    "How can I list {skill} on my resume for a {title} role?",
+]
+
+
+def main():
+    rng = random.Random(5)
+    questions = [template.format(title=title, skill=skill)
+                 for template in TEMPLATES for title in TITLES for skill in SKILLS]
+    rng.shuffle(questions)
+    print(f"{'entries':>8} {'rebuild ms':>11} {'exact ms':>9} {'similar ms':>11} {'miss ms':>8}")
+    for size in (100, 500, 1000, len(questions)):
+        cache = filled(questions[:size], rebuild_interval=0)
+        rebuild = min(timeit.repeat(lambda: (cache.store(questions[0], '1', 'answer'), cache.lookup('x', '1')),
+                                    number=3, repeat=3)) / 3
+        exact = min(timeit.repeat(lambda: cache.lookup(questions[1], '1'), number=200, repeat=3)) / 200
+        title, skill = rng.choice(TITLES), rng.choice(SKILLS)
+        paraphrase = rng.choice(PARAPHRASES).format(title=title, skill=skill)
+        similar = min(timeit.repeat(lambda: cache.lookup(paraphrase, '1'), number=200, repeat=3)) / 200
+        miss = min(timeit.repeat(lambda: cache.lookup('What should I wear on my first day?', '1'),
+                                 number=200, repeat=3)) / 200
+        print(f"{size:>8} {rebuild * 1000:>11.2f} {exact * 1000:>9.3f} {similar * 1000:>11.3f} {miss * 1000:>8.3f}")
+
+    print(f"\n{'rebuild interval s':>18} {'p50 ms':>7} {'p99 ms':>7} {'max ms':>7} {'rebuilds':>9}")
+    for interval in (0, 1.0):
+        cache = filled(questions, rebuild_interval=interval)
+        latencies = concurrent_lookups(cache, rng)
+        latencies.sort()
+        print(f"{interval:>18} {statistics.median(latencies) * 1000:>7.3f} "
+              f"{latencies[int(len(latencies) * 0.99)] * 1000:>7.3f} {latencies[-1] * 1000:>7.2f} "
+              f"{cache.rebuilds:>9}")
+
+
+def filled(questions, rebuild_interval: float) -> AnswerCache:
+    """
+    A cache holding questions with its index built, without rebuilding
+    after every store while filling it.
+    """
+    cache = AnswerCache(max_entries=len(questions), threshold=0.7, rebuild_interval=3600)
+    for question in questions:
+        cache.store(question, '1', 'answer')
+    cache.rebuild_interval = 0
+    cache.lookup(questions[0] + ' please', '1')
+    cache.rebuild_interval = rebuild_interval
+    return cache
+
+
+def concurrent_lookups(cache: AnswerCache, rng: random.Random, readers: int = 4, seconds: float = 2.0):
+    """
+    Latencies of paraphrase lookups from readers threads while another
+    thread stores a new question every 5ms.
+    """
+    stop_at = time.perf_counter() + seconds
+    latencies = []
+    lock = threading.Lock()
+
+    def write():
+        i = 0
+        while time.perf_counter() < stop_at:
+            cache.store(f"New question number {i} about {rng.choice(SKILLS)}", '1', 'answer')
+            i += 1
+            time.sleep(0.005)
+
+    def read():
+        local = []
+        while time.perf_counter() < stop_at:
+            paraphrase = rng.choice(PARAPHRASES).format(title=rng.choice(TITLES), skill=rng.choice(SKILLS))
+            started = time.perf_counter()
+            cache.lookup(paraphrase, '1')
+            local.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=write)] + [threading.Thread(target=read) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+# benchmarks/bench_advice_stream.py
+#
+# Time to first token and to the full answer for career advice, blocking
+# (/api/career-advice) against streamed over SSE (/api/career-advice/stream)
+# and Socket.IO, with the Hugging Face stub streaming one word every
+# --token-ms after --latency-ms. Also checks that a client closing an SSE
+# stream early stops the upstream generation.
+#
+#   python -m benchmarks.bench_advice_stream --latency-ms 300 --token-ms 20
+
+import argparse
+import os
+import statistics
+import threading
+import time
+
+import requests
+import socketio
+
+from benchmarks.load_test import QUESTIONS, start_app
+from benchmarks.stubs import StubSettings, start_all
+
+
+def blocking(base_url: str, question: str):
+    started = time.perf_counter()
+    response = requests.post(f"{base_url}/api/career-advice", json={'message': question}, timeout=120)
+    response.raise_for_status()
+    elapsed = time.perf_counter() - started
+    return elapsed, elapsed
+
+
+def sse(base_url: str, question: str):
+    started = time.perf_counter()
+    first = None
+    with requests.post(f"{base_url}/api/career-advice/stream", json={'message': question},
+                       stream=True, timeout=120) as response:
+        for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+            if line == 'event: token' and first is None:
+                first = time.perf_counter() - started
+            elif line == 'event: done':
+                break
+    return first, time.perf_counter() - started
+
+
+class SocketTimer:
+    """
+    Socket.IO client that times one question at a time.
+    """
+
+    def __init__(self, base_url: str):
+        self.client = socketio.Client()
+        self.client.on('advice_chunk', self.on_chunk)
+        self.client.on('advice_done', self.on_done)
+        self.client.connect(base_url, wait_timeout=10)
+        self.first = None
+        self.finished = threading.Event()
+
+    def on_chunk(self, chunk):
+        if self.first is None:
+            self.first = time.perf_counter()
+        # The return value is the acknowledgement the server waits for
+        return True
+
+    def on_done(self, done):
+        self.finished.set()
+
+    def __call__(self, question: str):
+        self.first = None
+        self.finished.clear()
+        started = time.perf_counter()
+        self.client.emit('career_advice', {'message': question})
+        self.finished.wait(120)
+        return self.first - started, time.perf_counter() - started
+
+
+def cancellation(base_url: str, settings: StubSettings) -> int:
+    """
+    Upstream streams closed when a client hung up after its first token.
+    """
+    before = settings.cancelled
+    with requests.post(f"{base_url}/api/career-advice/stream", json={'message': 'Cancel me early'},
+                       stream=True, timeout=120) as response:
+        for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+            if line.startswith('data:'):
+                break
+    time.sleep(1)
+    return settings.cancelled - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare blocking and streamed career advice")
+    parser.add_argument('--latency-ms', type=float, default=300, help="Stub time to first token")
+    parser.add_argument('--token-ms', type=float, default=20, help="Stub time between tokens")
+    parser.add_argument('--answer-chars', type=int, default=800)
+    args = parser.parse_args()
+
+    settings = StubSettings(args.latency_ms, jitter_ms=0, answer_chars=args.answer_chars, token_ms=args.token_ms)
+    servers, env = start_all(settings)
+    os.environ.update(env)
+    # Every question must reach the model
+    os.environ['ADVICE_CACHE_SIZE'] = '0'
+    base_url = start_app()
+
+    timer = SocketTimer(base_url)
+
+    print(f"{'mode':<10} {'first token ms':>15} {'full answer ms':>15}")
+    for name, run in (('blocking', lambda q: blocking(base_url, q)), ('sse', lambda q: sse(base_url, q)),
+                      ('socket.io', timer)):
+        results = [run(question) for question in QUESTIONS]
+        first = statistics.median(result[0] for result in results)
+        total = statistics.median(result[1] for result in results)
+        print(f"{name:<10} {first * 1000:>15.1f} {total * 1000:>15.1f}")
+
+    print(f"upstream streams stopped by an early disconnect: {cancellation(base_url, settings)}/1")
+    timer.client.disconnect()
+    for server in servers:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
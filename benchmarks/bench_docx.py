@@ -0,0 +1,44 @@
+# benchmarks/bench_docx.py
+#
+# Compare the streaming DOCX extractor against the python-docx object model
+# on large, table-heavy resumes.
+#
+#   python -m benchmarks.bench_docx
+
+import io
+import timeit
+import tracemalloc
+
+from benchmarks.corpus import make_resume_docx
+from utils.text_extraction import extract_text_from_docx_document, extract_text_from_docx_stream
+from werkzeug.datastructures import FileStorage
+
+
+def measure(extract, data: bytes, runs: int):
+    seconds = min(timeit.repeat(lambda: extract(data), number=runs, repeat=3)) / runs
+    tracemalloc.start()
+    extract(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    def via_python_docx(data):
+        return extract_text_from_docx_document(FileStorage(stream=io.BytesIO(data), filename='resume.docx'))
+
+    def via_stream(data):
+        return extract_text_from_docx_stream(io.BytesIO(data))
+
+    print(f"{'pages':>5} {'rows':>5} {'KB':>6} {'docx ms':>9} {'stream ms':>10} {'speedup':>8} {'docx MB':>8} {'stream MB':>10}")
+    for pages, table_rows in ((2, 20), (10, 100), (40, 300), (100, 600)):
+        data = make_resume_docx(pages=pages, roles=pages * 2, seed=pages, table_rows=table_rows)
+        runs = max(1, 40 // pages)
+        slow, slow_peak = measure(via_python_docx, data, runs)
+        fast, fast_peak = measure(via_stream, data, runs)
+        print(f"{pages:>5} {table_rows:>5} {len(data) // 1024:>6} {slow * 1000:>9.1f} {fast * 1000:>10.1f} "
+              f"{slow / fast:>7.1f}x {slow_peak / 2**20:>8.1f} {fast_peak / 2**20:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# benchmarks/bench_experience.py
+#
+# Stress extract_experience with long CVs that repeat titles many times and
+# compare against the titles x paragraphs scan it replaced.
+#
+#   python -m benchmarks.bench_experience
+
+import re
+import timeit
+
+from benchmarks.corpus import make_resume_text
+from services.resume_analyzer import extract_experience
+from services.resume_document import ResumeDocument
+
+
+def legacy_extract_experience(text):
+    experience_list = []
+    title_pattern = r'\b(Software Engineer|Developer|Senior Developer|Manager|Director|Coordinator|Specialist|Analyst|Designer|Programmer|Architect|Lead|Consultant|Associate|Assistant|Administrator|Executive|Officer)\b'
+    job_titles = re.findall(title_pattern, text)
+    company_pattern = r'\b[A-Z][a-zA-Z]+ (Inc|LLC|Ltd|Company|Corp|Corporation)\b|\b[A-Z][a-zA-Z]+ Technologies\b|\b[A-Z][a-zA-Z]+ Solutions\b|\b[A-Z][a-zA-Z]+ Systems\b'
+    companies = re.findall(company_pattern, text)
+    date_pattern = r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* [\d]{4}\s*(-|to|–|—)\s*(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* [\d]{4}\b|\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* [\d]{4}\s*(-|to|–|—)\s*[Pp]resent\b|\b[\d]{4}\s*(-|to|–|—)\s*[\d]{4}\b|\b[\d]{4}\s*(-|to|–|—)\s*[Pp]resent\b'
+    dates = re.findall(date_pattern, text)
+    paragraphs = re.split(r'\n\s*\n', text)
+
+    for i, title in enumerate(job_titles):
+        description = ""
+        for paragraph in paragraphs:
+            if title in paragraph:
+                description = paragraph.replace(title, "").strip()
+                break
+        experience_list.append({
+            'title': title,
+            'company': companies[i] if i < len(companies) else 'Unknown Company',
+            'period': dates[i] if i < len(dates) else 'Unknown Period',
+            'description': description if description else 'No detailed description available'
+        })
+
+    return experience_list
+
+
+def main():
+    print(f"{'roles':>5} {'paras':>6} {'titles':>7} {'legacy ms':>10} {'indexed ms':>11} {'speedup':>8}")
+    for roles in (50, 100, 200, 400):
+        # Long project/publication sections ahead of the roles push each
+        # title's first containing paragraph deep into the document, which is
+        # where the titles x paragraphs scan goes quadratic.
+        text = make_resume_text(pages=roles // 10, roles=0, seed=roles) + '\n\n' + make_resume_text(pages=0, roles=roles, seed=roles)
+        runs = max(3, 2000 // roles)
+        legacy = min(timeit.repeat(lambda: legacy_extract_experience(text), number=runs, repeat=3)) / runs
+        indexed = min(timeit.repeat(lambda: extract_experience(ResumeDocument(text)), number=runs, repeat=3)) / runs
+        titles = len(extract_experience(text))
+        paragraphs = len(ResumeDocument(text).paragraphs)
+        print(f"{roles:>5} {paragraphs:>6} {titles:>7} {legacy * 1000:>10.2f} {indexed * 1000:>11.2f} {legacy / indexed:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
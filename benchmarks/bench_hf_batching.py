@@ -0,0 +1,75 @@
+# benchmarks/bench_hf_batching.py
+#
+# Throughput of get_career_advice with concurrent callers, sending every
+# prompt alone against micro-batching them, with the Hugging Face stub
+# (benchmarks/stubs.py) standing in for the model. The stub answers a batch
+# in the time of one answer, as a batching inference server roughly does.
+# With --error-rate, failed batches fall back to one call per prompt.
+#
+#   python -m benchmarks.bench_hf_batching --callers 32 --questions 256
+
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stubs import StubSettings, start_all
+
+
+def run(career_chat, settings: StubSettings, questions, callers: int, max_batch: int, window_ms: float):
+    career_chat.advice_batcher.max_batch = max_batch
+    career_chat.advice_batcher.max_wait = window_ms / 1000
+    requests_before = settings.requests
+
+    def ask(question):
+        started = time.perf_counter()
+        answer = career_chat.get_career_advice(question)
+        return time.perf_counter() - started, answer.startswith(('🚫', '❌', '⚠️'))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        results = list(executor.map(ask, questions))
+    elapsed = time.perf_counter() - started
+    latencies = sorted(latency for latency, _ in results)
+    return {
+        'answers_per_s': len(questions) / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95)] * 1000,
+        'upstream_requests': settings.requests - requests_before,
+        'failed': sum(failed for _, failed in results)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare single and micro-batched Hugging Face calls")
+    parser.add_argument('--callers', type=int, default=32, help="Concurrent get_career_advice callers")
+    parser.add_argument('--questions', type=int, default=256)
+    parser.add_argument('--latency-ms', type=float, default=200)
+    parser.add_argument('--token-ms', type=float, default=1, help="Stub time per generated word")
+    parser.add_argument('--window-ms', type=float, default=5)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    settings = StubSettings(args.latency_ms, jitter_ms=0, error_rate=args.error_rate, token_ms=args.token_ms)
+    servers, env = start_all(settings)
+    os.environ.update(env)
+    os.environ.setdefault('HUGGINGFACE_API_KEY', 'stub')
+    # Every question must reach the model
+    os.environ['ADVICE_CACHE_SIZE'] = '0'
+    from services import career_chat
+
+    questions = [f"Question {i}: how do I grow as a developer?" for i in range(args.questions)]
+    print(f"{'batch':>6} {'answers/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'upstream reqs':>14} {'failed':>7}")
+    for max_batch in (1, 4, 8, 16):
+        result = run(career_chat, settings, questions, args.callers, max_batch, args.window_ms)
+        print(f"{max_batch:>6} {result['answers_per_s']:>10.1f} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} "
+              f"{result['upstream_requests']:>14} {result['failed']:>7}")
+    print(career_chat.advice_batcher.stats())
+
+    for server in servers:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+# benchmarks/bench_job_dedup.py
+#
+# Time JobDeduplicator.dedupe on pages of 10 synthetic listings as the
+# signature store grows, and count how many planted reposts (a few words
+# changed, new job id) of listings on earlier pages of the same search are
+# dropped, and how many distinct listings are wrongly dropped.
+#
+#   python -m benchmarks.bench_job_dedup
+
+import random
+import time
+
+from benchmarks.bench_job_matcher import make_jobs
+from services.job_dedup import JobDeduplicator
+
+
+def repost(job, rng: random.Random, index: int):
+    words = job['description'].split()
+    for _ in range(len(words) // 50):
+        words[rng.randrange(len(words))] = rng.choice(('senior', 'remote', 'hybrid', 'urgent', 'new'))
+    return dict(job, id=f"{job['id']}-repost-{index}", description=' '.join(words))
+
+
+def main():
+    rng = random.Random(7)
+    dedup = JobDeduplicator()
+    originals = []
+    pages = 0
+    print(f"{'stored':>7} {'ms/page':>8} {'caught':>7} {'planted':>8} {'lost':>5}")
+    for stored in (0, 1000, 10000, 50000):
+        while len(originals) < stored:
+            page = make_jobs(10, seed=len(originals) // 10 + 1)
+            pages += 1
+            dedup.dedupe(page, scope='bench', page=pages)
+            originals.extend(page)
+
+        # Pages of 7 new listings and 3 reposts of stored (or same-page) listings
+        caught = planted = lost = 0
+        elapsed = 0.0
+        for n in range(50):
+            fresh = make_jobs(7, seed=100000 + stored + n)
+            sources = rng.sample(originals, 3) if originals else fresh[:3]
+            page = fresh + [repost(job, rng, n) for job in sources]
+            started = time.perf_counter()
+            pages += 1
+            kept = dedup.dedupe(page, scope='bench', page=pages)
+            elapsed += time.perf_counter() - started
+            kept_ids = {job['id'] for job in kept}
+            planted += 3
+            caught += sum(1 for job in page[7:] if job['id'] not in kept_ids)
+            lost += sum(1 for job in fresh if job['id'] not in kept_ids)
+            originals.extend(fresh)
+        print(f"{stored:>7} {elapsed / 50 * 1000:>8.2f} {caught:>7} {planted:>8} {lost:>5}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+# benchmarks/bench_job_matcher.py
+#
+# Time JobMatcher.score on pages of 10-50 synthetic job listings, with a cold
+# per-job skill cache (every listing new) and a warm one (listings seen before).
+#
+#   python -m benchmarks.bench_job_matcher
+
+import random
+import timeit
+
+from benchmarks.corpus import SKILLS, make_resume_text
+from services.job_matcher import JobMatcher
+from services.resume_analyzer import SKILL_MATCHER
+
+
+def make_jobs(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [
+        {
+            'id': f'job-{seed}-{i}',
+            'title': f"{rng.choice(SKILLS)} Developer",
+            # Roughly 3KB, a typical JSearch job_description
+            'description': make_resume_text(pages=1, roles=1, skills=rng.randint(4, 12), seed=seed * 1000 + i),
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    resume_skills = SKILL_MATCHER.extract(make_resume_text(pages=2, roles=4, skills=15, seed=99))
+    print(f"{'jobs':>5} {'cold ms':>9} {'warm ms':>9}")
+    for count in (10, 25, 50):
+        jobs = make_jobs(count, seed=count)
+        cold = min(timeit.repeat(lambda: JobMatcher(SKILL_MATCHER).score(resume_skills, jobs), number=5, repeat=3)) / 5
+        matcher = JobMatcher(SKILL_MATCHER)
+        matcher.score(resume_skills, jobs)
+        warm = min(timeit.repeat(lambda: matcher.score(resume_skills, jobs), number=20, repeat=3)) / 20
+        print(f"{count:>5} {cold * 1000:>9.2f} {warm * 1000:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
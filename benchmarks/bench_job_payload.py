@@ -0,0 +1,35 @@
+# benchmarks/bench_job_payload.py
+#
+# Response size of a search page with full descriptions, the default snippet
+# and a card-only projection, and the size of the same page as the search
+# cache held it before (plain JSON) and now (compact, compressed).
+#
+#   python -m benchmarks.bench_job_payload
+
+import json
+import timeit
+
+from benchmarks.bench_job_matcher import make_jobs
+from services.job_recommender import project_results
+from utils.cache import decode, encode
+
+CARD_FIELDS = 'title,company,company_logo,location,date,url,salary_min,salary_max,salary_period,description'
+
+
+def main():
+    print(f"{'jobs':>5} {'full KB':>8} {'snippet KB':>11} {'card KB':>8} {'cache was KB':>13} "
+          f"{'cache now KB':>13} {'decode ms':>10}")
+    for count in (10, 25, 50):
+        results = {'jobs': make_jobs(count, seed=count), 'total_jobs': 500}
+        full = len(json.dumps(project_results(results, description_chars=0)))
+        snippet = len(json.dumps(project_results(results)))
+        card = len(json.dumps(project_results(results, CARD_FIELDS, 200)))
+        was = len(json.dumps(results))
+        now = encode(results)
+        decode_ms = min(timeit.repeat(lambda: decode(now), number=50, repeat=3)) / 50 * 1000
+        print(f"{count:>5} {full / 1024:>8.1f} {snippet / 1024:>11.1f} {card / 1024:>8.1f} {was / 1024:>13.1f} "
+              f"{len(now) / 1024:>13.1f} {decode_ms:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
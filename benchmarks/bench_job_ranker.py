@@ -0,0 +1,40 @@
+# benchmarks/bench_job_ranker.py
+#
+# Time JobRanker.rank on pages of 10-50 synthetic listings with dates and
+# salaries, for a profile built from three analyses. Job skills are warm in
+# the matcher's cache, as they are after search_jobs has scored the page.
+#
+#   python -m benchmarks.bench_job_ranker
+
+import random
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.bench_job_matcher import make_jobs
+from benchmarks.corpus import make_resume_text
+from services.job_matcher import JobMatcher
+from services.job_ranker import JobRanker, build_profile
+from services.resume_analyzer import SKILL_MATCHER
+
+
+def main():
+    rng = random.Random(3)
+    analyses = [SKILL_MATCHER.extract(make_resume_text(pages=2, roles=3, skills=12, seed=seed)) for seed in (1, 2, 3)]
+    profile = build_profile(analyses)
+    ranker = JobRanker(JobMatcher(SKILL_MATCHER))
+    now = datetime.now(timezone.utc)
+    print(f"{'jobs':>5} {'rank ms':>8}")
+    for count in (10, 25, 50):
+        jobs = make_jobs(count, seed=count)
+        for job in jobs:
+            job['date'] = (now - timedelta(days=rng.uniform(0, 60))).isoformat()
+            if rng.random() < 0.6:
+                job['salary_max'] = rng.randint(60, 180) * 1000
+                job['salary_period'] = 'YEAR'
+        ranker.rank(profile['skills'], jobs)
+        elapsed = min(timeit.repeat(lambda: ranker.rank(profile['skills'], jobs), number=20, repeat=3)) / 20
+        print(f"{count:>5} {elapsed * 1000:>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/bench_job_search_fanout.py
+#
+# Wall time of a 2 keywords x 2 locations search run as sequential search_jobs
+# calls against search_jobs_multi, on a local stand-in for JSearch that takes
+# 200ms per query (one of them 600ms), then the same fan-out with a timeout
+# shorter than the slow query.
+#
+#   python -m benchmarks.bench_job_search_fanout
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import config
+from services import job_recommender
+from services.job_recommender import search_jobs, search_jobs_multi
+
+KEYWORDS = ['data engineer', 'analytics engineer']
+LOCATIONS = ['Berlin', 'remote']
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        query, location = params['query'][0], params.get('location', [''])[0]
+        time.sleep(0.6 if location == 'remote' and query.startswith('analytics') else 0.2)
+        # Every query shares listing 0, so the merge has duplicates to collapse
+        data = [
+            {'job_id': f"{query}-{location}-{i}" if i else 'shared', 'job_title': f"{query.title()} {i}",
+             'employer_name': f"Company {i}", 'job_city': location, 'job_description': f"{query} role {i} in {location}"}
+            for i in range(10)
+        ]
+        body = json.dumps({'status': 'OK', 'data': data, 'total_jobs': 50}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    config.JSEARCH_API_URL = f'http://127.0.0.1:{server.server_port}/search'
+    # Measure upstream calls, not cache hits or listings dropped as reposts
+    job_recommender.job_deduplicator = None
+    try:
+        job_recommender.job_search_cache.clear()
+        started = time.perf_counter()
+        for keywords in KEYWORDS:
+            for location in LOCATIONS:
+                search_jobs(keywords, location)
+        print(f"sequential:        {time.perf_counter() - started:.3f}s")
+
+        job_recommender.job_search_cache.clear()
+        started = time.perf_counter()
+        results = search_jobs_multi(' OR '.join(KEYWORDS), ' OR '.join(LOCATIONS))
+        print(f"fan-out:           {time.perf_counter() - started:.3f}s, "
+              f"{len(results['jobs'])} merged listings, partial={results['partial']}")
+
+        job_recommender.job_search_cache.clear()
+        started = time.perf_counter()
+        results = search_jobs_multi(KEYWORDS, LOCATIONS, timeout=0.4)
+        timed_out = sum(1 for query in results['queries'] if query.get('timed_out'))
+        print(f"fan-out, 0.4s cap: {time.perf_counter() - started:.3f}s, "
+              f"{len(results['jobs'])} merged listings, {timed_out} timed out")
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
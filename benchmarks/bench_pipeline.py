@@ -0,0 +1,237 @@
+# benchmarks/bench_pipeline.py
+#
+# End-to-end benchmark of the resume pipeline on synthetic PDF and DOCX
+# resumes: per-stage time and peak memory for extraction, each extractor and
+# ATS scoring, plus throughput of analyze_resume_file at N worker processes.
+# Results are written as JSON so runs can be compared across commits:
+#
+#   python -m benchmarks.bench_pipeline --output before.json
+#   git checkout <other commit>
+#   python -m benchmarks.bench_pipeline --output after.json --compare before.json
+#
+# A human-readable summary goes to stderr. Stage timings run in this process,
+# so PDFs past PDF_PARALLEL_MIN_PAGES fan out to the shared process pool
+# exactly as they do when served.
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.corpus import make_resume_docx, make_resume_pdf
+from services.batch_analyzer import analyze_resume_file
+from services.resume_analyzer import (
+    calculate_ats_score, extract_education, extract_experience, extract_skills, generate_suggestions
+)
+from services.resume_document import ResumeDocument
+from utils.text_extraction import extract_document_from_bytes
+
+SCHEMA_VERSION = 1
+GENERATORS = {'pdf': make_resume_pdf, 'docx': make_resume_docx}
+
+
+def make_resume(fmt: str, pages: int, roles: int, skills: int, seed: int) -> Tuple[str, bytes]:
+    return f'resume-{pages}p-{seed}.{fmt}', GENERATORS[fmt](pages=pages, roles=roles, skills=skills, seed=seed)
+
+
+def run_stages(filename: str, data: bytes) -> List[Tuple[str, Callable[[], Any]]]:
+    """
+    The pipeline as analyze_resume_file runs it, split into named stages.
+    Each stage is a thunk that stores its result for the stages after it.
+    """
+    state: Dict[str, Any] = {}
+
+    def extract():
+        state['text'] = extract_document_from_bytes(filename, data).text
+
+    def parse():
+        state['doc'] = ResumeDocument(state['text'])
+
+    def skills():
+        state['skills'] = extract_skills(state['doc'])
+
+    def education():
+        state['education'] = extract_education(state['doc'])
+
+    def experience():
+        state['experience'] = extract_experience(state['doc'])
+
+    def suggestions():
+        state['suggestions'] = generate_suggestions(
+            state['doc'], state['skills'], state['education'], state['experience']
+        )
+
+    def ats_score():
+        calculate_ats_score({key: state[key] for key in ('skills', 'education', 'experience', 'suggestions')})
+
+    return [
+        ('extract', extract), ('parse', parse), ('extract_skills', skills),
+        ('extract_education', education), ('extract_experience', experience),
+        ('generate_suggestions', suggestions), ('calculate_ats_score', ats_score),
+    ]
+
+
+def measure_stages(filename: str, data: bytes, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Time every stage `repeat` times on a fresh pipeline, then run it once
+    more under tracemalloc for each stage's peak allocation.
+    """
+    timings: Dict[str, List[float]] = {}
+    for _ in range(repeat + 1):
+        for name, stage in run_stages(filename, data):
+            started = time.perf_counter()
+            stage()
+            timings.setdefault(name, []).append(time.perf_counter() - started)
+
+    peaks = {}
+    tracemalloc.start()
+    try:
+        for name, stage in run_stages(filename, data):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            stage()
+            peaks[name] = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+    results = {}
+    for name, samples in timings.items():
+        samples = samples[1:]  # the first pass warms caches and imports
+        results[name] = {
+            'median_ms': round(statistics.median(samples) * 1000, 4),
+            'min_ms': round(min(samples) * 1000, 4),
+            'peak_kb': round(peaks[name] / 1024, 1),
+        }
+    return results
+
+
+def measure_throughput(files: List[Tuple[str, bytes]], workers: int) -> Dict[str, float]:
+    """
+    Analyze every file with analyze_resume_file on a fresh pool of `workers`
+    processes and report files per second.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Start every worker and import the pipeline before the clock starts
+        list(pool.map(analyze_resume_file, *zip(*files[:workers])))
+        started = time.perf_counter()
+        results = list(pool.map(analyze_resume_file, *zip(*files)))
+        elapsed = time.perf_counter() - started
+
+    errors = sum(1 for result in results if 'error' in result)
+    return {
+        'workers': workers,
+        'files': len(files),
+        'errors': errors,
+        'seconds': round(elapsed, 4),
+        'files_per_second': round(len(files) / elapsed, 2),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """
+    Print median time and throughput ratios of this run against a baseline
+    report (>1.00x means this run is slower).
+    """
+    print(f"\nvs {baseline['meta'].get('commit') or 'baseline'}", file=sys.stderr)
+    before = {(r['format'], r['pages']): r['stages'] for r in baseline.get('stages', [])}
+    for row in report['stages']:
+        old = before.get((row['format'], row['pages']))
+        if not old:
+            continue
+        ratios = [
+            f"{name} {stats['median_ms'] / old[name]['median_ms']:.2f}x"
+            for name, stats in row['stages'].items()
+            if old.get(name, {}).get('median_ms')
+        ]
+        print(f"  {row['format']} {row['pages']}p: " + ', '.join(ratios), file=sys.stderr)
+
+    before_throughput = {r['workers']: r for r in baseline.get('throughput', [])}
+    for row in report['throughput']:
+        old = before_throughput.get(row['workers'])
+        if old:
+            print(f"  {row['workers']} workers: {row['files_per_second'] / old['files_per_second']:.2f}x files/s",
+                  file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the resume pipeline on synthetic resumes.')
+    parser.add_argument('--formats', nargs='+', choices=sorted(GENERATORS), default=['pdf', 'docx'])
+    parser.add_argument('--pages', nargs='+', type=int, default=[1, 5, 20])
+    parser.add_argument('--roles-per-page', type=int, default=2)
+    parser.add_argument('--skills', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per stage')
+    parser.add_argument('--workers', nargs='+', type=int, default=[1, 2, 4])
+    parser.add_argument('--files', type=int, default=32, help='resumes per throughput run')
+    parser.add_argument('--throughput-pages', type=int, default=2)
+    parser.add_argument('--output', default='-', help="JSON report path, '-' for stdout")
+    parser.add_argument('--compare', help='earlier JSON report to compare against')
+    args = parser.parse_args(argv)
+
+    report: Dict[str, Any] = {
+        'schema': SCHEMA_VERSION,
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'args': vars(args),
+        },
+        'stages': [],
+        'throughput': [],
+    }
+
+    for fmt in args.formats:
+        for pages in args.pages:
+            filename, data = make_resume(fmt, pages, pages * args.roles_per_page, args.skills, seed=pages)
+            stages = measure_stages(filename, data, args.repeat)
+            report['stages'].append({'format': fmt, 'pages': pages, 'bytes': len(data), 'stages': stages})
+            total = sum(stats['median_ms'] for stats in stages.values())
+            print(f"{fmt:>4} {pages:>3}p {len(data) // 1024:>5}KB  total {total:8.2f}ms  "
+                  + '  '.join(f"{name} {stats['median_ms']:.2f}" for name, stats in stages.items()),
+                  file=sys.stderr)
+
+    files = [
+        make_resume(args.formats[i % len(args.formats)], args.throughput_pages,
+                    args.throughput_pages * args.roles_per_page, args.skills, seed=i)
+        for i in range(args.files)
+    ]
+    for workers in args.workers:
+        row = measure_throughput(files, workers)
+        report['throughput'].append(row)
+        print(f"{workers:>3} workers  {row['files_per_second']:8.1f} files/s  ({row['errors']} errors)",
+              file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(report, json.load(f))
+
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
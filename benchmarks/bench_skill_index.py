@@ -0,0 +1,80 @@
+# benchmarks/bench_skill_index.py
+#
+# Startup, memory and scan cost of the compiled, memory-mapped skill index
+# against building the in-memory SkillMatcher trie from the taxonomy, with the
+# real taxonomy padded out to tens of thousands of synthetic skills.
+#
+#   python -m benchmarks.bench_skill_index
+
+import os
+import random
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+from benchmarks.corpus import make_resume_text
+from services.skill_matcher import SkillMatcher
+from services.skill_taxonomy import DEFAULT_TAXONOMY_PATH, SkillIndex, build, load_taxonomy
+
+SYLLABLES = ['ka', 'lo', 'mi', 'ra', 'tu', 'ven', 'dor', 'sil', 'qua', 'zen', 'pex', 'bri']
+
+
+def write_taxonomy(path: str, extra: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    with open(DEFAULT_TAXONOMY_PATH, encoding='utf-8') as f:
+        lines = [line for line in f if line.strip() and not line.startswith('#')]
+    for number in range(extra):
+        words = [''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) + str(number)
+                 for _ in range(rng.randint(1, 3))]
+        name = ' '.join(words)
+        lines.append(f"synthetic-{number}\t{name.title()}\tsynthetic\t{'-'.join(words)}|{words[0]}x\n")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+
+
+def in_memory(taxonomy_path: str) -> SkillMatcher:
+    return SkillMatcher(
+        (surface, entry.name)
+        for entry in load_taxonomy(taxonomy_path)
+        for surface in (entry.name,) + entry.synonyms
+    )
+
+
+def main():
+    text = make_resume_text(pages=5, roles=10, skills=20, seed=5)
+    print(f"{'surfaces':>8} {'build ms':>9} {'trie MB':>8} {'compile ms':>11} {'index KB':>9} "
+          f"{'open ms':>8} {'trie scan ms':>13} {'index scan ms':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for extra in (0, 10000, 50000):
+            taxonomy_path = os.path.join(tmp, f'taxonomy-{extra}.tsv')
+            index_path = os.path.join(tmp, f'skills-{extra}.idx')
+            write_taxonomy(taxonomy_path, extra)
+
+            tracemalloc.start()
+            started = time.perf_counter()
+            trie = in_memory(taxonomy_path)
+            build_ms = (time.perf_counter() - started) * 1000
+            trie_mb = tracemalloc.get_traced_memory()[0] / 2 ** 20
+            tracemalloc.stop()
+
+            started = time.perf_counter()
+            build(taxonomy_path, index_path)
+            compile_ms = (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            index = SkillIndex(index_path)
+            open_ms = (time.perf_counter() - started) * 1000
+
+            assert [(m.skill, m.start, m.end) for m in trie.find_all(text)] == \
+                [(m.skill, m.start, m.end) for m in index.find_all(text)]
+
+            trie_scan = min(timeit.repeat(lambda: trie.find_all(text), number=20, repeat=3)) / 20
+            index_scan = min(timeit.repeat(lambda: index.find_all(text), number=20, repeat=3)) / 20
+            print(f"{trie.size:>8} {build_ms:>9.1f} {trie_mb:>8.1f} {compile_ms:>11.1f} "
+                  f"{os.path.getsize(index_path) / 1024:>9.0f} {open_ms:>8.3f} "
+                  f"{trie_scan * 1000:>13.3f} {index_scan * 1000:>14.3f}")
+
+
+if __name__ == '__main__':
+    main()
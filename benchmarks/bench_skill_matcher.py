@@ -0,0 +1,47 @@
+# benchmarks/bench_skill_matcher.py
+#
+# Compare the skill matcher against the per-call regex that extract_skills
+# used to build over the old hard-coded skill list.
+#
+#   python -m benchmarks.bench_skill_matcher
+
+import re
+import timeit
+
+from benchmarks.corpus import make_resume_text
+from services.resume_analyzer import SKILL_MATCHER
+
+# The list extract_skills used before the taxonomy file
+SKILL_KEYWORDS = [
+    'python', 'javascript', 'typescript', 'java', 'c++', 'c#', 'react', 'angular',
+    'vue', 'node', 'express', 'django', 'flask', 'sql', 'nosql', 'mongodb',
+    'postgresql', 'mysql', 'aws', 'azure', 'gcp', 'docker', 'kubernetes',
+    'git', 'agile', 'scrum', 'project management', 'leadership', 'communication',
+    'html', 'css', 'bootstrap', 'tailwind', 'jquery', 'php', 'laravel', 'symfony',
+    'ruby', 'rails', 'go', 'rust', 'swift', 'kotlin', 'tensorflow', 'pytorch',
+    'machine learning', 'artificial intelligence', 'data science', 'big data',
+    'hadoop', 'spark', 'tableau', 'power bi', 'excel', 'word', 'powerpoint',
+    'photoshop', 'illustrator', 'figma', 'sketch', 'ui/ux', 'seo', 'digital marketing'
+]
+
+
+def legacy_extract_skills(text):
+    pattern = '|'.join(r'\b' + re.escape(skill) + r'\b' for skill in SKILL_KEYWORDS)
+    found_skills = list(set(re.findall(pattern, text.lower())))
+    return [skill.capitalize() for skill in found_skills]
+
+
+def main():
+    print(f"{'pages':>5} {'chars':>8} {'regex ms':>10} {'matcher ms':>11} {'speedup':>8}")
+    for pages in (1, 2, 5, 10, 20):
+        text = make_resume_text(pages=pages, roles=pages * 2, skills=20, seed=pages)
+        runs = max(5, 200 // pages)
+        # re's module cache keeps the compiled legacy pattern warm between calls,
+        # so this is the legacy best case
+        legacy = min(timeit.repeat(lambda: legacy_extract_skills(text), number=runs, repeat=3)) / runs
+        matcher = min(timeit.repeat(lambda: SKILL_MATCHER.extract(text), number=runs, repeat=3)) / runs
+        print(f"{pages:>5} {len(text):>8} {legacy * 1000:>10.3f} {matcher * 1000:>11.3f} {legacy / matcher:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
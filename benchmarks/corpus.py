@@ -0,0 +1,148 @@
+# benchmarks/corpus.py
+
+import io
+import random
+import textwrap
+from typing import List
+
+import docx
+
+CHARS_PER_PAGE = 3000
+# Characters per line in generated PDFs (Helvetica 10pt on US letter)
+PDF_LINE_WIDTH = 95
+
+SKILLS = [
+    'Python', 'JavaScript', 'TypeScript', 'Java', 'C++', 'C#', 'React', 'Angular',
+    'Django', 'Flask', 'SQL', 'MongoDB', 'PostgreSQL', 'AWS', 'Azure', 'Docker',
+    'Kubernetes', 'Git', 'Agile', 'Scrum', 'Project Management', 'Leadership',
+    'HTML', 'CSS', 'Go', 'Rust', 'TensorFlow', 'Machine Learning', 'Data Science',
+    'Spark', 'Tableau', 'Power BI', 'Excel', 'Figma', 'UI/UX', 'SEO'
+]
+
+TITLES = [
+    'Software Engineer', 'Senior Developer', 'Developer', 'Analyst', 'Architect',
+    'Consultant', 'Manager', 'Designer', 'Lead', 'Programmer'
+]
+
+COMPANIES = [
+    'Acme Inc', 'Globex Corp', 'Initech Solutions', 'Umbrella Technologies',
+    'Hooli Systems', 'Vandelay LLC', 'Stark Corporation', 'Wayne Company'
+]
+
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+FILLER = (
+    'Worked closely with cross-functional teams to deliver reliable features on schedule. '
+    'Reviewed code, mentored junior engineers and improved release processes. '
+    'Owned the roadmap for internal tooling and reduced support tickets significantly. '
+).split()
+
+
+def _sentence(rng: random.Random, skills: List[str], words: int = 18) -> str:
+    picked = [rng.choice(FILLER) for _ in range(words)]
+    picked.insert(rng.randrange(len(picked)), rng.choice(skills))
+    return ' '.join(picked).capitalize() + '.'
+
+
+def make_resume_text(pages: int = 1, roles: int = 3, skills: int = 12, seed: int = 0) -> str:
+    """
+    Build a plain-text resume of roughly `pages` pages with `roles` experience
+    entries and a pool of `skills` distinct skills sprinkled through it.
+    """
+    rng = random.Random(seed)
+    skill_pool = rng.sample(SKILLS, min(skills, len(SKILLS)))
+
+    parts = [
+        'Jane Doe\njane.doe@example.com\n',
+        'Skills\n' + ', '.join(skill_pool) + '\n',
+        'Education\nMaster of Science, University of Oxford, 2015\nBachelor of Science, College Cambridge, 2013\n',
+        'Experience',
+    ]
+    for i in range(roles):
+        start = 2000 + (i % 20)
+        parts.append(
+            f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)}\n"
+            f"{rng.choice(MONTHS)} {start} - {rng.choice(MONTHS)} {start + 1}\n"
+            + ' '.join(_sentence(rng, skill_pool) for _ in range(3))
+        )
+    parts.append('Projects\nCertifications\nPublications')
+
+    text = '\n\n'.join(parts)
+    target = pages * CHARS_PER_PAGE
+    filler = []
+    while len(text) + sum(len(p) for p in filler) < target:
+        filler.append(' '.join(_sentence(rng, skill_pool) for _ in range(4)))
+    if filler:
+        text += '\n\n' + '\n\n'.join(filler)
+    return text
+
+
+def _pdf_string(line: str) -> str:
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def make_resume_pdf(pages: int = 1, roles: int = 3, skills: int = 12, seed: int = 0) -> bytes:
+    """
+    Render make_resume_text as a minimal text-only PDF of exactly `pages`
+    pages. Written by hand so the corpus needs no PDF library; PyPDF2 reads
+    it like any other PDF.
+    """
+    lines = []
+    for paragraph in make_resume_text(pages, roles, skills, seed).split('\n'):
+        lines.extend(textwrap.wrap(paragraph, PDF_LINE_WIDTH) or [''])
+    per_page = -(-len(lines) // pages)
+    page_lines = [lines[i:i + per_page] for i in range(0, len(lines), per_page)]
+
+    # 1 catalog, 2 page tree, 3 font, then a page and content stream per page
+    kids = ' '.join(f'{4 + 2 * i} 0 R' for i in range(len(page_lines)))
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        f'<< /Type /Pages /Kids [{kids}] /Count {len(page_lines)} >>'.encode(),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    for i, chunk in enumerate(page_lines):
+        operators = ['BT /F1 10 Tf 12 TL 50 760 Td']
+        operators.extend(f'({_pdf_string(line)}) Tj T*' for line in chunk)
+        operators.append('ET')
+        stream = '\n'.join(operators).encode('latin-1', 'replace')
+        objects.append(
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            f'/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>'.encode()
+        )
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f'{number} 0 obj\n'.encode() + body + b'\nendobj\n'
+    xref = len(out)
+    out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode()
+    for offset in offsets:
+        out += f'{offset:010d} 00000 n \n'.encode()
+    out += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode()
+    return bytes(out)
+
+
+def make_resume_docx(pages: int = 1, roles: int = 3, skills: int = 12, seed: int = 0,
+                     table_rows: int = 0) -> bytes:
+    """
+    Render make_resume_text as a DOCX, one paragraph per text paragraph,
+    optionally followed by a skills matrix table whose last two columns are
+    merged in every row.
+    """
+    document = docx.Document()
+    for paragraph in make_resume_text(pages, roles, skills, seed).split('\n\n'):
+        document.add_paragraph(paragraph)
+
+    if table_rows:
+        table = document.add_table(rows=table_rows, cols=4)
+        for i, row in enumerate(table.rows):
+            cells = row.cells
+            for j, cell in enumerate(cells):
+                cell.text = f"Skill {i}-{j} Python SQL Docker"
+            cells[2].merge(cells[3])
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
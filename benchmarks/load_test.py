@@ -0,0 +1,275 @@
+# benchmarks/load_test.py
+#
+# End-to-end load test of the /api routes. Replays a mix of resume analyses,
+# job searches, career advice and history lookups at a target request rate
+# (open loop, Poisson arrivals), then reports throughput, p50/p95/p99 latency
+# and errors per route. Latency is measured from when a request was due, so
+# time spent queueing behind a saturated app counts against it.
+#
+# By default the app runs in this process on a temporary SQLite database,
+# with JSearch and Hugging Face replaced by local stubs (benchmarks/stubs.py):
+#
+#   python -m benchmarks.load_test --rps 20 --duration 60 --latency-ms 300 --error-rate 0.02
+#
+# To load a separately started app (e.g. under gunicorn, pointed at stubs
+# started with python -m benchmarks.stubs), pass its base URL:
+#
+#   python -m benchmarks.load_test --target http://127.0.0.1:5000 --rps 50 --output run.json
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from benchmarks.corpus import SKILLS, TITLES, make_resume_docx, make_resume_pdf
+from benchmarks.stubs import StubSettings, start_all
+
+DEFAULT_MIX = 'search=50,advice=20,history=20,analyze=10'
+LOCATIONS = ['', '', 'Berlin', 'London', 'Remote', 'New York']
+QUESTIONS = [
+    "How do I answer 'tell me about yourself'?",
+    "How should I negotiate a higher salary offer?",
+    "What should I put in a resume summary?",
+    "How do I explain a gap in my employment?",
+    "How do I prepare for a system design interview?",
+    "What questions should I ask at the end of an interview?",
+    "How do I move from support into software engineering?",
+    "How do I follow up after an interview without being pushy?",
+]
+
+
+class Driver:
+    """
+    Issues requests for each route kind against base_url and records
+    (route, due time, latency, outcome) for every one.
+    """
+
+    def __init__(self, base_url: str, users: List[Optional[int]], seed: int = 0):
+        self.base_url = base_url.rstrip('/')
+        self.users = users
+        self.rng = random.Random(seed)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # (route, due, latency, outcome)
+        self.samples: List[Tuple[str, float, float, str]] = []
+        # A small pool of resumes, so repeat uploads hit the analysis cache as they do in use
+        self.resumes = [
+            (f"resume-{i}.pdf", make_resume_pdf(pages=1 + i % 3, seed=i)) if i % 2 == 0
+            else (f"resume-{i}.docx", make_resume_docx(pages=1 + i % 2, seed=i))
+            for i in range(12)
+        ]
+        self.queries = [f"{skill} {title}" for skill in SKILLS[:12] for title in TITLES[:3]]
+
+    def session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def user(self) -> Optional[int]:
+        return self.rng.choice(self.users) if self.users else None
+
+    def search(self) -> Tuple[str, requests.Response]:
+        page = self.rng.choices([1, 2, 3], weights=[70, 20, 10])[0]
+        body = {'keywords': self.rng.choice(self.queries), 'location': self.rng.choice(LOCATIONS), 'page': page}
+        if self.rng.random() < 0.5:
+            body['user_id'] = self.user()
+        return 'search', self.session().post(f"{self.base_url}/api/search-jobs", json=body, timeout=60)
+
+    def analyze(self) -> Tuple[str, requests.Response]:
+        name, data = self.rng.choice(self.resumes)
+        form = {'user_id': str(self.user())} if self.rng.random() < 0.5 and self.users else {}
+        return 'analyze', self.session().post(
+            f"{self.base_url}/api/analyze-resume", files={'resume': (name, data)}, data=form, timeout=120
+        )
+
+    def advice(self) -> Tuple[str, requests.Response]:
+        body = {'message': self.rng.choice(QUESTIONS), 'user_id': self.user()}
+        return 'advice', self.session().post(f"{self.base_url}/api/career-advice", json=body, timeout=120)
+
+    def history(self) -> Tuple[str, requests.Response]:
+        kind = self.rng.choice(['chat-history', 'resume-analyses', 'saved-jobs'])
+        return f"history:{kind}", self.session().get(f"{self.base_url}/api/user/{self.user()}/{kind}", timeout=30)
+
+    def run(self, action: Callable[[], Tuple[str, requests.Response]], name: str, due: float) -> None:
+        """
+        Issue one request and record it. due is the perf_counter time it was
+        scheduled for.
+        """
+        try:
+            route, response = action()
+            outcome = str(response.status_code)
+            if response.ok:
+                try:
+                    payload = response.json()
+                except ValueError:
+                    payload = None
+                # Search and advice report upstream failures in a 200 body
+                if isinstance(payload, dict) and 'error' in payload:
+                    outcome = '200 with error'
+                else:
+                    outcome = 'ok'
+        except requests.RequestException as e:
+            route, outcome = name, type(e).__name__
+        latency = time.perf_counter() - due
+        with self._lock:
+            self.samples.append((route, due, latency, outcome))
+
+
+def start_app() -> str:
+    """
+    Serve app.py in this process, with threads, on a temporary SQLite
+    database. Must run after the stub URLs are in the environment.
+    """
+    from werkzeug.serving import make_server
+
+    os.environ.setdefault('DATABASE_URL', f"sqlite:///{tempfile.mkdtemp()}/load_test.db")
+    os.environ.setdefault('JSEARCH_API_KEY', 'stub')
+    os.environ.setdefault('HUGGINGFACE_API_KEY', 'stub')
+    from app import app
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def create_users(base_url: str, count: int) -> List[Optional[int]]:
+    users = []
+    for i in range(count):
+        try:
+            response = requests.post(f"{base_url}/api/user/create", timeout=30, json={
+                'firebase_uid': f"load-test-{i}", 'email': f"load-test-{i}@example.com"
+            })
+            users.append(response.json().get('user_id'))
+        except (requests.RequestException, ValueError):
+            users.append(None)
+    users = [user for user in users if user is not None]
+    if not users:
+        print("Could not create users; history calls will fail", file=sys.stderr)
+    return users
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(','):
+        name, _, weight = part.partition('=')
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def report(samples: List[Tuple[str, float, float, str]], since: float, elapsed: float) -> Dict[str, Any]:
+    """
+    Summarize samples due at or after since, per route and overall.
+    """
+    by_route = defaultdict(list)
+    for route, due, latency, outcome in samples:
+        if due < since:
+            continue
+        by_route[route].append((latency, outcome))
+        by_route['all'].append((latency, outcome))
+
+    routes = {}
+    for route, entries in sorted(by_route.items()):
+        latencies = sorted(latency for latency, _ in entries)
+        outcomes = Counter(outcome for _, outcome in entries)
+        ok = outcomes.pop('ok', 0)
+        routes[route] = {
+            'requests': len(entries),
+            'ok': ok,
+            'throughput_rps': round(ok / elapsed, 2),
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 1),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 1),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 1),
+            'mean_ms': round(statistics.mean(latencies) * 1000, 1),
+            'errors': dict(outcomes)
+        }
+    return routes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the ThriveMate /api routes")
+    parser.add_argument('--target', help="Base URL of a running app; starts one in-process when omitted")
+    parser.add_argument('--rps', type=float, default=10)
+    parser.add_argument('--duration', type=float, default=30, help="Seconds of measured load")
+    parser.add_argument('--warmup', type=float, default=5, help="Seconds of load before measuring")
+    parser.add_argument('--mix', default=DEFAULT_MIX, help="Relative weights, e.g. search=50,advice=20")
+    parser.add_argument('--concurrency', type=int, default=64, help="Most requests in flight")
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--latency-ms', type=float, default=200, help="Stub upstream latency")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Stub upstream failure rate")
+    parser.add_argument('--description-chars', type=int, default=3000, help="Stub job description size")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Write the report as JSON to this file")
+    args = parser.parse_args()
+
+    servers = []
+    base_url = args.target
+    if not base_url:
+        settings = StubSettings(args.latency_ms, error_rate=args.error_rate,
+                                description_chars=args.description_chars, seed=args.seed)
+        servers, env = start_all(settings)
+        os.environ.update(env)
+        base_url = start_app()
+
+    driver = Driver(base_url, create_users(base_url, args.users), seed=args.seed)
+    mix = parse_mix(args.mix)
+    actions = {'search': driver.search, 'analyze': driver.analyze, 'advice': driver.advice, 'history': driver.history}
+    names = [name for name in mix if name in actions]
+    weights = [mix[name] for name in names]
+    arrivals = random.Random(args.seed)
+
+    print(f"{args.rps} rps for {args.warmup:.0f}s warmup + {args.duration:.0f}s against {base_url}", file=sys.stderr)
+    executor = ThreadPoolExecutor(max_workers=args.concurrency)
+    started = time.perf_counter()
+    measure_from = started + args.warmup
+    stop_at = measure_from + args.duration
+    due = started
+    while due < stop_at:
+        due += arrivals.expovariate(args.rps)
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        name = arrivals.choices(names, weights=weights)[0]
+        executor.submit(driver.run, actions[name], name, due)
+    executor.shutdown(wait=True)
+    elapsed = time.perf_counter() - measure_from
+
+    routes = report(driver.samples, measure_from, elapsed)
+    result = {
+        'target': args.target or 'in-process',
+        'rps': args.rps,
+        'duration': args.duration,
+        'mix': mix,
+        'stub': None if args.target else {'latency_ms': args.latency_ms, 'error_rate': args.error_rate},
+        'routes': routes
+    }
+    if args.output:
+        with open(args.output, 'w') as out:
+            json.dump(result, out, indent=2)
+
+    print(f"{'route':<24} {'reqs':>6} {'ok':>6} {'ok/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  errors")
+    for route, stats in routes.items():
+        errors = ', '.join(f"{outcome}: {count}" for outcome, count in stats['errors'].items()) or '-'
+        print(f"{route:<24} {stats['requests']:>6} {stats['ok']:>6} {stats['throughput_rps']:>7.2f} "
+              f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}  {errors}")
+
+    for server in servers:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+# benchmarks/stubs.py
+#
+# Local stand-ins for the JSearch search and job-details endpoints and the
+# Hugging Face inference endpoint, with configurable latency, error rate and
+# payload size, so the app can be load-tested without spending API quota.
+# benchmarks/load_test.py starts them itself; to point a separately started
+# app at them, run
+#
+#   python -m benchmarks.stubs --latency-ms 300 --error-rate 0.02
+#
+# and export the JSEARCH_API_URL, JSEARCH_DETAILS_URL and HUGGINGFACE_API_URL
+# it prints before starting the app.
+
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.corpus import COMPANIES, SKILLS, TITLES, make_resume_text
+
+CITIES = ['Berlin', 'London', 'New York', 'Austin', 'Toronto', 'Bangalore', 'Remote']
+PERIODS = ['YEAR', 'YEAR', 'YEAR', 'HOUR', 'MONTH']
+
+
+class StubSettings:
+    """
+    Behaviour shared by the stub handlers; change attributes while running.
+    """
+
+    def __init__(self, latency_ms: float = 200, jitter_ms: float = 50, error_rate: float = 0.0,
+                 description_chars: int = 3000, total_jobs: int = 200, answer_chars: int = 800, seed: int = 0,
+                 token_ms: float = 20):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.description_chars = description_chars
+        self.total_jobs = total_jobs
+        self.answer_chars = answer_chars
+        self.seed = seed
+        # Time between tokens of a streamed answer; latency_ms is the time to the first
+        self.token_ms = token_ms
+        self.requests = 0
+        self.errors = 0
+        # Streams the client closed before the last token
+        self.cancelled = 0
+        self._lock = threading.Lock()
+
+    def delay(self) -> None:
+        time.sleep(max(self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms), 0) / 1000)
+
+    def failure(self) -> int:
+        """
+        Status code to fail this request with, or 0. Failures are mostly
+        429s, as from an exhausted RapidAPI quota, and some 503s.
+        """
+        with self._lock:
+            self.requests += 1
+            if random.random() >= self.error_rate:
+                return 0
+            self.errors += 1
+        return 429 if random.random() < 0.7 else 503
+
+
+def make_listing(job_id: str, settings: StubSettings) -> Dict[str, Any]:
+    """
+    A raw JSearch listing, the same every time for the same id.
+    """
+    rng = random.Random(zlib.crc32(job_id.encode('utf-8')) ^ settings.seed)
+    description = make_resume_text(pages=1, roles=1, skills=rng.randint(4, 12), seed=rng.randrange(1 << 30))
+    listing = {
+        'job_id': job_id,
+        'job_title': f"{rng.choice(SKILLS)} {rng.choice(TITLES)}",
+        'employer_name': rng.choice(COMPANIES),
+        'employer_logo': '',
+        'job_city': rng.choice(CITIES),
+        'job_country': 'US',
+        'job_description': description[:settings.description_chars],
+        'job_posted_at_datetime_utc': time.strftime(
+            '%Y-%m-%dT%H:%M:%S.000Z', time.gmtime(time.time() - rng.uniform(0, 45) * 86400)
+        ),
+        'job_apply_link': f"https://jobs.example.com/{job_id}",
+        'job_employment_type': rng.choice(['FULLTIME', 'CONTRACTOR', 'PARTTIME'])
+    }
+    if rng.random() < 0.5:
+        period = rng.choice(PERIODS)
+        base = {'YEAR': 90000, 'HOUR': 45, 'MONTH': 7500}[period]
+        listing['job_min_salary'] = round(base * rng.uniform(0.7, 1.0))
+        listing['job_max_salary'] = round(base * rng.uniform(1.0, 1.6))
+        listing['job_salary_period'] = period
+    return listing
+
+
+class StubServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 resets connections under bursts of
+    # concurrent callers, which would count as upstream failures
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without this, Nagle plus
+    # delayed ACKs add ~40ms to every keep-alive response
+    disable_nagle_algorithm = True
+    settings: StubSettings = StubSettings()
+
+    def send_json(self, status: int, payload: Any) -> None:
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class JSearchHandler(StubHandler):
+    def do_GET(self):
+        self.settings.delay()
+        status = self.settings.failure()
+        if status:
+            self.send_json(status, {'message': 'Stub failure'})
+            return
+
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if url.path.endswith('/job-details'):
+            data = [make_listing(job_id, self.settings) for job_id in params.get('job_id', '').split(',') if job_id]
+            self.send_json(200, {'status': 'OK', 'data': data})
+            return
+
+        page = int(params.get('page', 1))
+        page_size = int(params.get('page_size', 10))
+        query = f"{params.get('query', '')}|{params.get('location', '')}".lower()
+        start = (page - 1) * page_size
+        count = max(min(page_size, self.settings.total_jobs - start), 0)
+        ids = [f"{zlib.crc32(query.encode('utf-8')):08x}-{start + i}" for i in range(count)]
+        data = [make_listing(job_id, self.settings) for job_id in ids]
+        self.send_json(200, {'status': 'OK', 'data': data, 'total_jobs': self.settings.total_jobs})
+
+
+class HuggingFaceHandler(StubHandler):
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        self.settings.delay()
+        status = self.settings.failure()
+        if status:
+            self.send_json(status, {'error': 'Stub failure'})
+            return
+
+        prompt = payload.get('inputs', '')
+        inputs = prompt if isinstance(prompt, list) else [prompt]
+        rng = random.Random(zlib.crc32(str(inputs[0]).encode('utf-8')))
+        texts = [make_resume_text(pages=1, roles=1, seed=rng.randrange(1 << 30))[:self.settings.answer_chars]
+                 for _ in inputs]
+        if payload.get('stream'):
+            self.send_stream(texts[0])
+            return
+        # A blocking answer arrives when the last token would have
+        time.sleep(len(texts[0].split(' ')) * self.settings.token_ms / 1000)
+        self.send_json(200, [{'generated_text': f"{text}\n{answer}"} for text, answer in zip(inputs, texts)])
+
+    def send_stream(self, answer: str) -> None:
+        """
+        Send answer word by word as text-generation-inference server-sent
+        events (one HTTP chunk each), token_ms apart, ending with an
+        end-of-sequence token. Stops when the client goes away.
+        """
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        tokens = [{'text': f" {word}" if i else word, 'special': False} for i, word in enumerate(answer.split(' '))]
+        tokens.append({'text': '</s>', 'special': True})
+        try:
+            for i, token in enumerate(tokens):
+                if i:
+                    time.sleep(self.settings.token_ms / 1000)
+                last = i == len(tokens) - 1
+                event = {'token': token, 'generated_text': answer if last else None}
+                data = f"data: {json.dumps(event)}\n\n".encode('utf-8')
+                self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            with self.settings._lock:
+                self.settings.cancelled += 1
+
+
+def start(handler: type, settings: StubSettings, port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Serve handler on 127.0.0.1 in a daemon thread.
+
+    Returns:
+        (server, base url)
+    """
+    handler_class = type(handler.__name__, (handler,), {'settings': settings})
+    server = StubServer(('127.0.0.1', port), handler_class)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def start_all(settings: StubSettings, jsearch_port: int = 0,
+              hf_port: int = 0) -> Tuple[List[ThreadingHTTPServer], Dict[str, str]]:
+    """
+    Start both stubs.
+
+    Returns:
+        (servers, {environment variable: url}) for pointing the app at them
+    """
+    jsearch, jsearch_url = start(JSearchHandler, settings, jsearch_port)
+    hf, hf_url = start(HuggingFaceHandler, settings, hf_port)
+    return [jsearch, hf], {
+        'JSEARCH_API_URL': f"{jsearch_url}/search",
+        'JSEARCH_DETAILS_URL': f"{jsearch_url}/job-details",
+        'HUGGINGFACE_API_URL': f"{hf_url}/models/stub"
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the JSearch and Hugging Face stubs")
+    parser.add_argument('--jsearch-port', type=int, default=8701)
+    parser.add_argument('--hf-port', type=int, default=8702)
+    parser.add_argument('--latency-ms', type=float, default=200)
+    parser.add_argument('--jitter-ms', type=float, default=50)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--description-chars', type=int, default=3000)
+    parser.add_argument('--answer-chars', type=int, default=800)
+    args = parser.parse_args()
+
+    settings = StubSettings(args.latency_ms, args.jitter_ms, args.error_rate,
+                            args.description_chars, answer_chars=args.answer_chars)
+    servers, env = start_all(settings, args.jsearch_port, args.hf_port)
+    for name, url in env.items():
+        print(f"export {name}={url}")
+    try:
+        while True:
+            time.sleep(10)
+            print(f"{settings.requests} requests, {settings.errors} failed")
+    except KeyboardInterrupt:
+        for server in servers:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,4 @@
-from app import app
+from app import app, socketio
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    socketio.run(app, host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,325 @@
+# services/advice_cache.py
+
+import hashlib
+import logging
+import math
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+WORD_PATTERN = re.compile(r"[a-z0-9+#']+")
+NGRAM_SIZES = (3, 4)
+# Marks word-bigram features so they never collide with character n-grams
+BIGRAM_PREFIX = '\x00'
+
+# Negations flip the question, so both sides must have the same ones
+NEGATIONS = frozenset((
+    'not', 'no', 'never', 'without', 'avoid', "don't", 'dont', "doesn't", "shouldn't", "can't", 'cannot',
+    "won't", "isn't", "aren't", "didn't", "wouldn't"
+))
+# Words a paraphrase may add, drop or swap without changing what is asked.
+# Directional words (to, from, into, out, after, before) are not among them:
+# "out of data science" and "into data science" are different questions
+FUNCTION_WORDS = frozenset((
+    'a', 'an', 'the', 'i', 'me', 'my', 'mine', 'you', 'your', 'we', 'our', 'it', 'its', 'this', 'that', 'these',
+    'those', 'of', 'in', 'on', 'for', 'with', 'using', 'at', 'by', 'about', 'as', 'and',
+    'or', 'is', 'are', 'am', 'be', 'being', 'been', 'do', 'does', 'did', 'can', 'could', 'should', 'would',
+    'will', 'shall', 'may', 'might', 'must', 'how', 'what', 'which', 'when', 'where', 'why', 'who', 'some',
+    'any', 'there', 'so', 'if', 'get', 'go', 'best', 'way', 'ways', 'tips', 'please', 'really'
+))
+
+
+def normalize_question(question: str) -> str:
+    """
+    Lowercase words only: case, punctuation and spacing do not change the key.
+    """
+    return ' '.join(WORD_PATTERN.findall(question.lower()))
+
+
+def question_grams(normalized: str) -> Counter:
+    """
+    Character 3- and 4-grams across the whole question, spaces included, so
+    neighbouring words are tied together, plus one feature per word bigram.
+    "interview" and "interviews" still share most of their grams.
+    """
+    grams = Counter()
+    padded = f" {normalized} "
+    for size in NGRAM_SIZES:
+        grams.update(padded[i:i + size] for i in range(max(len(padded) - size + 1, 1)))
+    words = normalized.split()
+    grams.update(f"{BIGRAM_PREFIX}{first} {second}" for first, second in zip(words, words[1:]))
+    return grams
+
+
+def content_words(words: Tuple[str, ...]) -> frozenset:
+    """
+    Words that carry the question, with a plural s dropped. The "to" of
+    "how to" is not one: "how to" and "how do I" ask the same thing.
+    """
+    return frozenset(
+        word[:-1] if len(word) > 3 and word.endswith('s') and not word.endswith('ss') else word
+        for previous, word in zip(('',) + words, words)
+        if word not in FUNCTION_WORDS and word not in NEGATIONS and not (word == 'to' and previous == 'how')
+    )
+
+
+def same_question(words: Tuple[str, ...], other: Tuple[str, ...]) -> bool:
+    """
+    Whether two similar-looking questions may share an answer. They may not
+    when one is the other's words reordered ("from support into engineering"
+    vs "from engineering into support"), when their negations differ ("what
+    should I put" vs "what should I not put"), or when either has a content
+    word the other lacks ("higher salary" vs "lower salary", "out of data
+    science" vs "into data science", "coding interviews" vs "interviews").
+    """
+    if words != other and sorted(words) == sorted(other):
+        return False
+    if NEGATIONS.intersection(words) != NEGATIONS.intersection(other):
+        return False
+    mine, theirs = content_words(words), content_words(other)
+    return mine == theirs
+
+
+class AnswerCache:
+    """
+    Model answers keyed by normalized question text and prompt version, with
+    a similarity lookup so paraphrased questions hit too.
+
+    Questions are compared as TF-IDF vectors over character n-grams and word
+    bigrams (cosine similarity); a cached answer is reused when the best match
+    reaches the threshold and same_question accepts the pair. Entries expire
+    after ttl seconds and the least recently used go first past max_entries.
+
+    The similarity index is rebuilt from a snapshot, outside the lock, after
+    a store (or by a lookup that finds it out of date), at most once per
+    rebuild_interval seconds. Until the new index is swapped in, lookups score against the
+    previous one, so a question stored since is only found by exact match.
+    """
+
+    def __init__(self, max_entries: int = 2000, ttl: float = 7 * 24 * 3600, threshold: float = 0.8,
+                 rebuild_interval: float = 1.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.threshold = threshold
+        self.rebuild_interval = rebuild_interval
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every store and clear; the index records the one it was built at
+        self._generation = 0
+        self._index: Optional[Tuple[int, List[str], Dict[str, int], np.ndarray, Any]] = None
+        self._rebuilding = False
+        self._rebuilt_at = 0.0
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rebuilds = 0
+
+    @staticmethod
+    def key(normalized: str, version: str) -> str:
+        return f"{version}:{normalized}"
+
+    def _expired(self, entry: Dict[str, Any], now: float) -> bool:
+        return now - entry['created_at'] >= self.ttl
+
+    def _snapshot(self, now: float) -> Tuple[int, List[str], List[Counter]]:
+        """
+        Drop expired entries and copy what an index build needs. Call with the lock held.
+        """
+        for key in [key for key, entry in self._entries.items() if self._expired(entry, now)]:
+            del self._entries[key]
+        keys = list(self._entries)
+        return self._generation, keys, [self._entries[key]['grams'] for key in keys]
+
+    @staticmethod
+    def _build_index(generation: int, keys: List[str], grams_per_entry: List[Counter]):
+        """
+        The n-gram TF-IDF matrix (rows L2-normalized) over a snapshot of entries.
+        """
+        vocabulary: Dict[str, int] = {}
+        indptr, indices, counts = [0], [], []
+        for grams in grams_per_entry:
+            for gram, count in grams.items():
+                indices.append(vocabulary.setdefault(gram, len(vocabulary)))
+                counts.append(count)
+            indptr.append(len(indices))
+
+        df = np.bincount(indices, minlength=len(vocabulary)) if indices else np.zeros(0)
+        idf = np.log((1.0 + len(keys)) / (1.0 + df)) + 1.0
+        matrix = sparse.csr_matrix(
+            (1.0 + np.log(np.asarray(counts, dtype=np.float64)), indices, indptr),
+            shape=(len(keys), len(vocabulary))
+        ).multiply(idf).tocsr()
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        matrix = sparse.diags(1.0 / np.where(norms > 0, norms, 1.0)).dot(matrix).tocsr()
+        return generation, keys, vocabulary, idf, matrix
+
+    def _current_index(self, now: float):
+        """
+        The index to score against, rebuilding it first when it is out of date
+        and no other thread is already doing so. The lock is only held to
+        take the snapshot and to swap the result in.
+        """
+        with self._lock:
+            index = self._index
+            stale = index is None or index[0] != self._generation
+            recent = index is not None and now - self._rebuilt_at < self.rebuild_interval
+            if not stale or recent or self._rebuilding:
+                return index
+            self._rebuilding = True
+            self._rebuilt_at = now
+            snapshot = self._snapshot(now)
+
+        index = None
+        try:
+            index = self._build_index(*snapshot)
+        finally:
+            with self._lock:
+                self._rebuilding = False
+                if index is not None:
+                    self.rebuilds += 1
+                    if self._index is None or self._index[0] < index[0]:
+                        self._index = index
+        return index
+
+    def _candidates(self, index, normalized: str) -> List[Tuple[str, float]]:
+        """
+        Keys of the up to five entries most similar to the question that reach
+        the threshold, best first, with their cosine similarity.
+        """
+        _, keys, vocabulary, idf, matrix = index
+        if not keys:
+            return []
+
+        # Grams no cached question has get the highest idf: they make the
+        # question less like every entry
+        unseen_idf = math.log(1.0 + len(keys)) + 1.0
+        columns, weights, norm = [], [], 0.0
+        for gram, count in question_grams(normalized).items():
+            weight = 1.0 + math.log(count)
+            column = vocabulary.get(gram)
+            if column is None:
+                norm += (weight * unseen_idf) ** 2
+                continue
+            columns.append(column)
+            weights.append(weight * idf[column])
+            norm += weights[-1] ** 2
+        if not columns or norm == 0:
+            return []
+
+        query = np.zeros(len(vocabulary))
+        query[columns] = weights
+        scores = matrix.dot(query) / math.sqrt(norm)
+        return [(keys[row], float(scores[row])) for row in np.argsort(-scores)[:5] if scores[row] >= self.threshold]
+
+    def _hit(self, key: str, entry: Dict[str, Any], match: str, similarity: float, now: float) -> Dict[str, Any]:
+        self._entries.move_to_end(key)
+        entry['hits'] += 1
+        entry['last_hit'] = now
+        if match == 'exact':
+            self.exact_hits += 1
+        else:
+            self.similar_hits += 1
+        return {'answer': entry['answer'], 'match': match, 'similarity': round(similarity, 4)}
+
+    def lookup(self, question: str, version: str) -> Optional[Dict[str, Any]]:
+        """
+        Find a cached answer for question under this prompt version.
+
+        Returns:
+            {'answer': str, 'match': 'exact' | 'similar', 'similarity': float} or None
+        """
+        normalized = normalize_question(question)
+        if not normalized:
+            return None
+        now = time.time()
+        with self._lock:
+            key = self.key(normalized, version)
+            entry = self._entries.get(key)
+            if entry is not None and not self._expired(entry, now):
+                return self._hit(key, entry, 'exact', 1.0, now)
+
+        index = self._current_index(now)
+        candidates = self._candidates(index, normalized) if index is not None else []
+        words = tuple(normalized.split())
+        with self._lock:
+            for key, similarity in candidates:
+                # The index may predate an eviction or expiry
+                entry = self._entries.get(key)
+                if (entry is not None and entry['version'] == version and not self._expired(entry, now)
+                        and same_question(words, entry['words'])):
+                    return self._hit(key, entry, 'similar', similarity, now)
+            self.misses += 1
+            return None
+
+    def store(self, question: str, version: str, answer: str) -> None:
+        normalized = normalize_question(question)
+        if not normalized:
+            return
+        grams = question_grams(normalized)
+        with self._lock:
+            key = self.key(normalized, version)
+            self._entries[key] = {
+                'normalized': normalized,
+                'grams': grams,
+                'words': tuple(normalized.split()),
+                'version': version,
+                'answer': answer,
+                'created_at': time.time(),
+                'hits': 0,
+                'last_hit': None
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            self._generation += 1
+        # Stores follow a model call that took seconds, so they absorb the
+        # rebuild rather than the next lookup
+        self._current_index(time.time())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self._index = None
+
+    def stats(self, top: int = 10) -> Dict[str, Any]:
+        """
+        Counters and the most reused entries. Questions come from users, so
+        entries are identified by a hash of their key, never by their text.
+        """
+        now = time.time()
+        with self._lock:
+            entries = list(self._entries.items())
+        lookups = self.exact_hits + self.similar_hits + self.misses
+        popular = sorted(entries, key=lambda item: -item[1]['hits'])[:top]
+        return {
+            'entries': len(entries),
+            'max_entries': self.max_entries,
+            'ttl': self.ttl,
+            'threshold': self.threshold,
+            'exact_hits': self.exact_hits,
+            'similar_hits': self.similar_hits,
+            'misses': self.misses,
+            'hit_ratio': round((self.exact_hits + self.similar_hits) / lookups, 4) if lookups else 0.0,
+            'evictions': self.evictions,
+            'index_rebuilds': self.rebuilds,
+            'rebuild_interval': self.rebuild_interval,
+            'top_questions': [
+                {
+                    'key': hashlib.sha256(key.encode('utf-8')).hexdigest()[:16],
+                    'hits': entry['hits'],
+                    'age_seconds': int(now - entry['created_at']),
+                    'last_hit_seconds_ago': int(now - entry['last_hit']) if entry['last_hit'] else None
+                }
+                for key, entry in popular if entry['hits']
+            ]
+        }
@@ -0,0 +1,159 @@
+# services/batch_analyzer.py
+
+import io
+import logging
+import os
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Dict, Any, Iterator, List, Tuple
+
+from services.resume_analyzer import analyze_resume, calculate_ats_score, analysis_cache_key
+from utils.process_pool import get_worker_count, submit
+from utils.text_extraction import extract_document_from_bytes
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.doc', '.docx')
+MAX_BATCH_FILES = int(os.environ.get("BATCH_MAX_FILES", 500))
+MAX_FILE_BYTES = int(os.environ.get("BATCH_MAX_FILE_BYTES", 10 * 1024 * 1024))
+
+def analyze_resume_file(filename: str, data: bytes) -> Dict[str, Any]:
+    """
+    Extract, analyze and score one resume. Runs inside a pool process.
+    """
+    extracted = extract_document_from_bytes(filename, data)
+    if not extracted.text:
+        return {'filename': filename, 'error': 'Could not extract text from the file'}
+
+    analysis_results = analyze_resume(extracted.text)
+    analysis_results['ats_score'] = calculate_ats_score(analysis_results)
+    if extracted.truncated:
+        analysis_results['truncated'] = extracted.reason
+    return {'filename': filename, 'text': extracted.text, 'analysis': analysis_results}
+
+
+def expand_uploads(uploads: List[Tuple[str, bytes]]) -> Tuple[List[Tuple[str, bytes]], List[Dict[str, Any]]]:
+    """
+    Flatten uploaded files and zip archives into (filename, bytes) pairs.
+
+    Returns:
+        (files to analyze, per-file errors for entries that were rejected)
+    """
+    files = []
+    rejected = []
+
+    def accept(filename: str, size: int) -> bool:
+        if not filename.lower().endswith(SUPPORTED_EXTENSIONS):
+            rejected.append({'filename': filename, 'error': 'Unsupported file format'})
+        elif size > MAX_FILE_BYTES:
+            rejected.append({'filename': filename, 'error': 'File is too large'})
+        elif len(files) >= MAX_BATCH_FILES:
+            rejected.append({'filename': filename, 'error': f'Batch limit of {MAX_BATCH_FILES} files reached'})
+        else:
+            return True
+        return False
+
+    for filename, data in uploads:
+        if not filename.lower().endswith('.zip'):
+            if accept(filename, len(data)):
+                files.append((filename, data))
+            continue
+
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                for info in archive.infolist():
+                    if info.is_dir() or os.path.basename(info.filename).startswith('.'):
+                        continue
+                    # Check the declared size before inflating anything
+                    if accept(info.filename, info.file_size):
+                        files.append((info.filename, archive.read(info)))
+        except zipfile.BadZipFile:
+            rejected.append({'filename': filename, 'error': 'Invalid zip archive'})
+
+    return files, rejected
+
+
+def iter_batch_results(files: List[Tuple[str, bytes]], cache=None, ordered: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Analyze files across the process pool and yield one result per file as it
+    finishes. Every result carries the file's position in the batch as 'index';
+    with ordered=True results are yielded in that order instead.
+
+    Args:
+        files: (filename, bytes) pairs
+        cache: Optional TieredCache; hits are yielded without touching the pool
+        ordered: Yield results in submission order
+    """
+    ready: Dict[int, Dict[str, Any]] = {}
+    # (index, cache key) of files waiting for a pool slot
+    queued: List[Tuple[int, str]] = []
+
+    for index, (filename, data) in enumerate(files):
+        key = analysis_cache_key(filename, data)
+        cached = cache.get(key) if cache is not None else None
+        if cached:
+            ready[index] = {'filename': filename, 'text': cached['text'], 'analysis': cached['analysis'], 'cached': True}
+        else:
+            queued.append((index, key))
+
+    def finish(index: int, result: Dict[str, Any]) -> Dict[str, Any]:
+        # The extracted text is only needed for the cache, not in the stream
+        result.pop('text', None)
+        result['index'] = index
+        return result
+
+    def collect() -> Iterator[Tuple[int, Dict[str, Any]]]:
+        # Only about one file per pool process is submitted at a time, so a
+        # big batch neither floods the pool's queue nor holds every file's
+        # pickled bytes there at once
+        max_in_flight = get_worker_count()
+        waiting = iter(queued)
+        futures = {}
+
+        def fill():
+            while len(futures) < max_in_flight:
+                index, key = next(waiting, (None, None))
+                if index is None:
+                    return
+                futures[submit(analyze_resume_file, *files[index])] = (index, key)
+
+        try:
+            for index, result in list(ready.items()):
+                yield index, result
+            fill()
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                finished = []
+                for future in done:
+                    index, key = futures.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.exception(f"Error analyzing {files[index][0]} in batch")
+                        result = {'filename': files[index][0], 'error': str(e)}
+                    # A time-budget cut depends on load at the moment, so it is not cached
+                    if (cache is not None and 'analysis' in result
+                            and result['analysis'].get('truncated') != 'time_budget'):
+                        cache.set(key, {'text': result['text'], 'analysis': result['analysis']})
+                    finished.append((index, result))
+                # Keep the pool busy while the results are written out
+                fill()
+                yield from finished
+        finally:
+            # The client went away: drop work that has not started yet
+            for future in futures:
+                future.cancel()
+
+    if not ordered:
+        for index, result in collect():
+            yield finish(index, result)
+        return
+
+    # Hold back results that finish early until everything before them is out
+    pending: Dict[int, Dict[str, Any]] = {}
+    next_index = 0
+    for index, result in collect():
+        pending[index] = result
+        while next_index in pending:
+            yield finish(next_index, pending.pop(next_index))
+            next_index += 1
@@ -1,62 +1,279 @@
 from flask import request, jsonify
 import os
+import json
+import time
+import threading
 import requests
 import logging
-from typing import List
+from typing import Iterator, List, Optional
 import config
+from services.advice_cache import AnswerCache
+from utils import http_client
+from utils.batcher import MicroBatcher
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# wait_for_model can hold the request while a cold model loads
+HUGGINGFACE_READ_TIMEOUT = float(os.environ.get("HUGGINGFACE_READ_TIMEOUT", 60))
+
+# Stronger, guided prompt. Bump PROMPT_VERSION when changing it, so answers
+# cached for the old prompt are not served
+PROMPT_TEMPLATE = (
+    "You are a professional career coach with 10+ years of experience helping candidates prepare for job interviews. "
+    "Answer the following career-related question with clear guidance, a sample answer (if relevant), actionable advice, and common mistakes to avoid. "
+    "Write in a helpful, friendly tone.\n\n"
+    "Question: {message}"
+)
+PROMPT_VERSION = '1'
+
+# Answers are reused for the same question, or one at least
+# ADVICE_CACHE_THRESHOLD similar (cosine over character n-grams and word
+# bigrams) that is not a reordering, negation or word swap of it, for
+# ADVICE_CACHE_TTL seconds. Set ADVICE_CACHE_SIZE=0 to always ask the model.
+# The similarity index is rebuilt at most every ADVICE_CACHE_REBUILD_INTERVAL
+# seconds; questions stored since only hit when asked exactly.
+advice_cache = AnswerCache(
+    max_entries=int(os.environ.get("ADVICE_CACHE_SIZE", 2000)),
+    ttl=float(os.environ.get("ADVICE_CACHE_TTL", 7 * 24 * 3600)),
+    threshold=float(os.environ.get("ADVICE_CACHE_THRESHOLD", 0.7)),
+    rebuild_interval=float(os.environ.get("ADVICE_CACHE_REBUILD_INTERVAL", 1.0))
+)
+
 def get_career_advice(message: str) -> str:
     """
-    Get career advice using Hugging Face Inference API with improved prompt.
+    Get career advice using Hugging Face Inference API with improved prompt,
+    reusing the answer to an earlier matching question when there is one.
     """
     logger.info(f"Fetching career advice for message: {message}")
 
-    api_key = os.getenv('HUGGINGFACE_API_KEY', getattr(config, 'HUGGINGFACE_API_KEY', None))
-    api_url = getattr(config, 'HUGGINGFACE_API_URL', None)
+    use_cache = advice_cache.max_entries > 0
+    if use_cache:
+        cached = advice_cache.lookup(message, PROMPT_VERSION)
+        if cached is not None:
+            logger.info(f"Career advice served from cache ({cached['match']}, similarity {cached['similarity']})")
+            return cached['answer']
 
-    if not api_key or not api_url:
+    if not get_api_credentials():
         logger.error("Missing Hugging Face API key or URL.")
         return "⚠️ Career assistant is currently unavailable. Please try again later."
 
-    # Stronger, guided prompt
-    prompt = (
-        "You are a professional career coach with 10+ years of experience helping candidates prepare for job interviews. "
-        "Answer the following career-related question with clear guidance, a sample answer (if relevant), actionable advice, and common mistakes to avoid. "
-        "Write in a helpful, friendly tone.\n\n"
-        f"Question: {message}"
-    )
+    prompt = PROMPT_TEMPLATE.format(message=message)
+
+    try:
+        generated_text = advice_batcher.submit(prompt)
+    except requests.exceptions.RequestException as e:
+        logger.exception("Request to Hugging Face API failed.")
+        return "🚫 Network error occurred. Please try again later."
+    except ValueError:
+        logger.error("Unexpected response format from Hugging Face API.")
+        return "❌ Sorry, I couldn't generate a response. Please rephrase your question."
+
+    answer = clean_response(generated_text, prompt)
+    if use_cache and generated_text.replace(prompt, "").strip():
+        advice_cache.store(message, PROMPT_VERSION, answer)
+    return answer
+
+def get_api_credentials():
+    """
+    (api_key, api_url) for the Hugging Face endpoint, or None when either is missing.
+    """
+    api_key = os.getenv('HUGGINGFACE_API_KEY', getattr(config, 'HUGGINGFACE_API_KEY', None))
+    api_url = os.getenv('HUGGINGFACE_API_URL', getattr(config, 'HUGGINGFACE_API_URL', None))
+    return (api_key, api_url) if api_key and api_url else None
+
+def generate_texts(prompts: List[str]) -> List[str]:
+    """
+    Generate answers to several prompts in one inference call.
+
+    Returns:
+        generated_text per prompt, in order
 
+    Raises:
+        requests.exceptions.RequestException: When the call fails
+        ValueError: When the response is not one generation per prompt
+    """
+    api_key, api_url = get_api_credentials()
     payload = {
-        "inputs": prompt,
+        "inputs": prompts if len(prompts) > 1 else prompts[0],
         "options": {"wait_for_model": True}
     }
-
     headers = {
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json"
     }
 
+    response = http_client.post(api_url, headers=headers, json=payload, timeout=HUGGINGFACE_READ_TIMEOUT)
+    response.raise_for_status()
+    result = response.json()
+
+    logger.info(f"Response from Hugging Face API: {result}")
+
+    # A single input may come back with extra candidates; a batch must line up
+    if not isinstance(result, list) or not result or (len(prompts) > 1 and len(result) != len(prompts)):
+        raise ValueError(f"Expected {len(prompts)} generations, got {type(result).__name__}")
+    texts = []
+    for generation in result[:len(prompts)]:
+        # Batched text-generation answers are one list of candidates per input
+        if isinstance(generation, list) and generation:
+            generation = generation[0]
+        if not isinstance(generation, dict) or 'generated_text' not in generation:
+            raise ValueError("Generation without generated_text")
+        texts.append(generation['generated_text'])
+    return texts
+
+# Concurrent questions are sent to the model together: prompts arriving
+# within HUGGINGFACE_BATCH_WINDOW_MS of the first, up to HUGGINGFACE_BATCH_SIZE,
+# share one request. A failed batch is retried one prompt at a time. Set
+# HUGGINGFACE_BATCH_SIZE=1 to send every prompt alone.
+advice_batcher = MicroBatcher(
+    'huggingface',
+    send_batch=generate_texts,
+    send_one=lambda prompt: generate_texts([prompt])[0],
+    max_batch=int(os.environ.get("HUGGINGFACE_BATCH_SIZE", 8)),
+    max_wait=float(os.environ.get("HUGGINGFACE_BATCH_WINDOW_MS", 5)) / 1000
+)
+
+# Tokens are coalesced into chunks of at least STREAM_FLUSH_CHARS, or
+# whatever arrived within STREAM_FLUSH_INTERVAL seconds, so a fast model does
+# not cost one event per token. The first token always goes out at once.
+STREAM_FLUSH_CHARS = int(os.environ.get("ADVICE_STREAM_FLUSH_CHARS", 32))
+STREAM_FLUSH_INTERVAL = float(os.environ.get("ADVICE_STREAM_FLUSH_INTERVAL", 0.1))
+
+def stream_career_advice(message: str, cancelled: Optional[threading.Event] = None,
+                         done: Optional[dict] = None) -> Iterator[str]:
+    """
+    Career advice as it is generated, in text chunks.
+
+    Asks the Hugging Face endpoint to stream (text-generation-inference
+    server-sent events) and yields tokens as they arrive; an endpoint that
+    answers with plain JSON is yielded as one chunk. Cached answers are
+    yielded as one chunk without calling the model.
+
+    The upstream response is read only as fast as chunks are consumed, so a
+    slow client slows generation down instead of buffering it. Closing the
+    generator, or setting cancelled, closes the upstream connection, which
+    stops generation; a cancelled answer is not cached.
+
+    Args:
+        message: The user's question
+        cancelled: Checked between chunks; set it to stop
+        done: Filled in at the end with 'response' (the full cleaned answer),
+            'cached' and 'completed'
+
+    Yields:
+        Text chunks; their concatenation is done['response'] unless the
+        final answer falls back to an error message
+    """
+    done = done if done is not None else {}
+    done.update({'response': '', 'cached': False, 'completed': False})
+
+    use_cache = advice_cache.max_entries > 0
+    if use_cache:
+        cached = advice_cache.lookup(message, PROMPT_VERSION)
+        if cached is not None:
+            logger.info(f"Career advice streamed from cache ({cached['match']}, similarity {cached['similarity']})")
+            done.update({'response': cached['answer'], 'cached': True, 'completed': True})
+            yield cached['answer']
+            return
+
+    credentials = get_api_credentials()
+    if not credentials:
+        logger.error("Missing Hugging Face API key or URL.")
+        done['response'] = "⚠️ Career assistant is currently unavailable. Please try again later."
+        yield done['response']
+        return
+
+    api_key, api_url = credentials
+    prompt = PROMPT_TEMPLATE.format(message=message)
+    payload = {
+        "inputs": prompt,
+        "parameters": {"return_full_text": False},
+        "stream": True,
+        "options": {"wait_for_model": True}
+    }
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+        "Accept": "text/event-stream"
+    }
+
+    try:
+        response = http_client.post(api_url, headers=headers, json=payload,
+                                    timeout=HUGGINGFACE_READ_TIMEOUT, stream=True)
+    except requests.exceptions.RequestException:
+        logger.exception("Streaming request to Hugging Face API failed.")
+        done['response'] = "🚫 Network error occurred. Please try again later."
+        yield done['response']
+        return
+
+    parts = []
     try:
-        response = requests.post(api_url, headers=headers, json=payload)
         response.raise_for_status()
-        result = response.json()
+        if not response.headers.get('Content-Type', '').startswith('text/event-stream'):
+            result = response.json()
+            if isinstance(result, list) and len(result) > 0 and 'generated_text' in result[0]:
+                parts.append(result[0]['generated_text'].replace(prompt, ""))
+                tokens = iter(parts[:])
+            else:
+                logger.error("Unexpected response format from Hugging Face API.")
+                tokens = iter(())
+        else:
+            tokens = iter_stream_tokens(response, parts)
 
-        logger.info(f"Response from Hugging Face API: {result}")
+        pending, flushed_at, first = '', 0.0, True
+        for token in tokens:
+            if cancelled is not None and cancelled.is_set():
+                logger.info("Career advice stream cancelled")
+                return
+            if first:
+                token = token.lstrip()
+                if not token:
+                    continue
+                token = token[0].upper() + token[1:]
+                first = False
+            pending += token
+            now = time.monotonic()
+            if len(pending) >= STREAM_FLUSH_CHARS or now - flushed_at >= STREAM_FLUSH_INTERVAL:
+                yield pending
+                pending, flushed_at = '', now
+        if pending:
+            yield pending
 
-        if isinstance(result, list) and len(result) > 0 and 'generated_text' in result[0]:
-            generated_text = result[0]['generated_text']
-            return clean_response(generated_text, prompt)
-        else:
-            logger.error("Unexpected response format from Hugging Face API.")
-            return "❌ Sorry, I couldn't generate a response. Please rephrase your question."
+        generated_text = ''.join(parts)
+        answer = clean_response(generated_text, prompt)
+        done.update({'response': answer, 'completed': True})
+        if first:
+            # Nothing was generated: send the same fallback get_career_advice returns
+            yield answer
+        elif use_cache:
+            advice_cache.store(message, PROMPT_VERSION, answer)
+    except (requests.exceptions.RequestException, ValueError):
+        logger.exception("Streaming response from Hugging Face API failed.")
+        done['response'] = "🚫 Network error occurred. Please try again later."
+        yield done['response']
+    finally:
+        response.close()
 
-    except requests.exceptions.RequestException as e:
-        logger.exception("Request to Hugging Face API failed.")
-        return "🚫 Network error occurred. Please try again later."
+def iter_stream_tokens(response: requests.Response, parts: List[str]) -> Iterator[str]:
+    """
+    Token texts from a text-generation-inference event stream, appended to
+    parts as they are yielded. Special tokens (end of sequence) are skipped.
+    """
+    # chunk_size=None hands over each chunk as it arrives, where the default
+    # would wait for 512 bytes (several tokens) first
+    for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+        if not line or not line.startswith('data:'):
+            continue
+        event = json.loads(line[5:])
+        if 'error' in event:
+            raise ValueError(f"Hugging Face stream error: {event['error']}")
+        token = event.get('token') or {}
+        if token.get('special') or not token.get('text'):
+            continue
+        parts.append(token['text'])
+        yield token['text']
 
 def clean_response(response_text: str, prompt_text: str) -> str:
     """
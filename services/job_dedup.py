@@ -0,0 +1,289 @@
+# services/job_dedup.py
+
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 64
+BANDS = 8
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+MERSENNE_PRIME = (1 << 61) - 1
+WORD_PATTERN = re.compile(r'\w+')
+
+# Fixed seed: signatures are persisted and must stay comparable across restarts
+_rng = np.random.RandomState(1)
+PERM_A = _rng.randint(1, 1 << 31, NUM_PERM).astype(np.uint64)[:, None]
+PERM_B = _rng.randint(0, 1 << 31, NUM_PERM).astype(np.uint64)[:, None]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signatures (
+    job_id TEXT PRIMARY KEY,
+    cluster TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS signatures_updated_at ON signatures (updated_at);
+CREATE TABLE IF NOT EXISTS bands (
+    band INTEGER NOT NULL,
+    hash INTEGER NOT NULL,
+    job_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS bands_lookup ON bands (band, hash);
+CREATE INDEX IF NOT EXISTS bands_job ON bands (job_id);
+CREATE TABLE IF NOT EXISTS shown (
+    scope TEXT NOT NULL,
+    cluster TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (scope, cluster)
+);
+CREATE INDEX IF NOT EXISTS shown_updated_at ON shown (updated_at);
+"""
+
+
+def shingles(job: Dict[str, Any]) -> Set[str]:
+    """
+    Word 3-grams of the listing's title, company and description.
+    """
+    words = WORD_PATTERN.findall(
+        f"{job.get('title', '')} {job.get('company', '')} {job.get('description', '')}".lower()
+    )
+    if len(words) < SHINGLE_SIZE:
+        return set(words)
+    return {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash(job: Dict[str, Any]) -> Optional[np.ndarray]:
+    """
+    NUM_PERM-value MinHash signature of a listing, or None if it has no text.
+    All permutations are applied to all shingle hashes in one numpy pass.
+    """
+    grams = shingles(job)
+    if not grams:
+        return None
+    hashes = np.fromiter((zlib.crc32(gram.encode('utf-8')) for gram in grams), dtype=np.uint64, count=len(grams))
+    permuted = (PERM_A * hashes + PERM_B) % MERSENNE_PRIME
+    return (permuted & 0xFFFFFFFF).min(axis=1).astype(np.uint32)
+
+
+def band_hashes(signature: np.ndarray) -> List[int]:
+    """
+    One 64-bit hash per LSH band; listings sharing any band are candidates.
+    """
+    return [
+        int.from_bytes(hashlib.blake2b(signature[band * ROWS:(band + 1) * ROWS].tobytes(), digest_size=8).digest(),
+                       'big', signed=True)
+        for band in range(BANDS)
+    ]
+
+
+class JobDeduplicator:
+    """
+    Collapses near-duplicate listings (the same role reposted under another
+    job id or aggregator link) with MinHash signatures and LSH banding.
+
+    Each listing is compared only against the listings that share one of its
+    LSH bands, not against every listing seen so far, and joins the cluster
+    of the first listing it matches at or above the similarity threshold.
+    Signatures and clusters live in SQLite, so a repost is recognised on a
+    later page, in another search or after a restart. With 8 bands of 8 rows,
+    pairs at Jaccard 0.8 become candidates ~98% of the time and pairs at 0.5
+    ~3% of the time.
+    """
+
+    def __init__(self, path: str = ':memory:', threshold: float = 0.8, max_signatures: int = 100000,
+                 shown_ttl: float = 3600):
+        self.path = path
+        self.threshold = threshold
+        self.max_signatures = max_signatures
+        self.shown_ttl = shown_ttl
+        # One connection behind a lock: dedup work is short, and it lets the
+        # default in-memory store be shared by every thread
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        if path != ':memory:':
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        # Shown rows from before they recorded the listing are short-lived
+        # anyway, so an old table is dropped rather than migrated
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(shown)")]
+        if columns and 'job_id' not in columns:
+            self._conn.execute("DROP TABLE shown")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.checked = 0
+        self.duplicates = 0
+
+    def _find_cluster(self, signature: np.ndarray, bands: List[int], job_id: str,
+                      batch: List[Any]) -> Optional[str]:
+        """
+        Return the cluster of the first stored or earlier-in-batch listing
+        whose estimated Jaccard similarity reaches the threshold.
+        """
+        for other_bands, other_signature, cluster in batch:
+            if any(a == b for a, b in zip(bands, other_bands)) and \
+                    np.mean(signature == other_signature) >= self.threshold:
+                return cluster
+
+        placeholders = ' OR '.join('(band = ? AND hash = ?)' for _ in bands)
+        params = [param for pair in enumerate(bands) for param in pair]
+        rows = self._conn.execute(
+            f"SELECT DISTINCT s.job_id, s.cluster, s.signature FROM bands b "
+            f"JOIN signatures s ON s.job_id = b.job_id WHERE ({placeholders}) AND b.job_id != ?",
+            params + [job_id]
+        ).fetchall()
+        best = None
+        for _, cluster, blob in rows:
+            similarity = np.mean(signature == np.frombuffer(blob, dtype=np.uint32))
+            if similarity >= self.threshold and (best is None or similarity > best[0]):
+                best = (similarity, cluster)
+        return best[1] if best else None
+
+    def dedupe(self, jobs: List[Dict[str, Any]], scope: Optional[str] = None, page: int = 1) -> List[Dict[str, Any]]:
+        """
+        Drop near-duplicates from a page of processed listings.
+
+        A listing is dropped when an earlier listing on the page is in its
+        cluster, and, with a scope, as drop_shown would drop it.
+
+        Returns:
+            The listings to show, in their original order
+        """
+        if not jobs:
+            return jobs
+
+        now = time.time()
+        kept = []
+        batch = []
+        on_page = set()
+        with self._lock, self._conn:
+            for job in jobs:
+                job_id = job.get('id')
+                signature = minhash(job) if job_id else None
+                if signature is None:
+                    kept.append((job, None))
+                    continue
+
+                self.checked += 1
+                bands = band_hashes(signature)
+                existing = self._conn.execute("SELECT cluster FROM signatures WHERE job_id = ?", (job_id,)).fetchone()
+                cluster = existing[0] if existing else self._find_cluster(signature, bands, job_id, batch) or job_id
+                if not existing:
+                    self._conn.execute(
+                        "INSERT INTO signatures (job_id, cluster, signature, updated_at) VALUES (?, ?, ?, ?)",
+                        (job_id, cluster, signature.tobytes(), now)
+                    )
+                    self._conn.executemany(
+                        "INSERT INTO bands (band, hash, job_id) VALUES (?, ?, ?)",
+                        [(band, value, job_id) for band, value in enumerate(bands)]
+                    )
+                    self._writes += 1
+                batch.append((bands, signature, cluster))
+
+                if cluster in on_page:
+                    self.duplicates += 1
+                    continue
+                on_page.add(cluster)
+                kept.append((job, cluster))
+
+            if scope is not None:
+                kept = self._drop_shown(kept, scope, page, now)
+            if self._writes >= 1000:
+                self._trim()
+        return [job for job, _ in kept]
+
+    def drop_shown(self, jobs: List[Dict[str, Any]], scope: str, page: int) -> List[Dict[str, Any]]:
+        """
+        Drop listings whose cluster a different listing already represented
+        on another page of the same scope (one viewer's search, without its
+        page number) within the last shown_ttl seconds.
+
+        A listing that upstream moved to another page is kept: it is the same
+        job id, not a repost. Listings dedupe has not seen are kept too.
+
+        Returns:
+            The listings to show, in their original order
+        """
+        if not jobs:
+            return jobs
+
+        with self._lock, self._conn:
+            pairs = []
+            for job in jobs:
+                job_id = job.get('id')
+                row = self._conn.execute(
+                    "SELECT cluster FROM signatures WHERE job_id = ?", (job_id,)
+                ).fetchone() if job_id else None
+                pairs.append((job, row[0] if row else None))
+            kept = self._drop_shown(pairs, scope, page, time.time())
+            if self._writes >= 1000:
+                self._trim()
+        return [job for job, _ in kept]
+
+    def _drop_shown(self, pairs: List[Any], scope: str, page: int, now: float) -> List[Any]:
+        """
+        Filter (job, cluster) pairs against the scope's shown clusters and
+        record the ones kept. Called with the lock held, inside a transaction.
+        """
+        kept = []
+        for job, cluster in pairs:
+            if cluster is None:
+                kept.append((job, cluster))
+                continue
+            job_id = job['id']
+            shown = self._conn.execute(
+                "SELECT page, job_id FROM shown WHERE scope = ? AND cluster = ? AND updated_at >= ?",
+                (scope, cluster, now - self.shown_ttl)
+            ).fetchone()
+            if shown and shown[0] != page and shown[1] != job_id:
+                self.duplicates += 1
+                continue
+            self._conn.execute(
+                "INSERT OR REPLACE INTO shown (scope, cluster, job_id, page, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (scope, cluster, job_id, page, now)
+            )
+            self._writes += 1
+            kept.append((job, cluster))
+        return kept
+
+    def _trim(self) -> None:
+        """
+        Forget the oldest signatures beyond max_signatures, and shown clusters
+        that have expired or are beyond it.
+        """
+        self._writes = 0
+        self._conn.execute(
+            "DELETE FROM signatures WHERE job_id IN ("
+            "SELECT job_id FROM signatures ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_signatures,)
+        )
+        self._conn.execute("DELETE FROM bands WHERE job_id NOT IN (SELECT job_id FROM signatures)")
+        self._conn.execute("DELETE FROM shown WHERE updated_at < ?", (time.time() - self.shown_ttl,))
+        self._conn.execute(
+            "DELETE FROM shown WHERE rowid IN ("
+            "SELECT rowid FROM shown ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_signatures,)
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stored = self._conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+        return {
+            'checked': self.checked,
+            'duplicates': self.duplicates,
+            'signatures': stored,
+            'threshold': self.threshold,
+            'shown_ttl': self.shown_ttl,
+            'persistent': self.path != ':memory:'
+        }
@@ -0,0 +1,194 @@
+# services/job_index.py
+
+import logging
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Optional listing fields, stored as nullable columns and left out of results when NULL
+OPTIONAL_FIELDS = ('salary_min', 'salary_max', 'salary_period', 'employment_type')
+COLUMNS = ('id', 'title', 'company', 'company_logo', 'location', 'description', 'date', 'url') + OPTIONAL_FIELDS
+TERM_PATTERN = re.compile(r'\w+')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL DEFAULT '',
+    company TEXT NOT NULL DEFAULT '',
+    company_logo TEXT NOT NULL DEFAULT '',
+    location TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    date TEXT NOT NULL DEFAULT '',
+    url TEXT NOT NULL DEFAULT '',
+    salary_min REAL,
+    salary_max REAL,
+    salary_period TEXT,
+    employment_type TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_updated_at ON jobs (updated_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, company, location, description,
+    content='jobs', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts (rowid, title, company, location, description)
+    VALUES (new.rowid, new.title, new.company, new.location, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, title, company, location, description)
+    VALUES ('delete', old.rowid, old.title, old.company, old.location, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_au AFTER UPDATE ON jobs BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, title, company, location, description)
+    VALUES ('delete', old.rowid, old.title, old.company, old.location, old.description);
+    INSERT INTO jobs_fts (rowid, title, company, location, description)
+    VALUES (new.rowid, new.title, new.company, new.location, new.description);
+END;
+"""
+
+UPSERT = (
+    f"INSERT INTO jobs ({', '.join(COLUMNS)}, updated_at) VALUES ({', '.join('?' * (len(COLUMNS) + 1))}) "
+    f"ON CONFLICT(id) DO UPDATE SET "
+    + ', '.join(f"{column} = excluded.{column}" for column in COLUMNS[1:] + ('updated_at',))
+)
+
+# Keywords rank hits in the title well above the rest of the listing. Stored as
+# the table's default rank so ORDER BY rank is computed inside FTS5.
+RANK_CONFIG = "INSERT INTO jobs_fts (jobs_fts, rank) VALUES ('rank', 'bm25(10.0, 3.0, 1.0, 1.0)')"
+
+
+def match_query(keywords: str, location: str = '') -> str:
+    """
+    Build an FTS5 query: every keyword must appear in the title, company or
+    description, and every location word in the location.
+    """
+    terms = [f'{{title company description}} : "{term}"' for term in TERM_PATTERN.findall(keywords.lower())]
+    terms += [f'location : "{term}"' for term in TERM_PATTERN.findall((location or '').lower())]
+    return ' AND '.join(terms)
+
+
+class JobIndex:
+    """
+    Local full-text index of every listing fetched from JSearch, in a SQLite
+    file with an FTS5 table kept in sync by triggers. Listings are upserted
+    by job id, so the index holds the latest copy of each.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self.available = True
+        self.ingested = 0
+        self.searches = 0
+        try:
+            with self._connection() as conn:
+                conn.executescript(SCHEMA)
+                conn.execute(RANK_CONFIG)
+        except sqlite3.Error as e:
+            # Most often an SQLite build without FTS5
+            logger.warning(f"Job index at {path} unavailable: {str(e)}")
+            self.available = False
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def upsert(self, jobs: List[Dict[str, Any]]) -> int:
+        """
+        Insert or update processed listings (see process_job_listings).
+        Listings without an id are skipped.
+
+        Returns:
+            Number of listings written
+        """
+        if not self.available:
+            return 0
+        now = time.time()
+        rows = [
+            tuple(job.get(column) if column in OPTIONAL_FIELDS else job.get(column) or '' for column in COLUMNS) + (now,)
+            for job in jobs if job.get('id')
+        ]
+        if not rows:
+            return 0
+        try:
+            with self._connection() as conn:
+                conn.executemany(UPSERT, rows)
+        except sqlite3.Error as e:
+            logger.warning(f"Job index upsert failed: {str(e)}")
+            return 0
+        self.ingested += len(rows)
+        return len(rows)
+
+    def search(self, keywords: str, location: str = '', page: int = 1, page_size: int = 10,
+               max_age: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Answer a search from the index, best matches first.
+
+        Args:
+            keywords: Words that must all appear in the title, company or description
+            location: Words that must all appear in the location
+            page: 1-based page number
+            page_size: Listings per page
+            max_age: Only consider listings ingested within this many seconds
+
+        Returns:
+            {'jobs': [...], 'total_jobs': int, 'source': 'local'}, shaped like search_jobs results
+        """
+        if not self.available:
+            return {'jobs': [], 'total_jobs': 0, 'source': 'local'}
+        self.searches += 1
+        page, page_size = max(int(page), 1), max(int(page_size), 1)
+        query = match_query(keywords, location)
+        since = time.time() - max_age if max_age else 0.0
+
+        if query:
+            where = "jobs_fts MATCH ? AND jobs.updated_at >= ?"
+            params = [query, since]
+            source = "jobs_fts JOIN jobs ON jobs.rowid = jobs_fts.rowid"
+            order = "jobs_fts.rank"
+        else:
+            where = "jobs.updated_at >= ?"
+            params = [since]
+            source = "jobs"
+            order = "jobs.updated_at DESC"
+
+        conn = self._connection()
+        try:
+            if query and not since:
+                # No age filter: count inside FTS5 without touching the jobs table
+                total = conn.execute("SELECT COUNT(*) FROM jobs_fts WHERE jobs_fts MATCH ?", (query,)).fetchone()[0]
+            else:
+                total = conn.execute(f"SELECT COUNT(*) FROM {source} WHERE {where}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT {', '.join('jobs.' + column for column in COLUMNS)} FROM {source} "
+                f"WHERE {where} ORDER BY {order} LIMIT ? OFFSET ?",
+                params + [page_size, (page - 1) * page_size]
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Job index search failed: {str(e)}")
+            return {'jobs': [], 'total_jobs': 0, 'source': 'local'}
+
+        jobs = []
+        for row in rows:
+            job = {column: row[column] for column in COLUMNS if column not in OPTIONAL_FIELDS}
+            job.update({column: row[column] for column in OPTIONAL_FIELDS if row[column] is not None})
+            jobs.append(job)
+        return {'jobs': jobs, 'total_jobs': total, 'source': 'local'}
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {'available': self.available, 'ingested': self.ingested, 'searches': self.searches}
+        if self.available:
+            stats['listings'] = self._connection().execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        return stats
@@ -0,0 +1,124 @@
+# services/job_matcher.py
+
+import logging
+from typing import Dict, Any, List
+
+import numpy as np
+from scipy import sparse
+
+from services.resume_analyzer import SKILL_MATCHER
+from services.skill_matcher import SkillMatcher
+from utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+MAX_MISSING_SKILLS = 10
+
+
+class JobMatcher:
+    """
+    Scores a page of job listings against a resume's skills.
+
+    Each job becomes a sparse TF-IDF vector over the skills found in its title
+    and description, the resume becomes a 0/1 vector over the same columns,
+    and the whole page is scored with one sparse matrix-vector product: the
+    score is the share of a job's skill weight the resume covers. Skill
+    counts per job are cached by job id, so listings that come back on later
+    pages or searches are not rescanned.
+    """
+
+    def __init__(self, matcher: SkillMatcher, cache_size: int = 4096):
+        self.matcher = matcher
+        self._job_skills = LRUCache(cache_size)
+
+    def job_skills(self, job: Dict[str, Any]) -> Dict[str, int]:
+        """
+        Return {skill: occurrences} for a processed job listing.
+        """
+        job_id = job.get('id')
+        if job_id:
+            cached = self._job_skills.get(job_id)
+            if cached is not None:
+                return cached
+
+        text = f"{job.get('title', '')}\n{job.get('description', '')}"
+        skills = {skill: entry['count'] for skill, entry in self.matcher.summarize(text).items()}
+        if job_id:
+            self._job_skills.set(job_id, skills)
+        return skills
+
+    def score(self, resume_skills: List[str], jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Compute a 0-100 match score and the skills each job asks for that the
+        resume lacks, most important first.
+
+        Returns:
+            One {'match_score': int, 'missing_skills': [...]} per job, in order
+        """
+        if not jobs:
+            return []
+
+        per_job = [self.job_skills(job) for job in jobs]
+        resume_set = {skill.lower() for skill in resume_skills}
+
+        # Columns are local to the page: every skill seen in any job
+        columns: Dict[str, int] = {}
+        indptr = [0]
+        indices: List[int] = []
+        counts: List[int] = []
+        for skills in per_job:
+            for skill, count in skills.items():
+                indices.append(columns.setdefault(skill, len(columns)))
+                counts.append(count)
+            indptr.append(len(indices))
+
+        if not columns:
+            return [{'match_score': 0, 'missing_skills': []} for _ in jobs]
+
+        n_jobs, n_skills = len(jobs), len(columns)
+        tf = sparse.csr_matrix(
+            (1.0 + np.log(np.asarray(counts, dtype=np.float64)), indices, indptr),
+            shape=(n_jobs, n_skills)
+        )
+
+        # Smoothed IDF over the page: skills every job asks for count for less
+        df = np.bincount(indices, minlength=n_skills)
+        idf = np.log((1.0 + n_jobs) / (1.0 + df)) + 1.0
+        weights = tf.multiply(idf).tocsr()
+        totals = np.asarray(weights.sum(axis=1)).ravel()
+
+        have = np.zeros(n_skills)
+        for skill, column in columns.items():
+            if skill.lower() in resume_set:
+                have[column] = 1.0
+
+        # Share of each job's skill weight that the resume covers, whole page at once
+        scores = weights.dot(have) / np.where(totals > 0, totals, 1.0)
+
+        names = list(columns)
+        results = []
+        for row in range(n_jobs):
+            start, end = weights.indptr[row], weights.indptr[row + 1]
+            row_columns = weights.indices[start:end]
+            row_weights = weights.data[start:end]
+            missing = [
+                names[column]
+                for column in row_columns[np.argsort(-row_weights, kind='stable')]
+                if not have[column]
+            ]
+            results.append({
+                'match_score': int(round(float(scores[row]) * 100)),
+                'missing_skills': missing[:MAX_MISSING_SKILLS]
+            })
+        return results
+
+    def annotate(self, resume_skills: List[str], jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Add 'match_score' and 'missing_skills' to each job in place.
+        """
+        for job, result in zip(jobs, self.score(resume_skills, jobs)):
+            job.update(result)
+        return jobs
+
+
+JOB_MATCHER = JobMatcher(SKILL_MATCHER)
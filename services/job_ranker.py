@@ -0,0 +1,206 @@
+# services/job_ranker.py
+
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from scipy import sparse
+
+from services.job_matcher import JOB_MATCHER, JobMatcher
+from utils.cache import SWRCache
+
+logger = logging.getLogger(__name__)
+
+# Each newer analysis scales the weights from older ones by this much, so the
+# profile leans on the latest resume without forgetting earlier skills
+PROFILE_DECAY = 0.5
+MIN_PROFILE_WEIGHT = 0.05
+
+# JSearch salary periods, to compare salaries as yearly amounts
+YEARLY_FACTORS = {'HOUR': 2080, 'DAY': 260, 'WEEK': 52, 'MONTH': 12, 'YEAR': 1}
+
+
+def update_profile(profile: Optional[Dict[str, Any]], skills: List[str]) -> Dict[str, Any]:
+    """
+    Fold one more (newer) analysis into a skill profile.
+
+    Returns:
+        {'skills': {skill: weight in (0, 1]}, 'latest': [...], 'analyses': int}
+    """
+    weights = {
+        skill: weight * PROFILE_DECAY
+        for skill, weight in (profile or {}).get('skills', {}).items()
+        if weight * PROFILE_DECAY >= MIN_PROFILE_WEIGHT
+    }
+    for skill in skills:
+        weights[skill.lower()] = 1.0
+    return {
+        'skills': weights,
+        'latest': list(skills),
+        'analyses': (profile or {}).get('analyses', 0) + 1
+    }
+
+
+def build_profile(analyses: List[List[str]]) -> Dict[str, Any]:
+    """
+    Build a profile from analyses' skill lists, oldest first.
+    """
+    profile = None
+    for skills in analyses:
+        profile = update_profile(profile, skills or [])
+    return profile or {'skills': {}, 'latest': [], 'analyses': 0}
+
+
+class ProfileStore:
+    """
+    Per-user skill profiles, built from the user's latest analyses on first
+    use and cached. A newly saved analysis is folded into the cached profile
+    (add_analysis) instead of rebuilding it from the database. Other workers
+    pick the change up when their copy passes the cache ttl.
+    """
+
+    def __init__(self, cache: SWRCache):
+        self.cache = cache
+        self.updates = 0
+
+    def get(self, user_id: Any, load_analyses: Callable[[], List[List[str]]]) -> Dict[str, Any]:
+        """
+        Return the user's profile, calling load_analyses (skill lists, oldest
+        first) only when it is not cached.
+        """
+        return self.cache.get_or_load(str(user_id), lambda: build_profile(load_analyses()))
+
+    def add_analysis(self, user_id: Any, skills: List[str]) -> None:
+        """
+        Fold a newly saved analysis into the cached profile. Without one
+        there is nothing to do: the next get builds it including this analysis.
+        """
+        profile = self.cache.get_stale(str(user_id))
+        if profile is not None:
+            self.cache.put(str(user_id), update_profile(profile, skills))
+            self.updates += 1
+
+
+class JobRanker:
+    """
+    Re-ranks a page of listings for a user: weighted overlap of the listing's
+    skills with the user's profile, how recently it was posted, and how its
+    salary compares with what the user expects (or, without an expectation,
+    with the rest of the page). Every listing is scored in one vectorized
+    pass; the skill part is a sparse matrix-vector product like JobMatcher's.
+    """
+
+    def __init__(self, matcher: JobMatcher, skill_weight: float = 0.6, recency_weight: float = 0.25,
+                 salary_weight: float = 0.15, recency_half_life_days: float = 14):
+        self.matcher = matcher
+        self.weights = np.array([skill_weight, recency_weight, salary_weight], dtype=np.float64)
+        self.recency_half_life_days = recency_half_life_days
+
+    def skill_overlap(self, profile_skills: Dict[str, float], jobs: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Share of each listing's (log-scaled) skill counts covered by the
+        profile, weighted by the profile's weight for each skill.
+        """
+        columns: Dict[str, int] = {}
+        indptr = [0]
+        indices: List[int] = []
+        counts: List[int] = []
+        for job in jobs:
+            for skill, count in self.matcher.job_skills(job).items():
+                indices.append(columns.setdefault(skill.lower(), len(columns)))
+                counts.append(count)
+            indptr.append(len(indices))
+        if not columns:
+            return np.zeros(len(jobs))
+
+        tf = sparse.csr_matrix(
+            (1.0 + np.log(np.asarray(counts, dtype=np.float64)), indices, indptr),
+            shape=(len(jobs), len(columns))
+        )
+        profile = np.zeros(len(columns))
+        for skill, column in columns.items():
+            profile[column] = profile_skills.get(skill, 0.0)
+        totals = np.asarray(tf.sum(axis=1)).ravel()
+        return tf.dot(profile) / np.where(totals > 0, totals, 1.0)
+
+    def recency(self, jobs: List[Dict[str, Any]], now: Optional[datetime] = None) -> np.ndarray:
+        """
+        1.0 for a listing posted now, halving every recency_half_life_days;
+        0.5 when the date is missing or unreadable.
+        """
+        now = now or datetime.now(timezone.utc)
+        ages = np.full(len(jobs), np.nan)
+        for row, job in enumerate(jobs):
+            try:
+                posted = datetime.fromisoformat(str(job.get('date') or '').replace('Z', '+00:00'))
+            except ValueError:
+                continue
+            if posted.tzinfo is None:
+                posted = posted.replace(tzinfo=timezone.utc)
+            ages[row] = max((now - posted).total_seconds() / 86400, 0.0)
+        return np.where(np.isnan(ages), 0.5, np.exp2(-np.nan_to_num(ages) / self.recency_half_life_days))
+
+    def salary_fit(self, jobs: List[Dict[str, Any]], expected_salary: Optional[float] = None) -> np.ndarray:
+        """
+        How far each listing's top yearly salary reaches toward expected_salary
+        (capped at 1), or its position between the page's lowest and highest
+        salary without one. 0.5 when the listing gives no salary.
+        """
+        top = np.full(len(jobs), np.nan)
+        for row, job in enumerate(jobs):
+            amount = job.get('salary_max') or job.get('salary_min')
+            if not amount:
+                continue
+            factor = YEARLY_FACTORS.get(str(job.get('salary_period') or 'YEAR').upper(), 1)
+            try:
+                top[row] = float(amount) * factor
+            except (TypeError, ValueError):
+                continue
+
+        listed = ~np.isnan(top)
+        fit = np.full(len(jobs), 0.5)
+        if not listed.any():
+            return fit
+        if expected_salary:
+            fit[listed] = np.minimum(top[listed] / float(expected_salary), 1.0)
+        else:
+            low, high = top[listed].min(), top[listed].max()
+            fit[listed] = (top[listed] - low) / (high - low) if high > low else 1.0
+        return fit
+
+    def rank(self, profile_skills: Dict[str, float], jobs: List[Dict[str, Any]],
+             expected_salary: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Sort jobs in place, best first, and set each one's 'rank_score' (0-100).
+        Ties keep their upstream order.
+        """
+        if not jobs:
+            return jobs
+        features = np.column_stack([
+            self.skill_overlap(profile_skills, jobs),
+            self.recency(jobs),
+            self.salary_fit(jobs, expected_salary)
+        ])
+        scores = features.dot(self.weights) / self.weights.sum()
+        order = np.argsort(-scores, kind='stable')
+        ranked = [jobs[row] for row in order]
+        for row, job in zip(order, ranked):
+            job['rank_score'] = int(round(float(scores[row]) * 100))
+        jobs[:] = ranked
+        return jobs
+
+
+# JOB_RANK_WEIGHTS: relative weight of skill overlap, recency and salary fit
+_weights = [float(weight) for weight in os.environ.get("JOB_RANK_WEIGHTS", "0.6,0.25,0.15").split(',')]
+JOB_RANKER = JobRanker(JOB_MATCHER, *_weights[:3])
+
+# Profiles are kept JOB_PROFILE_TTL seconds per worker (JOB_PROFILE_CACHE_DB
+# shares them between workers) and updated in place when an analysis is saved
+user_profiles = ProfileStore(SWRCache(
+    'user_profile',
+    ttl=float(os.environ.get("JOB_PROFILE_TTL", 600)),
+    max_entries=int(os.environ.get("JOB_PROFILE_CACHE_SIZE", 1024)),
+    db_path=os.environ.get("JOB_PROFILE_CACHE_DB")
+))
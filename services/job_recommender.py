@@ -1,9 +1,19 @@
 from flask import Blueprint, request, jsonify
 import os
+import re
 import requests
 import logging
-from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Any, Optional, Union
 import config
+from services.job_dedup import JobDeduplicator
+from services.job_index import JobIndex
+from services.job_matcher import JOB_MATCHER
+from utils import http_client
+from utils.cache import SWRCache
+from utils.prefetch import Prefetcher
+from utils.quota import QuotaScheduler, QuotaExceeded, INTERACTIVE, BATCH, PREFETCH
+from utils.singleflight import SingleFlight, TooManyWaiters
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -17,25 +27,405 @@ def recommend_jobs():
     data = request.get_json()
     keywords = data.get('keywords', '')
     location = data.get('location', '')
+    skills = data.get('skills')
     
     logger.info(f"Received job recommendation request: keywords={keywords}, location={location}")
     
-    results = search_jobs(keywords, location)
-    return jsonify(results)
+    results = search_jobs(keywords, location, resume_skills=skills)
+    return jsonify(project_results(results, data.get('fields'), data.get('description_chars')))
 
 # -------------------- API FUNCTIONS --------------------
 
 def get_api_key() -> str:
     return os.environ.get('JSEARCH_API_KEY', config.JSEARCH_API_KEY)
 
-def search_jobs(keywords: str, location: str = '', page: int = 1, page_size: int = 10) -> Dict[str, Any]:
+def get_api_url() -> str:
+    return os.environ.get('JSEARCH_API_URL', config.JSEARCH_API_URL)
+
+# Search results are shared by everyone searching the same terms. Fresh for
+# JOB_SEARCH_CACHE_TTL seconds, then served stale for up to
+# JOB_SEARCH_CACHE_STALE_TTL more while one background call refreshes them.
+# Set JOB_SEARCH_CACHE_DB to a SQLite path to share results between workers.
+# Identical searches that miss at the same time share one upstream call; set
+# JOB_SEARCH_LOCK_DIR to also coordinate that across worker processes.
+job_search_cache = SWRCache(
+    'job_search',
+    ttl=float(os.environ.get("JOB_SEARCH_CACHE_TTL", 900)),
+    stale_ttl=float(os.environ.get("JOB_SEARCH_CACHE_STALE_TTL", 3600)),
+    max_entries=int(os.environ.get("JOB_SEARCH_CACHE_SIZE", 512)),
+    db_path=os.environ.get("JOB_SEARCH_CACHE_DB"),
+    flight=SingleFlight(
+        'job_search',
+        max_waiters=int(os.environ.get("JOB_SEARCH_MAX_WAITERS", 50)),
+        lock_dir=os.environ.get("JOB_SEARCH_LOCK_DIR")
+    )
+)
+
+# Every JSearch call takes a token from a per-second bucket and, when
+# JSEARCH_DAILY_QUOTA is set, a daily one. Interactive searches queue briefly
+# for tokens; batch detail lookups leave 10% of each bucket to them and
+# prefetches 25%, and never queue. Set JSEARCH_QUOTA_DB to a SQLite path so
+# every worker draws from the same budget. Searches shed for quota are served
+# from expired cache entries, then the local index, when there are any.
+# JSearch calls are sent once, without http_client's retries: a retry would
+# spend upstream quota the token did not pay for, and a 429 retried at once
+# only digs deeper.
+JSEARCH_RATE_PER_SECOND = float(os.environ.get("JSEARCH_RATE_PER_SECOND", 5))
+JSEARCH_DAILY_QUOTA = float(os.environ.get("JSEARCH_DAILY_QUOTA", 0))
+jsearch_quota = QuotaScheduler(
+    'jsearch',
+    [('second', JSEARCH_RATE_PER_SECOND, float(os.environ.get("JSEARCH_BURST", JSEARCH_RATE_PER_SECOND)))]
+    + ([('day', JSEARCH_DAILY_QUOTA / 86400, JSEARCH_DAILY_QUOTA)] if JSEARCH_DAILY_QUOTA > 0 else []),
+    db_path=os.environ.get("JSEARCH_QUOTA_DB"),
+    max_wait={INTERACTIVE: float(os.environ.get("JSEARCH_QUOTA_MAX_WAIT", 2))}
+)
+
+# Opt-in: after a page is served, load the next one into the cache so the
+# "next page" click is a hit. Every prefetch costs an upstream call, hence the
+# per-user and global per-minute budgets.
+job_search_prefetcher = Prefetcher(
+    job_search_cache,
+    enabled=os.environ.get("JOB_SEARCH_PREFETCH", "").lower() in ('1', 'true', 'yes'),
+    workers=int(os.environ.get("JOB_SEARCH_PREFETCH_WORKERS", 2)),
+    per_minute=int(os.environ.get("JOB_SEARCH_PREFETCH_PER_MINUTE", 30)),
+    user_per_minute=int(os.environ.get("JOB_SEARCH_PREFETCH_USER_PER_MINUTE", 5))
+)
+
+# Every listing fetched from JSearch is upserted into a local full-text index
+# when JOB_INDEX_DB is set. JOB_SEARCH_MODE picks where searches go:
+#   remote - JSearch through the cache (default)
+#   local  - only the index
+#   auto   - the index when it can fill the page with listings ingested within
+#            JOB_INDEX_MAX_AGE seconds, JSearch otherwise
+# In every mode the index answers when JSearch fails (down, out of quota).
+JOB_INDEX_DB = os.environ.get("JOB_INDEX_DB")
+JOB_INDEX_MAX_AGE = float(os.environ.get("JOB_INDEX_MAX_AGE", 7 * 24 * 3600))
+JOB_SEARCH_MODE = os.environ.get("JOB_SEARCH_MODE", "remote")
+job_index = JobIndex(JOB_INDEX_DB) if JOB_INDEX_DB else None
+
+# Reposts of the same role (new job id, another aggregator) are collapsed to
+# the first copy seen, within a page and, for each user, across the pages of
+# a search they paged through in the last JOB_DEDUP_SHOWN_TTL seconds. The
+# MinHash signatures live in memory unless JOB_DEDUP_DB points at a SQLite
+# file, which keeps them across restarts and shares them between workers.
+# JOB_DEDUP=0 turns it off.
+job_deduplicator = JobDeduplicator(
+    os.environ.get("JOB_DEDUP_DB", ":memory:"),
+    threshold=float(os.environ.get("JOB_DEDUP_THRESHOLD", 0.8)),
+    max_signatures=int(os.environ.get("JOB_DEDUP_MAX_SIGNATURES", 100000)),
+    shown_ttl=float(os.environ.get("JOB_DEDUP_SHOWN_TTL", 3600))
+) if os.environ.get("JOB_DEDUP", "1").lower() not in ('0', 'false', 'no') else None
+
+# Searches like "data engineer OR analytics engineer" in "Berlin OR remote"
+# run every keyword x location combination at once on a shared pool of
+# JOB_MULTI_SEARCH_WORKERS threads, at most JOB_MULTI_SEARCH_MAX_QUERIES
+# combinations per search. Sub-queries still unanswered after
+# JOB_MULTI_SEARCH_TIMEOUT seconds are left out of the merged results.
+JOB_MULTI_SEARCH_WORKERS = int(os.environ.get("JOB_MULTI_SEARCH_WORKERS", 4))
+JOB_MULTI_SEARCH_MAX_QUERIES = int(os.environ.get("JOB_MULTI_SEARCH_MAX_QUERIES", 12))
+JOB_MULTI_SEARCH_TIMEOUT = float(os.environ.get("JOB_MULTI_SEARCH_TIMEOUT", 20))
+ALTERNATIVES_PATTERN = re.compile(r'\s+OR\s+')
+# Reciprocal rank fusion constant: damps the lead of the top few positions
+RRF_K = 60
+
+# Job details, cached for JOB_DETAILS_CACHE_TTL seconds and filled from search
+# results as well as from the job-details endpoint. Misses in a batch are
+# fetched up to JOB_DETAILS_BATCH_SIZE ids per call (the most JSearch takes),
+# with JOB_DETAILS_WORKERS calls in flight.
+JOB_DETAILS_URL = os.environ.get("JSEARCH_DETAILS_URL", "https://jsearch.p.rapidapi.com/job-details")
+JOB_DETAILS_BATCH_SIZE = int(os.environ.get("JOB_DETAILS_BATCH_SIZE", 20))
+JOB_DETAILS_WORKERS = int(os.environ.get("JOB_DETAILS_WORKERS", 4))
+JOB_DETAILS_MAX_IDS = int(os.environ.get("JOB_DETAILS_MAX_IDS", 100))
+job_details_cache = SWRCache(
+    'job_details',
+    ttl=float(os.environ.get("JOB_DETAILS_CACHE_TTL", 6 * 3600)),
+    max_entries=int(os.environ.get("JOB_DETAILS_CACHE_SIZE", 2048)),
+    db_path=os.environ.get("JOB_DETAILS_CACHE_DB")
+)
+
+_executors: Dict[str, Any] = {}
+
+def get_executor(name: str, workers: int) -> ThreadPoolExecutor:
+    """
+    Shared thread pool for name, capping concurrent upstream calls of that kind.
+    """
+    executor, pid = _executors.get(name, (None, None))
+    # Threads do not survive a fork, so build the pool in the process that uses it
+    if executor is None or pid != os.getpid():
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        _executors[name] = (executor, os.getpid())
+    return executor
+
+# Search responses carry a JOB_DESCRIPTION_SNIPPET_CHARS snippet of each
+# description unless the caller asks for more; the full text is served by id
+# from the job details cache (/api/job-details).
+JOB_DESCRIPTION_SNIPPET_CHARS = int(os.environ.get("JOB_DESCRIPTION_SNIPPET_CHARS", 300))
+
+def is_cacheable(result: Dict[str, Any]) -> bool:
+    return 'error' not in result
+
+def search_cache_key(keywords: str, location: str, page: int, page_size: int) -> str:
+    """
+    Cache key for a search; case and extra whitespace do not matter.
+    """
+    parts = (keywords, location or '', page, page_size)
+    return '|'.join(' '.join(str(part).lower().split()) for part in parts)
+
+def search_scope(keywords: str, location: str, viewer: str) -> str:
+    """
+    Identifies one viewer's search across its pages, for cross-page dedup.
+    """
+    return f"{viewer}|{search_cache_key(keywords, location, '', '')}"
+
+def search_jobs(keywords: str, location: str = '', page: int = 1, page_size: int = 10,
+                resume_skills: Optional[List[str]] = None, mode: Optional[str] = None,
+                viewer: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Search for jobs in JSearch (through the shared search cache) and/or the
+    local job index, depending on mode (defaults to JOB_SEARCH_MODE). When
+    resume_skills is given, every listing gets a 'match_score' (0-100) and
+    the 'missing_skills' it asks for. With a viewer (user id or address),
+    reposts they were already shown on another page of the search are dropped.
+    """
+    mode = mode or JOB_SEARCH_MODE
+    results = None
+    if job_index is not None and mode in ('local', 'auto'):
+        local = job_index.search(keywords, location, page, page_size,
+                                 max_age=JOB_INDEX_MAX_AGE if mode == 'auto' else None)
+        if mode == 'local' or local['total_jobs'] >= int(page) * int(page_size):
+            results = local
+
+    if results is None:
+        results = search_remote(keywords, location, page, page_size, viewer=viewer)
+        if 'error' in results and job_index is not None:
+            local = job_index.search(keywords, location, page, page_size)
+            if local['jobs']:
+                logger.warning(f"Serving job search from the local index: {results['error']}")
+                local['fallback'] = True
+                results = local
+
+    if resume_skills is not None:
+        # The cache keeps serialized copies, so annotating does not leak between users
+        JOB_MATCHER.annotate(resume_skills, results['jobs'])
+    return results
+
+def split_alternatives(value: Union[str, List[str], None]) -> List[str]:
+    """
+    Split "a OR b" (or a list) into distinct alternatives; [''] when empty.
+    """
+    parts = value if isinstance(value, list) else ALTERNATIVES_PATTERN.split(value or '')
+    alternatives = []
+    for part in parts:
+        part = ' '.join(str(part).split())
+        if part and part.lower() not in (seen.lower() for seen in alternatives):
+            alternatives.append(part)
+    return alternatives or ['']
+
+def is_multi_search(keywords: Union[str, List[str], None], location: Union[str, List[str], None]) -> bool:
+    return len(split_alternatives(keywords)) > 1 or len(split_alternatives(location)) > 1
+
+def search_jobs_multi(keywords: Union[str, List[str]], location: Union[str, List[str]] = '', page: int = 1,
+                      page_size: int = 10, resume_skills: Optional[List[str]] = None,
+                      mode: Optional[str] = None, timeout: Optional[float] = None,
+                      viewer: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run search_jobs for every keyword x location alternative concurrently and
+    merge the pages into one list.
+
+    Listings are deduplicated by id and ranked by reciprocal rank fusion, so
+    one that is near the top of several sub-queries comes first. If some
+    sub-queries fail or time out, the rest are returned with 'partial' set.
+
+    Args:
+        keywords: "a OR b" or a list of keyword strings
+        location: "x OR y" or a list of locations
+        page: 1-based page number, applied to every sub-query
+        page_size: Listings per sub-query page
+        resume_skills: Skills to score the merged listings against
+        mode: Search mode passed to search_jobs
+        timeout: Seconds to wait for sub-queries (defaults to JOB_MULTI_SEARCH_TIMEOUT)
+        viewer: User id or address, for cross-page dedup of each sub-query
+
+    Returns:
+        {'jobs': [...], 'total_jobs': int, 'queries': [...], 'partial': bool};
+        total_jobs is the largest sub-query total, which keeps page counts right
+    """
+    queries = [(k, l) for k in split_alternatives(keywords) for l in split_alternatives(location)]
+    if len(queries) > JOB_MULTI_SEARCH_MAX_QUERIES:
+        return {"error": f"Too many combinations ({len(queries)}), at most {JOB_MULTI_SEARCH_MAX_QUERIES} allowed",
+                "jobs": [], "total_jobs": 0}
+
+    executor = get_executor('job-search', JOB_MULTI_SEARCH_WORKERS)
+    futures = [executor.submit(search_jobs, k, l, page, page_size, mode=mode, viewer=viewer) for k, l in queries]
+    wait(futures, timeout=JOB_MULTI_SEARCH_TIMEOUT if timeout is None else timeout)
+
+    merged: Dict[str, Dict[str, Any]] = {}
+    scores: Dict[str, float] = {}
+    summaries = []
+    total_jobs = 0
+    for (k, l), future in zip(queries, futures):
+        summary = {'keywords': k, 'location': l}
+        summaries.append(summary)
+        if not future.done():
+            # Still queued or running; a running one will still fill the cache
+            future.cancel()
+            summary['timed_out'] = True
+            continue
+        try:
+            results = future.result()
+        except Exception as e:
+            logger.exception(f"Job sub-query failed: keywords={k}, location={l}")
+            results = {"error": str(e), "jobs": [], "total_jobs": 0}
+        if 'error' in results:
+            summary['error'] = results['error']
+            continue
+
+        summary['total_jobs'] = results.get('total_jobs', 0)
+        total_jobs = max(total_jobs, summary['total_jobs'])
+        for rank, job in enumerate(results.get('jobs', [])):
+            key = job.get('id') or f"{job.get('title')}|{job.get('company')}|{job.get('url')}"
+            merged.setdefault(key, job)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (RRF_K + rank + 1)
+
+    answered = sum(1 for summary in summaries if 'total_jobs' in summary)
+    if not answered:
+        return {"error": "All job searches failed or timed out", "jobs": [], "total_jobs": 0,
+                "queries": summaries, "partial": True}
+
+    jobs = [merged[key] for key in sorted(merged, key=lambda key: -scores[key])]
+    if resume_skills is not None:
+        JOB_MATCHER.annotate(resume_skills, jobs)
+    return {"jobs": jobs, "total_jobs": total_jobs, "queries": summaries, "partial": answered < len(queries)}
+
+def snippet(text: str, limit: int) -> str:
+    """
+    Shorten text to at most limit characters, at a word boundary when there is one.
+    """
+    if len(text) <= limit:
+        return text
+    cut = text[:limit - 1]
+    space = cut.rfind(' ')
+    if space > limit // 2:
+        cut = cut[:space]
+    return cut.rstrip(' ,.;:-') + '\u2026'
+
+def project_results(results: Dict[str, Any], fields: Union[str, List[str], None] = None,
+                    description_chars: Any = None) -> Dict[str, Any]:
+    """
+    Trim a search response for the client.
+
+    Args:
+        results: search_jobs or search_jobs_multi output
+        fields: Listing fields to keep, as a list or "a,b"; all when None. 'id' is always kept
+        description_chars: Longest description to send; JOB_DESCRIPTION_SNIPPET_CHARS
+            when None, the full text when 0
+
+    Returns:
+        A copy of results; shortened listings get 'description_truncated': True
+    """
+    if isinstance(fields, str):
+        fields = fields.split(',')
+    keep = {field.strip() for field in fields} | {'id'} if fields else None
+    try:
+        limit = JOB_DESCRIPTION_SNIPPET_CHARS if description_chars is None else int(description_chars)
+    except (TypeError, ValueError):
+        limit = JOB_DESCRIPTION_SNIPPET_CHARS
+
+    jobs = []
+    for job in results.get('jobs', []):
+        if keep is not None:
+            job = {field: value for field, value in job.items() if field in keep}
+        description = job.get('description')
+        if limit > 0 and description and len(description) > limit:
+            job = dict(job, description=snippet(description, limit), description_truncated=True)
+        jobs.append(job)
+    return dict(results, jobs=jobs)
+
+def search_remote(keywords: str, location: str = '', page: int = 1, page_size: int = 10,
+                  viewer: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Search JSearch through the shared search cache, then drop the reposts
+    the viewer has already been shown on other pages of this search.
+    """
+    key = search_cache_key(keywords, location, page, page_size)
+    job_search_prefetcher.record_lookup(key)
+    try:
+        results = job_search_cache.get_or_load(
+            key,
+            lambda: fetch_jobs(keywords, location, page, page_size),
+            cacheable=is_cacheable,
+            # Nobody waits on a refresh: the stale page has been served
+            refresh_loader=lambda: fetch_jobs(keywords, location, page, page_size, priority=BATCH)
+        )
+    except (TooManyWaiters, TimeoutError) as e:
+        logger.warning(f"Job search not coalesced: {str(e)}")
+        results = {"error": "Too many identical searches in progress, please retry", "jobs": [], "total_jobs": 0}
+
+    if 'error' in results:
+        # Out of quota or JSearch failing: an expired copy beats no results
+        stale = job_search_cache.get_stale(key)
+        if stale is not None:
+            logger.warning(f"Serving expired job search results: {results['error']}")
+            stale['stale'] = True
+            results = stale
+
+    # Cached pages are shared by every user, so what each user has already
+    # seen is filtered here rather than when the page is fetched
+    if viewer is not None and job_deduplicator is not None and results.get('jobs'):
+        fetched = len(results['jobs'])
+        results['jobs'] = job_deduplicator.drop_shown(
+            results['jobs'], search_scope(keywords, location, viewer), int(page)
+        )
+        results['duplicates_removed'] = results.get('duplicates_removed', 0) + fetched - len(results['jobs'])
+    return results
+
+def prefetch_next_page(keywords: str, location: str, page: int, page_size: int,
+                       results: Dict[str, Any], user_key: str) -> bool:
+    """
+    After serving a page, start loading the one after it into the search
+    cache, unless this page was the last or the prefetch budget is spent.
+
+    Returns:
+        True if a prefetch was started
+    """
+    try:
+        page, page_size = int(page), int(page_size)
+    except (TypeError, ValueError):
+        return False
+    # A short page is the last one, counting listings dropped as duplicates.
+    # total_jobs falls back to the page length when JSearch omits it, so it
+    # only counts when it says there is more
+    returned = len(results.get('jobs', [])) + results.get('duplicates_removed', 0)
+    total_jobs = results.get('total_jobs', 0)
+    if 'error' in results or results.get('source') == 'local' or returned < page_size:
+        return False
+    if total_jobs > returned and page * page_size >= total_jobs:
+        return False
+
+    next_page = page + 1
+    return job_search_prefetcher.schedule(
+        search_cache_key(keywords, location, next_page, page_size),
+        lambda: fetch_jobs(keywords, location, next_page, page_size, priority=PREFETCH),
+        user_key,
+        cacheable=is_cacheable
+    )
+
+def fetch_jobs(keywords: str, location: str = '', page: int = 1, page_size: int = 10,
+               priority: str = INTERACTIVE) -> Dict[str, Any]:
     logger.debug(f"Searching jobs with keywords='{keywords}', location='{location}', page={page}")
     api_key = get_api_key()
     if not api_key:
         logger.error("JSearch API key not found")
         return {"error": "API key not configured", "jobs": [], "total_jobs": 0}
 
-    url = config.JSEARCH_API_URL
+    try:
+        jsearch_quota.acquire(priority)
+    except QuotaExceeded as e:
+        logger.warning(f"Job search shed: {str(e)}")
+        return {"error": "Job search is busy, please retry shortly", "jobs": [], "total_jobs": 0,
+                "retry_after": round(e.retry_after, 1)}
+
+    url = get_api_url()
     params = {
         "query": keywords,
         "page": str(page),
@@ -51,7 +441,7 @@ def search_jobs(keywords: str, location: str = '', page: int = 1, page_size: int
     }
 
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = http_client.get(url, headers=headers, params=params, retries=0)
         response.raise_for_status()
         data = response.json()
 
@@ -62,8 +452,17 @@ def search_jobs(keywords: str, location: str = '', page: int = 1, page_size: int
         jobs_data = data.get("data", [])
         processed_jobs = process_job_listings(jobs_data)
         total_jobs = data.get("total_jobs", len(processed_jobs))
+        result = {"jobs": processed_jobs, "total_jobs": total_jobs}
+        if job_deduplicator is not None:
+            result["jobs"] = job_deduplicator.dedupe(processed_jobs)
+            result["duplicates_removed"] = len(processed_jobs) - len(result["jobs"])
+        if job_index is not None:
+            job_index.upsert(result["jobs"])
+        for job in result["jobs"]:
+            if job["id"]:
+                job_details_cache.put(job["id"], job)
 
-        return {"jobs": processed_jobs, "total_jobs": total_jobs}
+        return result
 
     except requests.exceptions.RequestException as e:
         logger.exception("Error fetching job listings")
@@ -93,32 +492,93 @@ def process_job_listings(raw_jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]
         processed_jobs.append(processed_job)
     return processed_jobs
 
-# Optional: function if you plan to use it
 def get_job_details(job_id: str) -> Dict[str, Any]:
+    """
+    Details of one listing, shaped like process_job_listings output.
+    """
+    results = get_jobs_details([job_id])
+    if job_id in results['jobs']:
+        return {"job": results['jobs'][job_id]}
+    return {"error": results['errors'].get(job_id, "Job not found")}
+
+def get_jobs_details(job_ids: List[str], priority: str = INTERACTIVE) -> Dict[str, Any]:
+    """
+    Details of many listings: cached ones first, then the misses from
+    JSearch in batches fetched concurrently. priority is the quota class
+    of the JSearch calls.
+
+    Returns:
+        {'jobs': {job_id: job}, 'errors': {job_id: message}}
+    """
+    job_ids = list(dict.fromkeys(job_id for job_id in job_ids if job_id))
+    jobs: Dict[str, Dict[str, Any]] = {}
+    errors: Dict[str, str] = {}
+    for job_id in job_ids[JOB_DETAILS_MAX_IDS:]:
+        errors[job_id] = f"At most {JOB_DETAILS_MAX_IDS} job ids per request"
+    job_ids = job_ids[:JOB_DETAILS_MAX_IDS]
+
+    missing = []
+    for job_id in job_ids:
+        job = job_details_cache.get(job_id)
+        if job is None:
+            missing.append(job_id)
+        else:
+            jobs[job_id] = job
+    if not missing:
+        return {"jobs": jobs, "errors": errors}
+
+    executor = get_executor('job-details', JOB_DETAILS_WORKERS)
+    batches = [missing[i:i + JOB_DETAILS_BATCH_SIZE] for i in range(0, len(missing), JOB_DETAILS_BATCH_SIZE)]
+    futures = [
+        executor.submit(job_details_cache.load_many, batch, lambda ids: fetch_job_details(ids, priority))
+        for batch in batches
+    ]
+    for batch, future in zip(batches, futures):
+        try:
+            found = future.result()
+        except Exception as e:
+            logger.exception("Error fetching job details")
+            found = {}
+            errors.update((job_id, str(e)) for job_id in batch)
+        for job_id in batch:
+            if job_id in found:
+                jobs[job_id] = found[job_id]
+            else:
+                errors.setdefault(job_id, "Job not found")
+    return {"jobs": jobs, "errors": errors}
+
+def fetch_job_details(job_ids: List[str], priority: str = INTERACTIVE) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch up to JOB_DETAILS_BATCH_SIZE listings in one job-details call.
+
+    Returns:
+        {job_id: job} for the listings JSearch returned
+
+    Raises:
+        RuntimeError: When the API key is missing or JSearch reports an error
+        QuotaExceeded: When the JSearch budget has no room for the call
+        requests.exceptions.RequestException: When the call itself fails
+    """
     api_key = get_api_key()
     if not api_key:
         logger.error("JSearch API key not found")
-        return {"error": "API key not configured"}
+        raise RuntimeError("API key not configured")
+
+    jsearch_quota.acquire(priority)
 
-    url = "https://jsearch.p.rapidapi.com/job-details"
-    params = {"job_id": job_id}
+    params = {"job_id": ','.join(job_ids)}
     headers = {
         "X-RapidAPI-Key": api_key,
         "X-RapidAPI-Host": "jsearch.p.rapidapi.com"
     }
 
-    try:
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        data = response.json()
-        if data.get("status") != "OK":
-            logger.error(f"Failed to fetch job details: {data.get('message', 'Unknown error')}")
-            return {"error": data.get("message", "API request failed")}
-        job_details = data.get("data", [{}])[0]
-        return {"job": job_details}
-    except requests.exceptions.RequestException as e:
-        logger.exception("Error fetching job details")
-        return {"error": str(e)}
+    response = http_client.get(JOB_DETAILS_URL, headers=headers, params=params, retries=0)
+    response.raise_for_status()
+    data = response.json()
+    if data.get("status") != "OK":
+        logger.error(f"Failed to fetch job details: {data.get('message', 'Unknown error')}")
+        raise RuntimeError(data.get("message", "API request failed"))
+    return {job["id"]: job for job in process_job_listings(data.get("data", [])) if job["id"]}
 
 # Export for register_routes
 job_recommendation_route = job_recommender_bp
\ No newline at end of file
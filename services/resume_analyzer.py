@@ -2,8 +2,12 @@
 
 from flask import Blueprint, request, jsonify
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Union
+import hashlib
+import os
 import re
+from services.resume_document import ResumeDocument, as_document
+from services.skill_taxonomy import DEFAULT_INDEX_PATH, DEFAULT_TAXONOMY_PATH, load_skill_matcher
 
 resume_analysis_route = Blueprint('resume_analysis_route', __name__)
 logger = logging.getLogger(__name__)
@@ -32,45 +36,66 @@ def analyze_resume_api():
 
 # --- Resume Analysis Logic Functions (no changes made) ---
 
-def analyze_resume(text: str) -> Dict[str, Any]:
-    skills = extract_skills(text)
-    education = extract_education(text)
-    experience = extract_experience(text)
-    suggestions = generate_suggestions(text, skills, education, experience)
+# Bump whenever extraction or analysis output changes so cached results from
+# an older analyzer are not served.
+ANALYZER_VERSION = '4'
+
+def analysis_cache_key(filename: str, data: bytes) -> str:
+    """
+    Content-addressed cache key for an uploaded resume.
+    """
+    extension = os.path.splitext(filename or '')[1].lower()
+    return f"{ANALYZER_VERSION}:{extension}:{hashlib.sha256(data).hexdigest()}"
+
+# Skills come from the taxonomy file, compiled once into an index that every
+# worker memory-maps; extract_skills only scans.
+SKILL_TAXONOMY_PATH = os.environ.get("SKILL_TAXONOMY_PATH", DEFAULT_TAXONOMY_PATH)
+SKILL_INDEX_PATH = os.environ.get("SKILL_INDEX_PATH", DEFAULT_INDEX_PATH)
+SKILL_MATCHER = load_skill_matcher(SKILL_TAXONOMY_PATH, SKILL_INDEX_PATH)
+
+DEGREE_PATTERN = re.compile(r'\b(Bachelor|Master|PhD|BSc|MSc|BA|MA|MBA|B\.A\.|M\.A\.|B\.S\.|M\.S\.)[s]?\b|\b(Bachelor|Master)\'s\b')
+# The patterns below have no leading \b; they go through ResumeDocument.word_matches
+UNIVERSITY_PATTERN = re.compile(r'(?:University|College|Institute|School)(?: of)? [A-Z][a-zA-Z]+\b')
+TITLE_PATTERN = re.compile(r'(?:Software Engineer|Developer|Senior Developer|Manager|Director|Coordinator|Specialist|Analyst|Designer|Programmer|Architect|Lead|Consultant|Associate|Assistant|Administrator|Executive|Officer)\b')
+COMPANY_PATTERN = re.compile(r'[A-Z][a-zA-Z]+ (?:Inc|LLC|Ltd|Company|Corp|Corporation|Technologies|Solutions|Systems)\b')
+IMPORTANT_SECTIONS = ['skill', 'experience', 'education', 'project', 'certification', 'publication']
+
+def analyze_resume(text: Union[str, ResumeDocument]) -> Dict[str, Any]:
+    # Parse once; every extractor below reads from the same document model
+    doc = as_document(text)
+    skill_matches = match_skills(doc)
+    skills = list(skill_matches)
+    education = extract_education(doc)
+    experience = extract_experience(doc)
+    suggestions = generate_suggestions(doc, skills, education, experience)
     
     return {
         'skills': skills,
+        'skill_ids': [match['id'] for match in skill_matches.values() if match['id'] is not None],
         'education': education,
         'experience': experience,
         'suggestions': suggestions
     }
 
-def extract_skills(text: str) -> List[str]:
-    skill_keywords = [
-        'python', 'javascript', 'typescript', 'java', 'c\\+\\+', 'c#', 'react', 'angular', 
-        'vue', 'node', 'express', 'django', 'flask', 'sql', 'nosql', 'mongodb',
-        'postgresql', 'mysql', 'aws', 'azure', 'gcp', 'docker', 'kubernetes',
-        'git', 'agile', 'scrum', 'project management', 'leadership', 'communication',
-        'html', 'css', 'bootstrap', 'tailwind', 'jquery', 'php', 'laravel', 'symfony',
-        'ruby', 'rails', 'go', 'rust', 'swift', 'kotlin', 'tensorflow', 'pytorch',
-        'machine learning', 'artificial intelligence', 'data science', 'big data',
-        'hadoop', 'spark', 'tableau', 'power bi', 'excel', 'word', 'powerpoint',
-        'photoshop', 'illustrator', 'figma', 'sketch', 'ui/ux', 'seo', 'digital marketing'
-    ]
-    pattern = '|'.join(r'\b' + skill + r'\b' for skill in skill_keywords)
-    found_skills = list(set(re.findall(pattern, text.lower())))
-    return [skill.capitalize() for skill in found_skills]
-
-def extract_education(text: str) -> List[Dict[str, str]]:
+def extract_skills(text: Union[str, ResumeDocument]) -> List[str]:
+    doc = as_document(text)
+    return SKILL_MATCHER.extract(doc.text, doc.normalized)
+
+def match_skills(text: Union[str, ResumeDocument]) -> Dict[str, Dict[str, Any]]:
+    """
+    Return every skill found in the text with its occurrence count and
+    character positions.
+    """
+    doc = as_document(text)
+    return SKILL_MATCHER.summarize(doc.text, doc.normalized)
+
+def extract_education(text: Union[str, ResumeDocument]) -> List[Dict[str, str]]:
+    doc = as_document(text)
     education_list = []
-    degree_pattern = r'\b(Bachelor|Master|PhD|BSc|MSc|BA|MA|MBA|B\.A\.|M\.A\.|B\.S\.|M\.S\.)[s]?\b|\b(Bachelor|Master)\'s\b'
-    degrees = re.findall(degree_pattern, text)
+    degrees = DEGREE_PATTERN.findall(doc.text)
     flattened_degrees = [d[0] if d[0] else d[1] for d in degrees if d[0] or d[1]]
-    university_pattern = r'\b(University|College|Institute|School)( of)? [A-Z][a-zA-Z]+\b'
-    universities = re.findall(university_pattern, text)
-    university_names = [' '.join(u).strip() for u in universities]
-    year_pattern = r'\b(19|20)\d{2}\b'
-    years = re.findall(year_pattern, text)
+    university_names = [match.group(0) for match in doc.word_matches(UNIVERSITY_PATTERN)]
+    years = [doc.span_text(span) for span in doc.year_spans]
 
     for i, degree in enumerate(flattened_degrees):
         education_entry = {
@@ -91,36 +116,38 @@ def extract_education(text: str) -> List[Dict[str, str]]:
 
     return education_list
 
-def extract_experience(text: str) -> List[Dict[str, str]]:
+def extract_experience(text: Union[str, ResumeDocument]) -> List[Dict[str, str]]:
+    doc = as_document(text)
     experience_list = []
-    title_pattern = r'\b(Software Engineer|Developer|Senior Developer|Manager|Director|Coordinator|Specialist|Analyst|Designer|Programmer|Architect|Lead|Consultant|Associate|Assistant|Administrator|Executive|Officer)\b'
-    job_titles = re.findall(title_pattern, text)
-    company_pattern = r'\b[A-Z][a-zA-Z]+ (Inc|LLC|Ltd|Company|Corp|Corporation)\b|\b[A-Z][a-zA-Z]+ Technologies\b|\b[A-Z][a-zA-Z]+ Solutions\b|\b[A-Z][a-zA-Z]+ Systems\b'
-    companies = re.findall(company_pattern, text)
-    date_pattern = r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* [\d]{4}\s*(-|to|–|—)\s*(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* [\d]{4}\b|\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* [\d]{4}\s*(-|to|–|—)\s*[Pp]resent\b|\b[\d]{4}\s*(-|to|–|—)\s*[\d]{4}\b|\b[\d]{4}\s*(-|to|–|—)\s*[Pp]resent\b'
-    dates = re.findall(date_pattern, text)
-    paragraphs = re.split(r'\n\s*\n', text)
-
-    for i, title in enumerate(job_titles):
-        description = ""
-        for paragraph in paragraphs:
-            if title in paragraph:
-                description = paragraph.replace(title, "").strip()
-                break
+    title_index = doc.term_index(TITLE_PATTERN)
+    company_spans = [match.span() for match in doc.word_matches(COMPANY_PATTERN)]
+    occurrences = sorted(
+        (span, paragraph, title)
+        for title, found in title_index.items()
+        for span, paragraph in found
+    )
+
+    # Each occurrence already knows its paragraph; company and period are the
+    # nearest matches by position rather than the i-th match in the document.
+    for span, paragraph, title in occurrences:
+        description = doc.paragraph_text(paragraph).replace(title, "").strip()
+        company = doc.nearest_span(company_spans, span)
+        period = doc.nearest_span(doc.date_spans, span)
         experience_entry = {
             'title': title,
-            'company': companies[i] if i < len(companies) else 'Unknown Company',
-            'period': dates[i] if i < len(dates) else 'Unknown Period',
+            'company': doc.span_text(company) if company else 'Unknown Company',
+            'period': doc.span_text(period) if period else 'Unknown Period',
             'description': description if description else 'No detailed description available'
         }
         experience_list.append(experience_entry)
 
     return experience_list
 
-def generate_suggestions(text: str, skills: List[str], education: List[Dict[str, str]], experience: List[Dict[str, str]]) -> List[str]:
+def generate_suggestions(text: Union[str, ResumeDocument], skills: List[str], education: List[Dict[str, str]], experience: List[Dict[str, str]]) -> List[str]:
+    doc = as_document(text)
     suggestions = []
 
-    if len(text) < 2000:
+    if len(doc.text) < 2000:
         suggestions.append("Your resume seems short. Consider adding more details about your experience and skills.")
     if len(skills) < 5:
         suggestions.append("Try adding more specific skills relevant to your target position.")
@@ -131,8 +158,7 @@ def generate_suggestions(text: str, skills: List[str], education: List[Dict[str,
     elif len(experience) < 2:
         suggestions.append("Consider adding more details about your past work experiences.")
     
-    important_sections = ['skill', 'experience', 'education', 'project', 'certification', 'publication']
-    missing_sections = [section for section in important_sections if section not in text.lower()]
+    missing_sections = [section for section in IMPORTANT_SECTIONS if not doc.mentions(section)]
     if missing_sections:
         suggestions.append(f"Consider adding dedicated sections for: {', '.join(missing_sections).title()}")
     
@@ -0,0 +1,182 @@
+# services/resume_document.py
+
+import re
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple, Union
+
+from services.skill_matcher import normalize_text
+
+Span = Tuple[int, int]
+TermIndex = Dict[str, List[Tuple[Span, int]]]
+
+MONTH = r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*'
+DASH = r'\s*(?:-|to|–|—)\s*'
+DATE_RANGE_PATTERN = re.compile(
+    rf'\b{MONTH} \d{{4}}{DASH}{MONTH} \d{{4}}\b'
+    rf'|\b{MONTH} \d{{4}}{DASH}[Pp]resent\b'
+    rf'|\b\d{{4}}{DASH}\d{{4}}\b'
+    rf'|\b\d{{4}}{DASH}[Pp]resent\b'
+)
+# No leading \b: patterns that start with a literal let re skip ahead with
+# its first-character prefilter. The boundary is checked in word_matches.
+YEAR_PATTERN = re.compile(r'(?:19|20)\d{2}\b')
+PARAGRAPH_BREAK_PATTERN = re.compile(r'\n\s*\n')
+
+# Header line (lowercased, punctuation stripped) -> canonical section name
+SECTION_HEADERS = {
+    'summary': 'summary',
+    'professional summary': 'summary',
+    'profile': 'summary',
+    'objective': 'summary',
+    'skills': 'skills',
+    'technical skills': 'skills',
+    'core skills': 'skills',
+    'experience': 'experience',
+    'work experience': 'experience',
+    'professional experience': 'experience',
+    'employment history': 'experience',
+    'work history': 'experience',
+    'education': 'education',
+    'projects': 'projects',
+    'certifications': 'certifications',
+    'publications': 'publications',
+    'awards': 'awards',
+}
+
+
+class ResumeDocument:
+    """
+    Shared pre-pass over a resume. Every extractor reads from this model so
+    the text is lowercased, split into lines and paragraphs, and scanned for
+    dates exactly once per resume.
+
+    Attributes:
+        text: Original text; all spans are offsets into it
+        normalized: Lowercased text with separators blanked, same length as text
+        line_offsets: Start offset of every line
+        paragraphs: (start, end) of every blank-line separated paragraph
+        sections: (section name, start offset) for every recognised header line
+        date_spans: (start, end) of every date range such as "Jan 2020 - Present"
+        year_spans: (start, end) of every four digit year
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.normalized = normalize_text(text)
+
+        lines = text.split('\n')
+        self.line_offsets = [0]
+        self.line_offsets.extend(accumulate(len(line) + 1 for line in lines[:-1]))
+
+        self.paragraphs: List[Span] = []
+        start = 0
+        for match in PARAGRAPH_BREAK_PATTERN.finditer(text):
+            self.paragraphs.append((start, match.start()))
+            start = match.end()
+        self.paragraphs.append((start, len(text)))
+        self._paragraph_starts = [span[0] for span in self.paragraphs]
+
+        self.sections: List[Tuple[str, int]] = []
+        for line_start, line in zip(self.line_offsets, lines):
+            if len(line) > 40:
+                continue
+            header = ' '.join(self.normalized[line_start:line_start + len(line)].split())
+            if header in SECTION_HEADERS:
+                self.sections.append((SECTION_HEADERS[header], line_start))
+
+        self.date_spans = [match.span() for match in DATE_RANGE_PATTERN.finditer(text)]
+        self.year_spans = [match.span() for match in self.word_matches(YEAR_PATTERN)]
+        self._term_indexes: Dict[re.Pattern, TermIndex] = {}
+
+    def word_matches(self, pattern: re.Pattern) -> List[re.Match]:
+        """
+        Return the matches of a pattern that start on a word boundary.
+        """
+        text = self.text
+        return [
+            match for match in pattern.finditer(text)
+            if match.start() == 0 or not (text[match.start() - 1].isalnum() or text[match.start() - 1] == '_')
+        ]
+
+    def term_index(self, pattern: re.Pattern) -> TermIndex:
+        """
+        Inverted index from every term the pattern matches to its occurrences,
+        each as (span, paragraph id). Built once per pattern and document by
+        walking the matches and paragraph boundaries together, so resolving
+        a term to its paragraphs is a dict lookup.
+        """
+        index = self._term_indexes.get(pattern)
+        if index is not None:
+            return index
+
+        index = {}
+        paragraph = 0
+        last_paragraph = len(self.paragraphs) - 1
+        for match in self.word_matches(pattern):
+            # Matches arrive in order, so the paragraph cursor only moves forward
+            while paragraph < last_paragraph and match.start() >= self.paragraphs[paragraph + 1][0]:
+                paragraph += 1
+            index.setdefault(match.group(0), []).append((match.span(), paragraph))
+
+        self._term_indexes[pattern] = index
+        return index
+
+    def nearest_span(self, spans: List[Span], span: Span) -> Optional[Span]:
+        """
+        Return the span closest to the given one, preferring spans in the same
+        paragraph. spans must be sorted by start offset.
+        """
+        if not spans:
+            return None
+
+        position = bisect_right(spans, span)
+        neighbours = spans[max(position - 1, 0):position + 1]
+        paragraph = self.paragraph_index(span[0])
+        same_paragraph = [s for s in neighbours if self.paragraph_index(s[0]) == paragraph]
+
+        def distance(other: Span) -> int:
+            return other[0] - span[1] if other[0] >= span[1] else max(span[0] - other[1], 0)
+
+        return min(same_paragraph or neighbours, key=distance)
+
+    def span_text(self, span: Span) -> str:
+        return self.text[span[0]:span[1]]
+
+    def paragraph_index(self, offset: int) -> int:
+        """
+        Return the index of the paragraph containing the offset.
+        """
+        return max(bisect_right(self._paragraph_starts, offset) - 1, 0)
+
+    def paragraph_text(self, index: int) -> str:
+        return self.span_text(self.paragraphs[index])
+
+    def section_at(self, offset: int) -> Optional[str]:
+        """
+        Return the name of the section the offset falls under, if any.
+        """
+        index = bisect_right([start for _, start in self.sections], offset) - 1
+        return self.sections[index][0] if index >= 0 else None
+
+    def section_names(self) -> Dict[str, int]:
+        """
+        Map each section present in the document to the offset of its first header.
+        """
+        names: Dict[str, int] = {}
+        for name, start in self.sections:
+            names.setdefault(name, start)
+        return names
+
+    def mentions(self, word: str) -> bool:
+        """
+        Case-insensitive substring check against the already lowered text.
+        """
+        return word in self.normalized
+
+
+def as_document(text: Union[str, ResumeDocument]) -> ResumeDocument:
+    """
+    Accept either raw text or an already parsed document.
+    """
+    return text if isinstance(text, ResumeDocument) else ResumeDocument(text)
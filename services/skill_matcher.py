@@ -0,0 +1,205 @@
+# services/skill_matcher.py
+
+from collections import namedtuple
+from itertools import compress, count
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+# skill_id is the taxonomy id when the matcher has one (see services.skill_taxonomy)
+SkillMatch = namedtuple('SkillMatch', ['skill', 'start', 'end', 'skill_id'], defaults=(None,))
+
+# Characters kept inside tokens besides letters and digits, so that
+# "c++" and "c#" survive tokenization as single tokens.
+TOKEN_CHARS = '_+#'
+
+
+class _SeparatorTable(dict):
+    """
+    str.translate table that turns every non-token character into a space.
+    Entries are filled in lazily, so it covers any Unicode punctuation
+    (bullets, dashes, smart quotes) without enumerating it up front.
+    """
+
+    def __missing__(self, codepoint: int) -> int:
+        char = chr(codepoint)
+        value = codepoint if char.isalnum() or char in TOKEN_CHARS else 32
+        self[codepoint] = value
+        return value
+
+
+_SEPARATORS = _SeparatorTable()
+
+
+def normalize_text(text: str) -> str:
+    """
+    Lowercase the text and blank out separators without changing its length,
+    so offsets into the result are offsets into the original text.
+    """
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # A handful of characters (e.g. 'İ') grow when lowercased
+        lowered = ''.join(c if len(c.lower()) != 1 else c.lower() for c in text)
+    return lowered.translate(_SEPARATORS)
+
+
+def _locate(cleaned: str, token: str, cursor: int) -> int:
+    """
+    Find the next occurrence of a whole token at or after cursor.
+    """
+    while True:
+        pos = cleaned.find(token, cursor)
+        end = pos + len(token)
+        if (pos == 0 or cleaned[pos - 1].isspace()) and (end == len(cleaned) or cleaned[end].isspace()):
+            return pos
+        cursor = pos + 1
+
+
+def _normalize_gap(gap: str) -> str:
+    """
+    Collapse the characters between two tokens into a comparable separator.
+    Any run of whitespace becomes a single space; other separators are kept.
+    """
+    stripped = ''.join(gap.split())
+    return stripped if stripped else ' '
+
+
+def surface_path(surface: str) -> List[Any]:
+    """
+    Trie keys for a surface form: its first token, then a (separator, token)
+    pair per following token, so "ui/ux" does not match "ui, ux".
+    """
+    cleaned = normalize_text(surface)
+    tokens = cleaned.split()
+    if not tokens:
+        return []
+
+    path: List[Any] = [tokens[0]]
+    end = _locate(cleaned, tokens[0], 0) + len(tokens[0])
+    for token in tokens[1:]:
+        start = cleaned.find(token, end)
+        path.append((_normalize_gap(surface[end:start]), token))
+        end = start + len(token)
+    return path
+
+
+class SkillMatcher:
+    """
+    Token-level trie over a skill vocabulary.
+
+    A scan lowercases and tokenizes the text with str builtins, checks every
+    token against the trie root with one dict lookup, and only walks the trie
+    from tokens that start a skill. The cost is linear in the length of the
+    resume and independent of the size of the vocabulary. Matches always start
+    and end on token boundaries, which gives the same word-boundary semantics
+    as the old ``\\bskill\\b`` alternation without building one.
+    """
+
+    def __init__(self, vocabulary: Iterable[Tuple[str, ...]]):
+        """
+        Args:
+            vocabulary: (surface form, canonical name) pairs, or
+                (surface form, canonical name, skill id) triples
+        """
+        self._root: Dict[Any, Any] = {}
+        self._ids: Dict[str, str] = {}
+        self._max_tokens = 1
+        self.size = 0
+        for item in vocabulary:
+            self.add(*item)
+
+    def add(self, surface: str, canonical: str, skill_id: Optional[str] = None) -> None:
+        """
+        Add a surface form to the trie, and the skill's id if it has one.
+        """
+        path = surface_path(surface)
+        if not path:
+            return
+        if skill_id is not None:
+            self._ids[canonical] = skill_id
+
+        node = self._root
+        for key in path:
+            node = node.setdefault(key, {})
+        if None not in node:
+            self.size += 1
+        node[None] = canonical
+        self._max_tokens = max(self._max_tokens, len(path))
+
+    def find_all(self, text: str, normalized: Optional[str] = None) -> List[SkillMatch]:
+        """
+        Scan the text in a single pass and return every non-overlapping match,
+        preferring the longest skill at each position. Offsets refer to the
+        original text.
+
+        Args:
+            text: Text to scan
+            normalized: normalize_text(text), if the caller already has it
+        """
+        cleaned = normalized if normalized is not None else normalize_text(text)
+        tokens = cleaned.split()
+        root = self._root
+        ids = self._ids
+        max_tokens = self._max_tokens
+        n = len(tokens)
+        matches = []
+        cursor = 0
+        resume_at = 0
+
+        # Only tokens that start some skill reach the Python loop body
+        for i in compress(count(), map(root.__contains__, tokens)):
+            token = tokens[i]
+            start = cleaned.find(token, cursor)
+            cursor = start + len(token)
+            if (start and not cleaned[start - 1].isspace()) or (cursor < len(cleaned) and not cleaned[cursor].isspace()):
+                # Occurrence inside a longer token; find the standalone one
+                start = _locate(cleaned, token, cursor)
+                cursor = start + len(token)
+            if i < resume_at:
+                continue
+
+            node = root[token]
+            if len(node) == 1 and None in node:
+                # Single-token skill with no longer continuation
+                matches.append(SkillMatch(node[None], start, cursor, ids.get(node[None])))
+                continue
+
+            best = (node[None], cursor, i) if None in node else None
+            j = i
+            end = cursor
+            limit = min(n, i + max_tokens)
+            while j + 1 < limit:
+                # Only whitespace separates consecutive tokens in cleaned
+                next_start = cleaned.find(tokens[j + 1], end)
+                node = node.get((_normalize_gap(text[end:next_start]), tokens[j + 1]))
+                if node is None:
+                    break
+                j += 1
+                end = next_start + len(tokens[j])
+                if None in node:
+                    best = (node[None], end, j)
+
+            if best is not None:
+                skill, end, last = best
+                matches.append(SkillMatch(skill, start, end, ids.get(skill)))
+                resume_at = last + 1
+
+        return matches
+
+    def summarize(self, text: str, normalized: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Group matches by canonical skill name, in order of first appearance.
+
+        Returns:
+            {skill: {'id': taxonomy id or None, 'count': int, 'positions': [(start, end), ...]}}
+        """
+        summary: Dict[str, Dict[str, Any]] = {}
+        for match in self.find_all(text, normalized):
+            entry = summary.setdefault(match.skill, {'id': match.skill_id, 'count': 0, 'positions': []})
+            entry['count'] += 1
+            entry['positions'].append((match.start, match.end))
+        return summary
+
+    def extract(self, text: str, normalized: Optional[str] = None) -> List[str]:
+        """
+        Return the distinct canonical skills in the text, in order of first appearance.
+        """
+        return list(dict.fromkeys(match.skill for match in self.find_all(text, normalized)))
@@ -0,0 +1,363 @@
+# services/skill_taxonomy.py
+#
+# Skill taxonomy loader and compiled index.
+#
+# The taxonomy is a tab separated file (data/skills_taxonomy.tsv) with one
+# skill per line: id, display name, category and "|"-separated synonyms.
+# `build` compiles it into a flat binary index that workers open with mmap,
+# so startup does not depend on the size of the taxonomy and every gunicorn
+# and pool worker on a host shares the same pages from the OS page cache.
+#
+#   python -m services.skill_taxonomy build [taxonomy.tsv] [skills.idx]
+#
+# Index layout (little endian):
+#
+#   header   magic, format version, counts, table offsets, taxonomy sha256
+#   skills   n_skills x (id offset, id length, name offset, name length,
+#            category offset, category length) into the string pool
+#   nodes    n_nodes x (skill number or NO_SKILL, child count); node 0 is the root
+#   slots    open-addressing hash table of trie edges, n_slots x
+#            (parent node, key offset, key length, child node); child 0 = empty
+#   strings  UTF-8 string pool
+#
+# An edge key is the token for edges out of the root and separator + NUL +
+# token for continuation edges, mirroring SkillMatcher's trie keys.
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from collections import namedtuple
+from itertools import compress
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from services.skill_matcher import (
+    SkillMatch, SkillMatcher, _locate, _normalize_gap, normalize_text, surface_path
+)
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+DEFAULT_TAXONOMY_PATH = os.path.join(DATA_DIR, 'skills_taxonomy.tsv')
+DEFAULT_INDEX_PATH = os.path.join(DATA_DIR, 'skills.idx')
+
+MAGIC = b'SKIX'
+FORMAT_VERSION = 1
+NO_SKILL = 0xFFFFFFFF
+HEADER = struct.Struct('<4sIIIIIIII32s')
+SKILL_RECORD = struct.Struct('<IIIIII')
+NODE_RECORD = struct.Struct('<II')
+SLOT_RECORD = struct.Struct('<IIII')
+
+# Tokens already resolved against the root, kept per process
+ROOT_CACHE_SIZE = 65536
+
+SkillEntry = namedtuple('SkillEntry', ['id', 'name', 'category', 'synonyms'])
+
+
+def load_taxonomy(path: str = DEFAULT_TAXONOMY_PATH) -> List[SkillEntry]:
+    """
+    Parse a taxonomy file. Blank lines, "#" comments and the header row are skipped.
+
+    Raises:
+        ValueError: On malformed lines and duplicate ids
+    """
+    entries = []
+    seen = set()
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.rstrip('\r\n')
+            if not line.strip() or line.startswith('#'):
+                continue
+            fields = line.split('\t')
+            if fields[0] == 'id':
+                continue
+            if len(fields) < 2 or len(fields) > 4 or not fields[0] or not fields[1].strip():
+                raise ValueError(f"{path}:{line_number}: expected id, name, category, synonyms")
+            if fields[0] in seen:
+                raise ValueError(f"{path}:{line_number}: duplicate skill id '{fields[0]}'")
+            seen.add(fields[0])
+
+            fields += [''] * (4 - len(fields))
+            synonyms = tuple(s.strip() for s in fields[3].split('|') if s.strip())
+            entries.append(SkillEntry(fields[0], fields[1].strip(), fields[2].strip(), synonyms))
+    return entries
+
+
+def taxonomy_digest(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+def _edge_key(key: Any) -> bytes:
+    if isinstance(key, str):
+        return key.encode('utf-8')
+    gap, token = key
+    return gap.encode('utf-8') + b'\x00' + token.encode('utf-8')
+
+
+def compile_index(entries: List[SkillEntry], path: str, digest: bytes = b'') -> None:
+    """
+    Write the binary index for a taxonomy. The file is written next to its
+    destination and renamed into place, so readers never see a partial index.
+
+    Raises:
+        ValueError: When one surface form is listed under two skills
+    """
+    nodes = [[NO_SKILL, 0]]
+    edges: Dict[Tuple[int, bytes], int] = {}
+    max_tokens = 1
+    for number, entry in enumerate(entries):
+        for surface in (entry.name,) + entry.synonyms:
+            keys = surface_path(surface)
+            if not keys:
+                continue
+            node = 0
+            for key in keys:
+                edge = (node, _edge_key(key))
+                child = edges.get(edge)
+                if child is None:
+                    child = edges[edge] = len(nodes)
+                    nodes.append([NO_SKILL, 0])
+                    nodes[node][1] += 1
+                node = child
+            owner = nodes[node][0]
+            if owner not in (NO_SKILL, number):
+                raise ValueError(f"'{surface}' is listed under both '{entries[owner].id}' and '{entry.id}'")
+            nodes[node][0] = number
+            max_tokens = max(max_tokens, len(keys))
+
+    # Keep the hash table at most half full so probe chains stay short
+    n_slots = 1
+    while n_slots < 2 * len(edges) + 1:
+        n_slots *= 2
+
+    skills_off = HEADER.size
+    nodes_off = skills_off + SKILL_RECORD.size * len(entries)
+    slots_off = nodes_off + NODE_RECORD.size * len(nodes)
+    strings_off = slots_off + SLOT_RECORD.size * n_slots
+
+    strings = bytearray()
+    string_offsets: Dict[bytes, int] = {}
+
+    def intern(value: bytes) -> Tuple[int, int]:
+        offset = string_offsets.get(value)
+        if offset is None:
+            offset = string_offsets[value] = strings_off + len(strings)
+            strings.extend(value)
+        return offset, len(value)
+
+    skills = bytearray()
+    for entry in entries:
+        skills += SKILL_RECORD.pack(
+            *intern(entry.id.encode('utf-8')),
+            *intern(entry.name.encode('utf-8')),
+            *intern(entry.category.encode('utf-8'))
+        )
+
+    slots = bytearray(SLOT_RECORD.size * n_slots)
+    mask = n_slots - 1
+    for (parent, key), child in edges.items():
+        slot = zlib.crc32(key, parent) & mask
+        while SLOT_RECORD.unpack_from(slots, slot * SLOT_RECORD.size)[3]:
+            slot = (slot + 1) & mask
+        SLOT_RECORD.pack_into(slots, slot * SLOT_RECORD.size, parent, *intern(key), child)
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, len(entries), len(nodes), n_slots, max_tokens,
+                         nodes_off, slots_off, strings_off, digest.ljust(32, b'\x00'))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.skills-', suffix='.idx', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header)
+            f.write(skills)
+            for skill, children in nodes:
+                f.write(NODE_RECORD.pack(skill, children))
+            f.write(slots)
+            f.write(strings)
+        # mkstemp creates the file owner-only; workers may run as another user
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    logger.info(f"Compiled {len(entries)} skills, {len(edges)} trie edges into {path}")
+
+
+def build(taxonomy_path: str = DEFAULT_TAXONOMY_PATH, index_path: str = DEFAULT_INDEX_PATH) -> None:
+    compile_index(load_taxonomy(taxonomy_path), index_path, taxonomy_digest(taxonomy_path))
+
+
+class SkillIndex(SkillMatcher):
+    """
+    Read-only SkillMatcher over a compiled, memory-mapped index.
+
+    Scans work like SkillMatcher's: the distinct tokens of a text are
+    resolved against the root once (and remembered), the token stream is
+    filtered at C speed, and only tokens that start a skill walk the trie.
+    Matches carry the taxonomy id of the skill.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.size, self._n_nodes, n_slots, self._max_tokens,
+         self._nodes_off, self._slots_off, _, digest) = HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._buf.close()
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} skill index")
+        self.digest = digest
+        self._mask = n_slots - 1
+        self._root_cache: Dict[str, int] = {}
+
+    def add(self, surface: str, canonical: str, skill_id: Optional[str] = None) -> None:
+        raise TypeError("SkillIndex is read-only; edit the taxonomy and rebuild the index")
+
+    def skill(self, number: int) -> SkillEntry:
+        """
+        Return the taxonomy entry for a skill number (synonyms are not stored).
+        """
+        buf = self._buf
+        id_off, id_len, name_off, name_len, cat_off, cat_len = SKILL_RECORD.unpack_from(
+            buf, HEADER.size + number * SKILL_RECORD.size
+        )
+        return SkillEntry(
+            buf[id_off:id_off + id_len].decode('utf-8'),
+            buf[name_off:name_off + name_len].decode('utf-8'),
+            buf[cat_off:cat_off + cat_len].decode('utf-8'),
+            ()
+        )
+
+    def skills(self) -> Iterator[SkillEntry]:
+        return (self.skill(number) for number in range(self.size))
+
+    def _node(self, node: int) -> Tuple[int, int]:
+        return NODE_RECORD.unpack_from(self._buf, self._nodes_off + node * NODE_RECORD.size)
+
+    def _child(self, parent: int, key: bytes) -> int:
+        buf = self._buf
+        mask = self._mask
+        slot = zlib.crc32(key, parent) & mask
+        while True:
+            slot_parent, key_off, key_len, child = SLOT_RECORD.unpack_from(
+                buf, self._slots_off + slot * SLOT_RECORD.size
+            )
+            if not child:
+                return 0
+            if slot_parent == parent and buf[key_off:key_off + key_len] == key:
+                return child
+            slot = (slot + 1) & mask
+
+    def _roots(self, tokens: List[str]) -> Dict[str, int]:
+        """
+        Map every token of a text to the root child it starts (0 for none).
+        """
+        cache = self._root_cache
+        missing = set(tokens).difference(cache)
+        if len(cache) + len(missing) > ROOT_CACHE_SIZE:
+            # Swap in a fresh dict rather than clearing one a concurrent scan may hold
+            cache = self._root_cache = {}
+            missing = set(tokens)
+        for token in missing:
+            cache[token] = self._child(0, token.encode('utf-8'))
+        return cache
+
+    def _match(self, number: int, start: int, end: int) -> SkillMatch:
+        entry = self.skill(number)
+        return SkillMatch(entry.name, start, end, entry.id)
+
+    def find_all(self, text: str, normalized: Optional[str] = None) -> List[SkillMatch]:
+        cleaned = normalized if normalized is not None else normalize_text(text)
+        tokens = cleaned.split()
+        roots = self._roots(tokens)
+        max_tokens = self._max_tokens
+        n = len(tokens)
+        matches = []
+        cursor = 0
+        resume_at = 0
+
+        for i in compress(range(n), map(roots.__getitem__, tokens)):
+            token = tokens[i]
+            start = cleaned.find(token, cursor)
+            cursor = start + len(token)
+            if (start and not cleaned[start - 1].isspace()) or (cursor < len(cleaned) and not cleaned[cursor].isspace()):
+                start = _locate(cleaned, token, cursor)
+                cursor = start + len(token)
+            if i < resume_at:
+                continue
+
+            node = roots[token]
+            skill, children = self._node(node)
+            if not children:
+                matches.append(self._match(skill, start, cursor))
+                continue
+
+            best = (skill, cursor, i) if skill != NO_SKILL else None
+            j = i
+            end = cursor
+            limit = min(n, i + max_tokens)
+            while children and j + 1 < limit:
+                next_start = cleaned.find(tokens[j + 1], end)
+                node = self._child(node, _edge_key((_normalize_gap(text[end:next_start]), tokens[j + 1])))
+                if not node:
+                    break
+                j += 1
+                end = next_start + len(tokens[j])
+                skill, children = self._node(node)
+                if skill != NO_SKILL:
+                    best = (skill, end, j)
+
+            if best is not None:
+                skill, end, last = best
+                matches.append(self._match(skill, start, end))
+                resume_at = last + 1
+
+        return matches
+
+
+def load_skill_matcher(taxonomy_path: str = DEFAULT_TAXONOMY_PATH,
+                       index_path: str = DEFAULT_INDEX_PATH) -> SkillMatcher:
+    """
+    Open the compiled index for a taxonomy, rebuilding it first when it is
+    missing or was compiled from a different version of the taxonomy file.
+    Falls back to an in-memory SkillMatcher if the index cannot be written.
+    """
+    if not os.path.exists(taxonomy_path):
+        return SkillIndex(index_path)
+
+    digest = taxonomy_digest(taxonomy_path)
+    try:
+        index = SkillIndex(index_path)
+        if index.digest == digest:
+            return index
+    except (OSError, ValueError, struct.error):
+        pass
+
+    entries = load_taxonomy(taxonomy_path)
+    try:
+        compile_index(entries, index_path, digest)
+        return SkillIndex(index_path)
+    except OSError as e:
+        logger.warning(f"Could not write skill index {index_path}, matching in memory: {str(e)}")
+        return SkillMatcher(
+            (surface, entry.name, entry.id) for entry in entries for surface in (entry.name,) + entry.synonyms
+        )
+
+
+def main(argv: List[str]) -> int:
+    if not argv or argv[0] != 'build' or len(argv) > 3:
+        print("usage: python -m services.skill_taxonomy build [taxonomy.tsv] [skills.idx]")
+        return 2
+    build(*argv[1:])
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main(sys.argv[1:]))
@@ -28,7 +28,7 @@ function initializeChatForm() {
     });
 }
 
-// Send a message to the AI
+// Send a message to the AI, showing the answer as it is generated
 function sendMessage(message) {
     if (isProcessing) return;
     
@@ -36,6 +36,87 @@ function sendMessage(message) {
     setProcessingState(true);
     addTypingIndicator();
     
+    if (!window.ReadableStream || !window.TextDecoder) {
+        sendMessageBlocking(message);
+        return;
+    }
+    
+    let messageElement = null;
+    let answer = '';
+    
+    fetch('/api/career-advice/stream', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', 'Accept': 'text/event-stream' },
+        body: JSON.stringify({ message })
+    })
+    .then(response => {
+        if (!response.ok || !response.body) throw new Error('Network response was not ok');
+        return readEventStream(response.body, (event, data) => {
+            if (event === 'token') {
+                if (!messageElement) {
+                    removeTypingIndicator();
+                    messageElement = addMessageToChat('bot', '');
+                }
+                answer += data.text;
+                messageElement.innerHTML = formatMessageWithLinks(answer);
+                scrollChatToBottom();
+            } else if (event === 'done') {
+                answer = data.response || answer;
+                if (messageElement) messageElement.innerHTML = formatMessageWithLinks(answer);
+            }
+        });
+    })
+    .then(() => {
+        removeTypingIndicator();
+        setProcessingState(false);
+        if (!messageElement) {
+            addMessageToChat('bot', answer || "I'm sorry, I couldn't generate a response. Please try again.");
+        } else {
+            messageHistory[messageHistory.length - 1].message = answer;
+        }
+    })
+    .catch(error => {
+        if (!messageElement) {
+            // Streaming unavailable (e.g. a buffering proxy): ask for the whole answer
+            sendMessageBlocking(message);
+            return;
+        }
+        removeTypingIndicator();
+        setProcessingState(false);
+        showToast('Error', error.message);
+    });
+}
+
+// Read a server-sent event stream, calling onEvent(event, data) per event
+function readEventStream(body, onEvent) {
+    const reader = body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    function read() {
+        return reader.read().then(({ done, value }) => {
+            if (done) return;
+            buffer += decoder.decode(value, { stream: true });
+            const events = buffer.split('\n\n');
+            buffer = events.pop();
+            events.forEach(block => {
+                let event = 'message';
+                let data = '';
+                block.split('\n').forEach(line => {
+                    if (line.startsWith('event: ')) event = line.slice(7);
+                    else if (line.startsWith('data: ')) data += line.slice(6);
+                });
+                if (data) onEvent(event, JSON.parse(data));
+            });
+            return read();
+        });
+    }
+    
+    return read();
+}
+
+// Send a message and wait for the whole answer
+function sendMessageBlocking(message) {
     fetch('/api/career-advice', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
@@ -81,6 +162,7 @@ function addMessageToChat(sender, message) {
     
     messageHistory.push({ sender, message });
     scrollChatToBottom();
+    return messageElement;
 }
 
 // Add typing indicator
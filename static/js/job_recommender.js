@@ -189,6 +189,17 @@ function displayJobs(jobs) {
             }
         }
         
+        // Format resume match, present when the search was scored against a resume
+        let matchHtml = '';
+        if (typeof job.match_score === 'number') {
+            const badgeClass = job.match_score >= 70 ? 'bg-success' : job.match_score >= 40 ? 'bg-warning' : 'bg-secondary';
+            matchHtml = `<span class="badge ${badgeClass} me-2">${job.match_score}% match</span>`;
+            if (job.missing_skills && job.missing_skills.length > 0) {
+                matchHtml += `<small class="text-muted">Missing: ${job.missing_skills.slice(0, 5).join(', ')}</small>`;
+            }
+            matchHtml = `<div class="mb-3">${matchHtml}</div>`;
+        }
+        
         jobCard.innerHTML = `
             <div class="card-body">
                 <div class="d-flex justify-content-between align-items-start">
@@ -204,6 +215,7 @@ function displayJobs(jobs) {
                 <div class="mb-3">
                     <i class="bi bi-cash me-1"></i> ${salaryText}
                 </div>
+                ${matchHtml}
                 <p class="card-text job-description">${job.description ? truncateText(job.description, 200) : 'No description available'}</p>
                 <div class="d-flex justify-content-between align-items-center">
                     <small class="text-muted">
@@ -1,7 +1,6 @@
 from flask import Flask
 from flask_cors import CORS
 from models import db
-from services import register_routes
 from dotenv import load_dotenv
 import os
 from firebase_admin import credentials, initialize_app
@@ -31,7 +30,9 @@ def create_app():
     db.init_app(app)
     init_firebase()
 
-    # Register routes from services
+    # Register routes from services. Imported here: the services import
+    # utils submodules, so a module-level import would be circular
+    from services.register_routes import register_routes
     register_routes(app)
 
     return app
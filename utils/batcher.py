@@ -0,0 +1,121 @@
+import threading
+import logging
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class _Batch:
+    __slots__ = ('items', 'full', 'done', 'results', 'error')
+
+    def __init__(self):
+        self.items: List[Any] = []
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.results: Optional[List[Any]] = None
+        self.error: Optional[BaseException] = None
+
+class MicroBatcher:
+    """
+    Collect concurrent calls for up to max_wait seconds, or until max_batch
+    have arrived, and send them upstream as one batched call.
+
+    The caller that opens a batch (the leader) waits out the window and runs
+    send_batch(items), which must return one result per item, in order; each
+    caller gets its own. A batch of one goes through send_one. When the
+    batched call fails or returns the wrong number of results, every caller
+    retries its own item with send_one, in its own thread, so one bad input
+    or a rejected batch costs a retry rather than the answer. There is no
+    background thread, so a batcher survives forking gunicorn workers.
+    """
+
+    def __init__(self, name: str, send_batch: Callable[[List[Any]], Sequence[Any]],
+                 send_one: Callable[[Any], Any], max_batch: int = 8, max_wait: float = 0.005):
+        self.name = name
+        self.send_batch = send_batch
+        self.send_one = send_one
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._open: Optional[_Batch] = None
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.batches = 0
+        self.fallbacks = 0
+        self.sizes: Counter = Counter()
+
+    def submit(self, item: Any) -> Any:
+        """
+        Send item, batched with whatever other callers submit meanwhile.
+
+        Returns:
+            This item's result
+
+        Raises:
+            Whatever send_one raised for this item, after a failed batch
+        """
+        if self.max_batch <= 1:
+            with self._lock:
+                self.calls += 1
+            return self.send_one(item)
+
+        with self._lock:
+            self.calls += 1
+            batch = self._open
+            leader = batch is None
+            if leader:
+                batch = self._open = _Batch()
+            index = len(batch.items)
+            batch.items.append(item)
+            if len(batch.items) >= self.max_batch:
+                self._open = None
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.max_wait)
+            with self._lock:
+                if self._open is batch:
+                    self._open = None
+            self._run(batch)
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            if len(batch.items) == 1:
+                raise batch.error
+            return self.send_one(item)
+        return batch.results[index]
+
+    def _run(self, batch: _Batch) -> None:
+        items = batch.items
+        with self._lock:
+            self.batches += 1
+            self.sizes[len(items)] += 1
+        try:
+            if len(items) == 1:
+                batch.results = [self.send_one(items[0])]
+            else:
+                results = list(self.send_batch(items))
+                if len(results) != len(items):
+                    raise ValueError(f"{len(results)} results for a batch of {len(items)}")
+                batch.results = results
+        except Exception as e:
+            if len(items) > 1:
+                logger.warning(f"{self.name} batch of {len(items)} failed, sending items alone: {str(e)}")
+                with self._lock:
+                    self.fallbacks += 1
+            batch.error = e
+        finally:
+            batch.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'max_batch': self.max_batch,
+                'max_wait_ms': round(self.max_wait * 1000, 2),
+                'calls': self.calls,
+                'batches': self.batches,
+                'mean_batch_size': round(self.calls / self.batches, 2) if self.batches else 0.0,
+                'batch_sizes': {str(size): count for size, count in sorted(self.sizes.items())},
+                'fallbacks': self.fallbacks
+            }
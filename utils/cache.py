@@ -0,0 +1,406 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from utils.singleflight import SingleFlight
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Serialized values at least this long are kept zlib-compressed. Job pages
+# and descriptions shrink 3-5x and decompress in tens of microseconds.
+COMPRESS_MIN_BYTES = 1024
+
+def encode(value: Any) -> Union[str, bytes]:
+    """
+    Serialize a cache value: compact JSON, compressed when it is large.
+    """
+    raw = json.dumps(value, separators=(',', ':'))
+    if len(raw) >= COMPRESS_MIN_BYTES:
+        return zlib.compress(raw.encode('utf-8'), 1)
+    return raw
+
+def decode(raw: Union[str, bytes]) -> Any:
+    if isinstance(raw, bytes):
+        raw = zlib.decompress(raw)
+    return json.loads(raw)
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded in-process cache with least-recently-used eviction
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+class SQLiteCache:
+    """
+    Key/value table in a local SQLite file, shared by every worker process on the host
+    """
+
+    def __init__(self, path: str, table: str, max_entries: int = 10000):
+        self.path = path
+        self.table = table
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        with self._connection() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_updated_at ON {table} (updated_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Union[str, bytes]]:
+        row = self._connection().execute(
+            f"SELECT value FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: Union[str, bytes]) -> None:
+        with self._connection() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, updated_at) VALUES (?, ?, ?)",
+                (key, value, time.time())
+            )
+            self._writes += 1
+            # Trim the oldest rows every so often rather than on every write
+            if self._writes % 100 == 0:
+                conn.execute(
+                    f"DELETE FROM {self.table} WHERE key IN ("
+                    f"SELECT key FROM {self.table} ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+
+    def delete(self, key: str) -> None:
+        with self._connection() as conn:
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._connection() as conn:
+            conn.execute(f"DELETE FROM {self.table}")
+
+class TieredCache:
+    """
+    In-process LRU in front of an optional SQLite tier.
+
+    Values must be JSON serializable. They are stored serialized (compressed
+    when large) and decoded on every hit, so callers always get a private
+    copy they can mutate.
+    """
+
+    def __init__(self, name: str, max_entries: int = 256, db_path: Optional[str] = None,
+                 db_max_entries: int = 10000):
+        self.name = name
+        self.memory = LRUCache(max_entries)
+        self.disk = None
+        if db_path:
+            try:
+                self.disk = SQLiteCache(db_path, name, db_max_entries)
+            except sqlite3.Error as e:
+                logger.warning(f"Disk cache for {name} unavailable, using memory only: {str(e)}")
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.memory.get(key)
+        if raw is not None:
+            self.hits += 1
+            return decode(raw)
+
+        if self.disk is not None:
+            try:
+                raw = self.disk.get(key)
+            except sqlite3.Error as e:
+                logger.warning(f"Disk cache read failed for {self.name}: {str(e)}")
+                raw = None
+            if raw is not None:
+                self.disk_hits += 1
+                self.memory.set(key, raw)
+                return decode(raw)
+
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        raw = encode(value)
+        self.memory.set(key, raw)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, raw)
+            except sqlite3.Error as e:
+                logger.warning(f"Disk cache write failed for {self.name}: {str(e)}")
+
+    def delete(self, key: str) -> None:
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            'name': self.name,
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_ratio': round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            'entries': len(self.memory),
+            'max_entries': self.memory.max_entries,
+            'evictions': self.memory.evictions,
+            'disk_enabled': self.disk is not None
+        }
+
+class SWRCache:
+    """
+    TTL cache with stale-while-revalidate, stored in a TieredCache.
+
+    Entries younger than ttl are served as is. Entries up to stale_ttl past
+    that are still served, and one background refresh per key replaces them.
+    Anything older is reloaded inline. With a db_path, entries written by one
+    worker are served by the others; refreshes are deduplicated per process.
+    With a SingleFlight, concurrent misses for one key share a single load.
+    """
+
+    def __init__(self, name: str, ttl: float, stale_ttl: float = 0, max_entries: int = 256,
+                 db_path: Optional[str] = None, db_max_entries: int = 10000,
+                 flight: Optional[SingleFlight] = None):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.store = TieredCache(name, max_entries=max_entries, db_path=db_path, db_max_entries=db_max_entries)
+        self.flight = flight
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.loads = 0
+        # Loads made to answer a miss, not background refreshes or warming
+        self.miss_loads = 0
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    def get_or_load(self, key: str, loader: Callable[[], Any],
+                    cacheable: Optional[Callable[[Any], bool]] = None,
+                    refresh_loader: Optional[Callable[[], Any]] = None) -> Any:
+        """
+        Return the cached value for key, calling loader() when there is none.
+
+        Args:
+            key: Cache key
+            loader: Produces the value; must be safe to call from another thread
+            cacheable: Predicate deciding whether a loaded value is stored (e.g. not an error)
+            refresh_loader: Used instead of loader for background refreshes,
+                e.g. to draw on a lower-priority upstream quota
+        """
+        entry = self.store.get(key)
+        if entry is not None:
+            age = time.time() - entry['stored_at']
+            if age < self.ttl:
+                self.fresh_hits += 1
+                return entry['value']
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._refresh_in_background(key, refresh_loader or loader, cacheable)
+                return entry['value']
+
+        self.misses += 1
+        if self.flight is None:
+            value = self._load(loader, miss=True)
+            self._store(key, value, cacheable)
+            return value
+
+        # Waiters share one result; each decodes its own copy so callers can
+        # still mutate what they get back
+        raw, _ = self.flight.do(key, lambda: json.dumps(self._load_once(key, loader, cacheable, miss=True)))
+        return json.loads(raw)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Return the value for key if it is younger than ttl, else None. For
+        callers that load misses themselves, e.g. in bulk with load_many.
+        """
+        entry = self.store.get(key)
+        if entry is not None and time.time() - entry['stored_at'] < self.ttl:
+            self.fresh_hits += 1
+            return entry['value']
+        self.misses += 1
+        return None
+
+    def get_stale(self, key: str) -> Optional[Any]:
+        """
+        Return the value for key however old it is, while the store still
+        holds it. For answering anyway when a reload fails.
+        """
+        entry = self.store.get(key)
+        return entry['value'] if entry is not None else None
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store a value obtained some other way, e.g. as part of a larger response.
+        """
+        self._store(key, value, None)
+
+    def load_many(self, keys: List[str], loader: Callable[[List[str]], Dict[str, Any]],
+                  cacheable: Optional[Callable[[Any], bool]] = None) -> Dict[str, Any]:
+        """
+        Load several keys with one loader call (counted as one upstream call)
+        and store each cacheable value.
+
+        Args:
+            keys: Keys to load
+            loader: Takes the keys and returns {key: value} for those it found
+            cacheable: Predicate deciding whether a loaded value is stored
+
+        Returns:
+            What loader returned
+        """
+        values = self._load(lambda: loader(keys), miss=True)
+        for key, value in values.items():
+            self._store(key, value, cacheable)
+        return values
+
+    def is_fresh(self, key: str) -> bool:
+        """
+        True if key has an entry younger than ttl. Not counted as a lookup.
+        """
+        entry = self.store.get(key)
+        return entry is not None and time.time() - entry['stored_at'] < self.ttl
+
+    def warm(self, key: str, loader: Callable[[], Any],
+             cacheable: Optional[Callable[[Any], bool]] = None) -> None:
+        """
+        Load key into the cache unless it is already fresh, without counting
+        a lookup. Goes through the SingleFlight like a miss would.
+        """
+        if self.flight is None:
+            self._load_once(key, loader, cacheable)
+        else:
+            self.flight.do(key, lambda: json.dumps(self._load_once(key, loader, cacheable)))
+
+    def _load(self, loader: Callable[[], Any], miss: bool = False) -> Any:
+        self.loads += 1
+        if miss:
+            self.miss_loads += 1
+        return loader()
+
+    def _load_once(self, key: str, loader: Callable[[], Any],
+                   cacheable: Optional[Callable[[Any], bool]], miss: bool = False) -> Any:
+        # A leader in another process may have filled the shared tier while
+        # this one waited for the lock file
+        entry = self.store.get(key)
+        if entry is not None and time.time() - entry['stored_at'] < self.ttl:
+            return entry['value']
+        value = self._load(loader, miss)
+        self._store(key, value, cacheable)
+        return value
+
+    def _store(self, key: str, value: Any, cacheable: Optional[Callable[[Any], bool]]) -> bool:
+        if cacheable is not None and not cacheable(value):
+            return False
+        self.store.set(key, {'stored_at': time.time(), 'value': value})
+        return True
+
+    def _refresh_in_background(self, key: str, loader: Callable[[], Any],
+                               cacheable: Optional[Callable[[Any], bool]]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            self.refreshes += 1
+
+        def refresh():
+            try:
+                if not self._store(key, self._load(loader), cacheable):
+                    self.refresh_failures += 1
+            except Exception:
+                logger.exception(f"Background refresh failed for {self.name}")
+                self.refresh_failures += 1
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name=f"{self.name}-refresh", daemon=True).start()
+
+    def delete(self, key: str) -> None:
+        self.store.delete(key)
+
+    def clear(self) -> None:
+        self.store.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        served = self.fresh_hits + self.stale_hits + self.misses
+        store = self.store.stats()
+        stats = {
+            'name': self.name,
+            'ttl': self.ttl,
+            'stale_ttl': self.stale_ttl,
+            'fresh_hits': self.fresh_hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'hit_ratio': round((self.fresh_hits + self.stale_hits) / served, 4) if served else 0.0,
+            'refreshes': self.refreshes,
+            'refresh_failures': self.refresh_failures,
+            'refreshing': len(self._refreshing),
+            'upstream_calls': self.loads,
+            # Lookups answered without their own call upstream; refreshes and
+            # warming are upstream calls no lookup waited for, so not counted
+            'upstream_calls_saved': served - self.miss_loads,
+            'entries': store['entries'],
+            'max_entries': store['max_entries'],
+            'evictions': store['evictions'],
+            'disk_enabled': store['disk_enabled']
+        }
+        if self.flight is not None:
+            stats['coalescing'] = self.flight.stats()
+        return stats
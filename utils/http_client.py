@@ -0,0 +1,131 @@
+import os
+import random
+import threading
+import time
+import logging
+from typing import Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Outbound HTTP settings shared by every upstream (JSearch, Hugging Face)
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", 3.05))
+HTTP_READ_TIMEOUT = float(os.environ.get("HTTP_READ_TIMEOUT", 15))
+HTTP_POOL_HOSTS = int(os.environ.get("HTTP_POOL_HOSTS", 10))
+HTTP_POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", 20))
+HTTP_MAX_RETRIES = int(os.environ.get("HTTP_MAX_RETRIES", 2))
+HTTP_BACKOFF_BASE = float(os.environ.get("HTTP_BACKOFF_BASE", 0.25))
+HTTP_BACKOFF_MAX = float(os.environ.get("HTTP_BACKOFF_MAX", 4))
+
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'))
+
+Timeout = Union[float, Tuple[float, float]]
+
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+_session_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """
+    Return this process's keep-alive session, creating it on first use.
+
+    Connections are pooled per host, so repeated calls to the same upstream
+    reuse an open TCP/TLS connection instead of handshaking every time. Like
+    the process pool, the session is tied to the pid that created it, since
+    sockets must not be shared with forked gunicorn workers.
+
+    Returns:
+        Shared requests.Session
+    """
+    global _session, _session_pid
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            session = requests.Session()
+            # Retries are handled in request() so they can be jittered
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_SIZE, max_retries=0)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+            _session_pid = os.getpid()
+        return _session
+
+def backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """
+    Seconds to wait before retry number `attempt` (1-based): full jitter over
+    an exponential window, or the server's Retry-After when it sends one.
+    """
+    if retry_after:
+        try:
+            return min(float(retry_after), HTTP_BACKOFF_MAX)
+        except ValueError:
+            pass
+    return random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * 2 ** attempt))
+
+def request(method: str, url: str, timeout: Optional[Timeout] = None, retries: Optional[int] = None,
+            idempotent: Optional[bool] = None, **kwargs) -> requests.Response:
+    """
+    Send a request through the shared session with connect/read timeouts and
+    jittered retries.
+
+    Calls that may have reached the upstream are only retried when they are
+    idempotent (by default: every method except POST and PATCH). Connect
+    timeouts are always retried, since nothing was sent.
+
+    Args:
+        method: HTTP method
+        url: Request URL
+        timeout: Read timeout or (connect, read); defaults to HTTP_CONNECT_TIMEOUT/HTTP_READ_TIMEOUT
+        retries: Maximum retries; defaults to HTTP_MAX_RETRIES
+        idempotent: Override the method-based idempotency check
+        **kwargs: Passed to requests.Session.request
+
+    Returns:
+        The final response. Retryable error statuses are returned once retries
+        run out, so callers keep using raise_for_status.
+
+    Raises:
+        requests.exceptions.RequestException: When the last attempt fails to get a response
+    """
+    method = method.upper()
+    if timeout is None:
+        timeout = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+    elif not isinstance(timeout, tuple):
+        timeout = (HTTP_CONNECT_TIMEOUT, timeout)
+    if retries is None:
+        retries = HTTP_MAX_RETRIES
+    if idempotent is None:
+        idempotent = method in IDEMPOTENT_METHODS
+
+    session = get_session()
+    attempt = 0
+    while True:
+        try:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+        except requests.exceptions.ConnectTimeout:
+            if attempt >= retries:
+                raise
+            retry_after = None
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if not idempotent or attempt >= retries:
+                raise
+            retry_after = None
+        else:
+            if response.status_code not in RETRY_STATUSES or not idempotent or attempt >= retries:
+                return response
+            retry_after = response.headers.get('Retry-After')
+            response.close()
+
+        attempt += 1
+        delay = backoff_delay(attempt, retry_after)
+        logger.warning(f"Retrying {method} {url.split('?')[0]} in {delay:.2f}s (attempt {attempt} of {retries})")
+        time.sleep(delay)
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request('GET', url, **kwargs)
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request('POST', url, **kwargs)
@@ -0,0 +1,140 @@
+import os
+import time
+import threading
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional
+
+from utils.cache import LRUCache, SWRCache
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class Prefetcher:
+    """
+    Warms an SWRCache in the background with results a user is likely to ask
+    for next (e.g. the next page of a search).
+
+    Prefetches are capped per user and globally per rolling minute, and by
+    the number of prefetches in flight, since every one costs an upstream
+    call. Keys that were prefetched are remembered, so a later lookup of one
+    counts as a prefetch hit and the hit rate shows whether the budget pays off.
+    """
+
+    def __init__(self, cache: SWRCache, enabled: bool = False, workers: int = 2,
+                 per_minute: int = 30, user_per_minute: int = 5, max_tracked: int = 4096):
+        self.cache = cache
+        self.enabled = enabled
+        self.workers = workers
+        self.per_minute = per_minute
+        self.user_per_minute = user_per_minute
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._recent: Deque[float] = deque()
+        self._user_recent = LRUCache(max_tracked)
+        # Prefetched keys not looked up yet -> time they were scheduled
+        self._pending = LRUCache(max_tracked)
+        self.scheduled = 0
+        self.hits = 0
+        self.failures = 0
+        self.skipped_cached = 0
+        self.skipped_budget = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Threads do not survive a fork, so build the pool in the process that uses it
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='prefetch')
+            self._executor_pid = os.getpid()
+            self._in_flight = 0
+        return self._executor
+
+    def _take_budget(self, user_key: str) -> bool:
+        """
+        Record a prefetch against the global and per-user windows if both allow it.
+        """
+        now = time.monotonic()
+        cutoff = now - 60
+        while self._recent and self._recent[0] < cutoff:
+            self._recent.popleft()
+
+        user_recent = self._user_recent.get(user_key)
+        if user_recent is None:
+            user_recent = deque()
+            self._user_recent.set(user_key, user_recent)
+        while user_recent and user_recent[0] < cutoff:
+            user_recent.popleft()
+
+        if (len(self._recent) >= self.per_minute or len(user_recent) >= self.user_per_minute
+                or self._in_flight >= 2 * self.workers):
+            return False
+        self._recent.append(now)
+        user_recent.append(now)
+        return True
+
+    def schedule(self, key: str, loader: Callable[[], Any], user_key: str,
+                 cacheable: Optional[Callable[[Any], bool]] = None) -> bool:
+        """
+        Load key into the cache in the background, budget permitting.
+
+        Returns:
+            True if a prefetch was started
+        """
+        if not self.enabled:
+            return False
+        if self.cache.is_fresh(key):
+            self.skipped_cached += 1
+            return False
+
+        with self._lock:
+            if self._pending.get(key) is not None:
+                return False
+            if not self._take_budget(user_key):
+                self.skipped_budget += 1
+                return False
+            executor = self._get_executor()
+            self._in_flight += 1
+            self._pending.set(key, time.time())
+            self.scheduled += 1
+
+        def run():
+            try:
+                self.cache.warm(key, loader, cacheable)
+                stored = self.cache.is_fresh(key)
+            except Exception:
+                logger.exception(f"Prefetch failed for {self.cache.name}")
+                stored = False
+            if not stored:
+                # Errors are not cached, so a later lookup is not a hit
+                self.failures += 1
+                self._pending.delete(key)
+            with self._lock:
+                self._in_flight -= 1
+
+        executor.submit(run)
+        return True
+
+    def record_lookup(self, key: str) -> None:
+        """
+        Note that a caller asked for key; counts a hit if it was prefetched.
+        """
+        with self._lock:
+            if self._pending.get(key) is not None:
+                self._pending.delete(key)
+                self.hits += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'enabled': self.enabled,
+            'scheduled': self.scheduled,
+            'hits': self.hits,
+            'hit_rate': round(self.hits / self.scheduled, 4) if self.scheduled else 0.0,
+            'failures': self.failures,
+            'in_flight': self._in_flight,
+            'skipped_cached': self.skipped_cached,
+            'skipped_budget': self.skipped_budget,
+            'per_minute': self.per_minute,
+            'user_per_minute': self.user_per_minute
+        }
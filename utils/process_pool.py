@@ -0,0 +1,82 @@
+import os
+import threading
+import logging
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Work is split into lanes, each with its own pool, so a large batch
+# analysis never queues in front of a single interactive upload
+BATCH_LANE = 'batch'
+INTERACTIVE_LANE = 'interactive'
+
+# lane -> (pool, pid that created it)
+_pools: Dict[str, Tuple[ProcessPoolExecutor, int]] = {}
+_pool_lock = threading.Lock()
+
+# Set inside pool processes so work running there never fans out again
+_in_worker = False
+
+def _mark_worker():
+    global _in_worker
+    _in_worker = True
+
+def in_pool_worker() -> bool:
+    """
+    True when called from inside one of the pool's worker processes
+    """
+    return _in_worker
+
+def get_worker_count(lane: str = BATCH_LANE) -> int:
+    """
+    Processes in a lane's pool: PROCESS_POOL_WORKERS (default one per CPU) for
+    batch work, PROCESS_POOL_INTERACTIVE_WORKERS (default up to 4) for uploads.
+    """
+    cpus = os.cpu_count() or 2
+    if lane == INTERACTIVE_LANE:
+        return int(os.environ.get("PROCESS_POOL_INTERACTIVE_WORKERS", min(cpus, 4)))
+    return int(os.environ.get("PROCESS_POOL_WORKERS", os.environ.get("BATCH_ANALYZER_WORKERS", cpus)))
+
+def get_process_pool(lane: str = BATCH_LANE) -> ProcessPoolExecutor:
+    """
+    Return a lane's CPU-bound work pool for this web worker, creating it on first use.
+
+    Gunicorn forks workers after the app is imported, so the pool is tied to the
+    pid that created it and rebuilt if a forked child asks for it. A pool that
+    broke because one of its processes died (crash, OOM kill) is replaced too;
+    otherwise every later submit would raise BrokenProcessPool.
+
+    Args:
+        lane: BATCH_LANE or INTERACTIVE_LANE
+
+    Returns:
+        Shared ProcessPoolExecutor
+    """
+    with _pool_lock:
+        pool, pid = _pools.get(lane, (None, None))
+        if pool is not None and pid == os.getpid() and getattr(pool, '_broken', False):
+            logger.warning(f"Process pool '{lane}' is broken (a worker process died); starting a new one")
+            pool.shutdown(wait=False, cancel_futures=True)
+            pool = None
+        if pool is None or pid != os.getpid():
+            workers = get_worker_count(lane)
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_mark_worker)
+            _pools[lane] = (pool, os.getpid())
+            logger.info(f"Process pool '{lane}' started with {workers} workers")
+        return pool
+
+def submit(fn: Callable[..., Any], *args, lane: str = BATCH_LANE, **kwargs) -> Future:
+    """
+    Submit fn to a lane's process pool, replacing the pool and retrying once
+    if it broke since get_process_pool returned it.
+
+    Returns:
+        The task's Future
+    """
+    try:
+        return get_process_pool(lane).submit(fn, *args, **kwargs)
+    except BrokenProcessPool:
+        return get_process_pool(lane).submit(fn, *args, **kwargs)
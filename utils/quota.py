@@ -0,0 +1,194 @@
+import math
+import time
+import sqlite3
+import threading
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Priority classes, most important first
+INTERACTIVE = 'interactive'
+BATCH = 'batch'
+PREFETCH = 'prefetch'
+
+# How long a call may queue for tokens before it is shed, in seconds
+DEFAULT_MAX_WAIT = {INTERACTIVE: 2.0, BATCH: 5.0, PREFETCH: 0.0}
+# Share of each bucket's capacity a class must leave for the classes above it
+DEFAULT_RESERVE = {INTERACTIVE: 0.0, BATCH: 0.1, PREFETCH: 0.25}
+
+class QuotaExceeded(Exception):
+    """
+    Raised when a call cannot get tokens before its deadline
+    """
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class QuotaScheduler:
+    """
+    Token buckets in front of a rate-limited API.
+
+    Each bucket holds up to capacity tokens and refills at rate tokens per
+    second; a call needs a token from every bucket, e.g. one bucket for the
+    per-second limit and one for the daily quota. Lower priority classes must
+    leave a reserve in each bucket and queue for less time, so prefetches and
+    batch jobs are shed first. With db_path the bucket levels live in SQLite
+    and every worker process on the host draws from the same budget.
+    """
+
+    def __init__(self, name: str, buckets: List[Tuple[str, float, float]], db_path: Optional[str] = None,
+                 max_wait: Optional[Dict[str, float]] = None, reserve: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            name: Prefix for the bucket rows, so schedulers can share a file
+            buckets: (bucket name, refill rate per second, capacity) for each limit
+            db_path: SQLite file for levels shared between processes; memory only when None
+            max_wait: Seconds each priority class may queue
+            reserve: Fraction of capacity each priority class must leave untouched
+        """
+        self.name = name
+        self.buckets = [(f"{name}:{bucket}", rate, capacity) for bucket, rate, capacity in buckets]
+        self.db_path = db_path
+        self.max_wait = dict(DEFAULT_MAX_WAIT, **(max_wait or {}))
+        self.reserve = dict(DEFAULT_RESERVE, **(reserve or {}))
+        self._levels: Dict[str, Tuple[float, float]] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.granted: Dict[str, int] = {}
+        self.shed: Dict[str, int] = {}
+        self.waited = 0.0
+        if db_path:
+            try:
+                with self._connection() as conn:
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS quota_buckets "
+                        "(name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Shared quota for {name} unavailable, limiting per process: {str(e)}")
+                self.db_path = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit, so the transaction can be opened with BEGIN IMMEDIATE
+            conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _take(self, levels: Dict[str, Tuple[float, float]], priority: str, cost: float,
+              now: float) -> Tuple[float, Dict[str, Tuple[float, float]]]:
+        """
+        Refill the buckets to now and take cost from each if all can spare it.
+
+        Returns:
+            (seconds to wait before retrying, 0 when taken; new levels to store)
+        """
+        reserve = self.reserve.get(priority, 0.0)
+        refilled = {}
+        wait = 0.0
+        for name, rate, capacity in self.buckets:
+            tokens, updated_at = levels.get(name, (capacity, now))
+            tokens = min(capacity, tokens + max(now - updated_at, 0.0) * rate)
+            refilled[name] = (tokens, now)
+            needed = cost + reserve * capacity
+            if tokens < needed:
+                wait = max(wait, (needed - tokens) / rate if rate > 0 else math.inf)
+        if wait > 0:
+            return wait, refilled
+        return 0.0, {name: (tokens - cost, at) for name, (tokens, at) in refilled.items()}
+
+    def _try_acquire(self, priority: str, cost: float) -> float:
+        now = time.time()
+        if not self.buckets:
+            return 0.0
+        if not self.db_path:
+            with self._lock:
+                wait, self._levels = self._take(self._levels, priority, cost, now)
+            return wait
+
+        conn = self._connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                names = [name for name, _, _ in self.buckets]
+                rows = conn.execute(
+                    f"SELECT name, tokens, updated_at FROM quota_buckets WHERE name IN ({', '.join('?' * len(names))})",
+                    names
+                ).fetchall()
+                wait, levels = self._take({name: (tokens, at) for name, tokens, at in rows}, priority, cost, now)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO quota_buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                    [(name, tokens, at) for name, (tokens, at) in levels.items()]
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            # Fail open: a broken quota file must not take search down
+            logger.warning(f"Quota store for {self.name} failed, allowing call: {str(e)}")
+            return 0.0
+        return wait
+
+    def acquire(self, priority: str = INTERACTIVE, cost: float = 1.0, max_wait: Optional[float] = None) -> None:
+        """
+        Take cost tokens from every bucket, queueing up to the priority class's
+        max wait if the budget is short.
+
+        Raises:
+            QuotaExceeded: When the tokens will not be there before the deadline
+        """
+        max_wait = self.max_wait.get(priority, 0.0) if max_wait is None else max_wait
+        deadline = time.monotonic() + max_wait
+        started = time.monotonic()
+        while True:
+            wait = self._try_acquire(priority, cost)
+            if wait == 0:
+                self.granted[priority] = self.granted.get(priority, 0) + 1
+                self.waited += time.monotonic() - started
+                return
+            if time.monotonic() + wait > deadline:
+                self.shed[priority] = self.shed.get(priority, 0) + 1
+                # A bucket that never refills reports a day rather than infinity
+                raise QuotaExceeded(f"{self.name} quota exhausted for {priority} calls", retry_after=min(wait, 86400))
+            # Other callers may take the tokens first; re-check after the wait
+            time.sleep(wait)
+
+    def levels(self) -> Dict[str, float]:
+        """
+        Tokens currently in each bucket, without taking any.
+        """
+        now = time.time()
+        if self.db_path:
+            try:
+                rows = self._connection().execute(
+                    "SELECT name, tokens, updated_at FROM quota_buckets WHERE name LIKE ?", (f"{self.name}:%",)
+                ).fetchall()
+            except sqlite3.Error:
+                rows = []
+            stored = {name: (tokens, at) for name, tokens, at in rows}
+        else:
+            stored = dict(self._levels)
+        levels = {}
+        for name, rate, capacity in self.buckets:
+            tokens, updated_at = stored.get(name, (capacity, now))
+            levels[name.split(':', 1)[1]] = round(min(capacity, tokens + max(now - updated_at, 0.0) * rate), 2)
+        return levels
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'levels': self.levels(),
+            'capacity': {name.split(':', 1)[1]: capacity for name, _, capacity in self.buckets},
+            'granted': dict(self.granted),
+            'shed': dict(self.shed),
+            'wait_seconds': round(self.waited, 3),
+            'shared': self.db_path is not None
+        }
@@ -0,0 +1,153 @@
+import os
+import time
+import zlib
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: thread-level coalescing only
+    fcntl = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Keys hash onto a fixed set of lock files so the directory never grows
+LOCK_STRIPES = 64
+
+class TooManyWaiters(Exception):
+    """
+    Raised instead of queueing behind a call that already has max_waiters waiting
+    """
+
+class _Call:
+    __slots__ = ('done', 'value', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    Collapse concurrent calls with the same key into one.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it runs wait for it and get the same value, or the same
+    exception. With lock_dir set, leaders in different processes on the host
+    also serialize on a lock file, so the function should first check a
+    shared store (e.g. the SQLite cache tier) that an earlier process filled.
+    """
+
+    def __init__(self, name: str, max_waiters: int = 100, lock_dir: Optional[str] = None,
+                 wait_timeout: Optional[float] = None, lock_timeout: float = 30):
+        self.name = name
+        self.max_waiters = max_waiters
+        self.wait_timeout = wait_timeout
+        self.lock_timeout = lock_timeout
+        self.lock_dir = lock_dir if fcntl is not None else None
+        if lock_dir and fcntl is None:
+            logger.warning(f"File locks unavailable on this platform; {name} coalesces within a process only")
+        if self.lock_dir:
+            os.makedirs(self.lock_dir, exist_ok=True)
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.shared = 0
+        self.rejected = 0
+        self.failures = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn once for all concurrent callers with this key.
+
+        Returns:
+            (value, shared) where shared is True when another caller ran fn
+
+        Raises:
+            TooManyWaiters: When max_waiters callers are already waiting on the key
+            TimeoutError: When wait_timeout passes before the leader finishes
+            Whatever fn raised, in the leader and in every waiter
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+            elif call.waiters >= self.max_waiters:
+                self.rejected += 1
+                raise TooManyWaiters(f"{self.max_waiters} callers already waiting on {self.name}")
+            else:
+                call.waiters += 1
+                leader = False
+
+        if not leader:
+            if not call.done.wait(self.wait_timeout):
+                raise TimeoutError(f"Timed out waiting for in-flight {self.name} call")
+            self.shared += 1
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        self.leaders += 1
+        try:
+            with self._process_lock(key):
+                call.value = fn()
+            return call.value, False
+        except BaseException as e:
+            call.error = e
+            self.failures += 1
+            raise
+        finally:
+            # Unregister before waking waiters so late arrivals start a new call
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    @contextmanager
+    def _process_lock(self, key: str) -> Iterator[None]:
+        """
+        Hold the key's lock file while the leader runs. If another process
+        keeps it past lock_timeout, go ahead without it rather than stall.
+        """
+        if not self.lock_dir:
+            yield
+            return
+
+        stripe = zlib.crc32(key.encode('utf-8')) % LOCK_STRIPES
+        path = os.path.join(self.lock_dir, f"{self.name}-{stripe}.lock")
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        locked = False
+        try:
+            deadline = time.monotonic() + self.lock_timeout
+            delay = 0.005
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    locked = True
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        logger.warning(f"Lock file {path} held past {self.lock_timeout}s; continuing without it")
+                        break
+                    time.sleep(delay)
+                    delay = min(delay * 2, 0.1)
+            yield
+        finally:
+            if locked:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'leaders': self.leaders,
+            'shared': self.shared,
+            'rejected': self.rejected,
+            'failures': self.failures,
+            'in_flight': len(self._calls),
+            'max_waiters': self.max_waiters,
+            'cross_process': self.lock_dir is not None
+        }
@@ -1,14 +1,46 @@
 import os
 import io
+import time
 import logging
+from collections import namedtuple
+from concurrent.futures import TimeoutError as FutureTimeoutError, wait
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import IO, List, Optional, Tuple
 import PyPDF2
 from werkzeug.datastructures import FileStorage
 import docx
+from utils.process_pool import INTERACTIVE_LANE, get_worker_count, in_pool_worker, submit
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# WordprocessingML tags read by the streaming DOCX extractor
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+W_BODY = W_NS + 'body'
+W_P = W_NS + 'p'
+W_T = W_NS + 't'
+W_TAB = W_NS + 'tab'
+W_TABS = W_NS + 'tabs'
+W_BR = W_NS + 'br'
+W_CR = W_NS + 'cr'
+W_TBL = W_NS + 'tbl'
+W_TR = W_NS + 'tr'
+W_TC = W_NS + 'tc'
+W_SDT = W_NS + 'sdt'
+
+ExtractionResult = namedtuple('ExtractionResult', ['text', 'truncated', 'reason'])
+
+# Resource limits for PDF extraction. When one is hit the text extracted so far
+# is returned with truncated=True and the limit's name as the reason.
+PDF_MAX_PAGES = int(os.environ.get("PDF_MAX_PAGES", 100))
+PDF_MAX_BYTES = int(os.environ.get("PDF_MAX_BYTES", 20 * 1024 * 1024))
+PDF_TIME_BUDGET = float(os.environ.get("PDF_TIME_BUDGET", 15))
+# Documents with at least this many pages are split across the process pool
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("PDF_PARALLEL_MIN_PAGES", 16))
+PDF_MIN_PAGES_PER_CHUNK = 4
+
 def extract_text_from_file(file: FileStorage) -> str:
     """
     Extract text from uploaded resume file (PDF or DOC/DOCX)
@@ -19,21 +51,55 @@ def extract_text_from_file(file: FileStorage) -> str:
     Returns:
         Extracted text content as string
     """
+    return extract_document(file).text
+
+def extract_document(file: FileStorage) -> ExtractionResult:
+    """
+    Extract text from uploaded resume file (PDF or DOC/DOCX), reporting whether
+    a resource limit cut the extraction short
+    
+    Args:
+        file: Uploaded file object
+        
+    Returns:
+        ExtractionResult of (text, truncated, reason)
+    """
     filename = file.filename
     file_extension = os.path.splitext(filename)[1].lower()
     
     try:
         # Process based on file extension
         if file_extension == '.pdf':
-            return extract_text_from_pdf(file)
+            data = file.read()
+            file.seek(0)
+            return extract_pdf(data)
         elif file_extension in ['.doc', '.docx']:
-            return extract_text_from_docx(file)
+            return ExtractionResult(extract_text_from_docx(file), False, None)
         else:
             logger.error(f"Unsupported file format: {file_extension}")
-            return ""
+            return ExtractionResult("", False, None)
     except Exception as e:
         logger.exception(f"Error extracting text from file: {str(e)}")
-        return ""
+        return ExtractionResult("", False, None)
+
+def extract_text_from_bytes(filename: str, data: bytes) -> str:
+    """
+    Extract text from resume file contents that were already read into memory
+    
+    Args:
+        filename: Original file name, used to pick the format
+        data: Raw file contents
+        
+    Returns:
+        Extracted text content as string
+    """
+    return extract_document_from_bytes(filename, data).text
+
+def extract_document_from_bytes(filename: str, data: bytes) -> ExtractionResult:
+    """
+    Same as extract_document, for file contents already read into memory
+    """
+    return extract_document(FileStorage(stream=io.BytesIO(data), filename=filename))
 
 def extract_text_from_pdf(file: FileStorage) -> str:
     """
@@ -45,68 +111,269 @@ def extract_text_from_pdf(file: FileStorage) -> str:
     Returns:
         Extracted text content
     """
-    text = ""
-    
     try:
-        # Create a file-like object from the file data
-        file_stream = io.BytesIO(file.read())
+        data = file.read()
         
-        # Reset file pointer to beginning for PyPDF2
+        # Reset file pointer to beginning for other readers
         file.seek(0)
         
-        # Open the PDF file
-        pdf_reader = PyPDF2.PdfReader(file_stream)
-        
-        # Extract text from each page
-        for page_num in range(len(pdf_reader.pages)):
-            page = pdf_reader.pages[page_num]
-            text += page.extract_text() + "\n"
-            
-        return text
+        return extract_pdf(data).text
         
     except Exception as e:
         logger.exception(f"Error extracting text from PDF: {str(e)}")
         return ""
 
+def extract_pdf(data: bytes, max_pages: Optional[int] = None, max_bytes: Optional[int] = None,
+                time_budget: Optional[float] = None) -> ExtractionResult:
+    """
+    Extract text from PDF bytes within page, size and time limits
+    
+    Args:
+        data: Raw PDF contents
+        max_pages: Pages past this are ignored (default PDF_MAX_PAGES)
+        max_bytes: Larger files are not parsed at all (default PDF_MAX_BYTES)
+        time_budget: Seconds allowed for the whole document (default PDF_TIME_BUDGET)
+        
+    Returns:
+        ExtractionResult of (text, truncated, reason)
+    """
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    max_bytes = PDF_MAX_BYTES if max_bytes is None else max_bytes
+    time_budget = PDF_TIME_BUDGET if time_budget is None else time_budget
+
+    if len(data) > max_bytes:
+        logger.warning(f"PDF of {len(data)} bytes exceeds the {max_bytes} byte limit")
+        return ExtractionResult("", True, 'max_bytes')
+
+    # Wall-clock deadline so pool processes can check it too
+    deadline = time.time() + time_budget
+    if in_pool_worker():
+        pages, page_count, complete = _extract_pdf_pages(data, max_pages, deadline)
+    else:
+        # Parsing, and extracting a short document, run in the pool as well: a
+        # slow xref or a pathological page can take longer than the budget, and
+        # the deadline is only checked between pages. The interactive lane has
+        # its own processes, so batch analyses never queue in front of this.
+        future = submit(_extract_pdf_pages, data, max_pages, deadline, PDF_PARALLEL_MIN_PAGES,
+                        lane=INTERACTIVE_LANE)
+        try:
+            pages, page_count, complete = future.result(timeout=max(deadline - time.time(), 0))
+        except FutureTimeoutError:
+            future.cancel()
+            logger.warning("PDF extraction truncated (time_budget): the pool task did not return in time")
+            return ExtractionResult("", True, 'time_budget')
+        if complete is None:
+            pages, complete = _extract_pages_parallel(data, min(page_count, max_pages), deadline)
+
+    reason = 'max_pages' if page_count > max_pages else None
+    if not complete:
+        reason = 'time_budget'
+    if reason:
+        logger.warning(f"PDF extraction truncated ({reason}) after {len(pages)} of {page_count} pages")
+
+    # Collect page text in a list and join once
+    text = "\n".join(pages) + "\n" if pages else ""
+    return ExtractionResult(text, reason is not None, reason)
+
+def _extract_page_range(pdf_reader: PyPDF2.PdfReader, start: int, stop: int, deadline: float) -> Tuple[List[str], bool]:
+    """
+    Extract pages [start, stop), stopping early once the deadline passes
+    
+    Returns:
+        (page texts, whether every page in the range was extracted)
+    """
+    pages = []
+    for page_num in range(start, stop):
+        if time.time() > deadline:
+            return pages, False
+        pages.append(pdf_reader.pages[page_num].extract_text() or "")
+    return pages, True
+
+def _extract_pdf_pages(data: bytes, max_pages: int, deadline: float,
+                       parallel_min_pages: Optional[int] = None) -> Tuple[List[str], int, Optional[bool]]:
+    """
+    Parse the PDF and extract its first max_pages pages. Documents with at
+    least parallel_min_pages pages are only counted, for the caller to split
+    across the pool.
+
+    Returns:
+        (page texts, page count, whether every page was extracted; None when
+        the document was left for parallel extraction)
+    """
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(data))
+    page_count = len(pdf_reader.pages)
+    stop = min(page_count, max_pages)
+    if parallel_min_pages is not None and stop >= parallel_min_pages:
+        return [], page_count, None
+    pages, complete = _extract_page_range(pdf_reader, 0, stop, deadline)
+    return pages, page_count, complete
+
+def _extract_pdf_chunk(data: bytes, start: int, stop: int, deadline: float) -> Tuple[List[str], bool]:
+    """
+    Pool task: parse the PDF and extract one range of pages
+    """
+    return _extract_page_range(PyPDF2.PdfReader(io.BytesIO(data)), start, stop, deadline)
+
+def _extract_pages_parallel(data: bytes, stop: int, deadline: float) -> Tuple[List[str], bool]:
+    """
+    Split pages [0, stop) into contiguous chunks, one pool task each, and
+    reassemble them in page order. Chunks still running at the deadline are
+    abandoned and their pages left out.
+    """
+    chunk_size = max(PDF_MIN_PAGES_PER_CHUNK, -(-stop // get_worker_count(INTERACTIVE_LANE)))
+    futures = [
+        submit(_extract_pdf_chunk, data, start, min(start + chunk_size, stop), deadline, lane=INTERACTIVE_LANE)
+        for start in range(0, stop, chunk_size)
+    ]
+
+    done, not_done = wait(futures, timeout=max(deadline - time.time(), 0))
+    for future in not_done:
+        future.cancel()
+
+    pages = []
+    complete = not not_done
+    for future in futures:
+        if future in done:
+            chunk_pages, chunk_complete = future.result()
+            pages.extend(chunk_pages)
+            complete = complete and chunk_complete
+    return pages, complete
+
 def extract_text_from_docx(file: FileStorage) -> str:
     """
     Extract text from DOCX file
     
+    Reads word/document.xml straight out of the zip with an incremental parser.
+    Files that are not a well-formed DOCX package fall back to python-docx.
+    
     Args:
         file: Uploaded DOCX file
         
     Returns:
         Extracted text content
     """
-    text = ""
-    
     try:
-        # Create a file-like object from the file data
-        file_stream = io.BytesIO(file.read())
-        
-        # Reset file pointer to beginning
-        file.seek(0)
-        
-        # Open the DOCX file
-        doc = docx.Document(file_stream)
+        try:
+            return extract_text_from_docx_stream(file.stream)
+        except (zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+            logger.warning(f"Streaming DOCX extraction failed, falling back to python-docx: {str(e)}")
+        finally:
+            file.seek(0)
         
-        # Extract text from paragraphs
-        for para in doc.paragraphs:
-            text += para.text + "\n"
-            
-        # Extract text from tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    text += cell.text + " "
-                text += "\n"
-                
-        return text
+        return extract_text_from_docx_document(file)
         
     except Exception as e:
         logger.exception(f"Error extracting text from DOCX: {str(e)}")
         return ""
 
+def extract_text_from_docx_stream(stream: IO[bytes]) -> str:
+    """
+    Extract text from a DOCX package in document order without building the
+    python-docx object model
+    
+    Body paragraphs become one line each. Every table row becomes one line of
+    its cells' text, each followed by a space; a horizontally merged cell is a
+    single <w:tc> and is only read once. Parsed elements are cleared as soon as
+    they are consumed, so memory stays bounded by one paragraph rather than the
+    whole document.
+    
+    Args:
+        stream: Seekable binary stream of the .docx file
+        
+    Returns:
+        Extracted text content
+    """
+    parts = []
+    # One list of paragraph texts per open table cell, innermost last
+    cells: List[List[str]] = []
+    # One list of cell texts per open table row, innermost last
+    rows: List[List[str]] = []
+    # Run text per open paragraph; text boxes can nest paragraphs inside one
+    paragraphs: List[List[str]] = []
+    # <w:tab> inside <w:tabs> is a tab stop definition, not a tab character
+    in_tab_stops = False
+    body = None
+
+    with zipfile.ZipFile(stream) as archive:
+        with archive.open('word/document.xml') as document_xml:
+            for event, elem in ET.iterparse(document_xml, events=('start', 'end')):
+                tag = elem.tag
+                if event == 'start':
+                    if tag == W_P:
+                        paragraphs.append([])
+                    elif tag == W_BODY:
+                        body = elem
+                    elif tag == W_TC:
+                        cells.append([])
+                    elif tag == W_TR:
+                        rows.append([])
+                    elif tag == W_TABS:
+                        in_tab_stops = True
+                    continue
+
+                if tag == W_T:
+                    paragraphs[-1].append(elem.text or "")
+                elif tag == W_TAB and not in_tab_stops:
+                    paragraphs[-1].append("\t")
+                elif tag == W_TABS:
+                    in_tab_stops = False
+                elif tag in (W_BR, W_CR):
+                    paragraphs[-1].append("\n")
+                elif tag == W_P:
+                    paragraph = "".join(paragraphs.pop())
+                    if cells:
+                        cells[-1].append(paragraph)
+                    else:
+                        parts.append(paragraph + "\n")
+                    elem.clear()
+                elif tag == W_TC:
+                    cell = "\n".join(cells.pop())
+                    if rows:
+                        rows[-1].append(cell)
+                elif tag == W_TR:
+                    row = "".join(cell + " " for cell in rows.pop())
+                    if cells:
+                        # Nested table: its rows become paragraphs of the outer cell
+                        cells[-1].append(row)
+                    else:
+                        parts.append(row + "\n")
+                    elem.clear()
+
+                if body is not None and not (cells or rows or paragraphs) and tag in (W_P, W_TBL, W_SDT):
+                    # Drop finished top-level blocks so the tree never grows
+                    body.clear()
+
+    return "".join(parts)
+
+def extract_text_from_docx_document(file: FileStorage) -> str:
+    """
+    Extract text from DOCX file through the python-docx object model
+    
+    Args:
+        file: Uploaded DOCX file
+        
+    Returns:
+        Extracted text content
+    """
+    # Create a file-like object from the file data
+    file_stream = io.BytesIO(file.read())
+    
+    # Reset file pointer to beginning
+    file.seek(0)
+    
+    # Open the DOCX file
+    doc = docx.Document(file_stream)
+    
+    # Extract text from paragraphs
+    parts = [para.text + "\n" for para in doc.paragraphs]
+        
+    # Extract text from tables
+    for table in doc.tables:
+        for row in table.rows:
+            parts.append("".join(cell.text + " " for cell in row.cells) + "\n")
+            
+    return "".join(parts)
+
 def clean_resume_text(text: str) -> str:
     """
     Clean up extracted text for better processing